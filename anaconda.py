@@ -81,6 +81,10 @@ def exitHandler(rebootData):
     if pidfile:
         pidfile.close()
 
+    # Write all queued log records.
+    from pyanaconda import anaconda_logging
+    anaconda_logging.flush()
+
     # Reboot the system.
     if conf.system.can_reboot:
         from pykickstart.constants import KS_SHUTDOWN, KS_WAIT
@@ -270,7 +274,8 @@ if __name__ == "__main__":
     # Set up logging as early as possible.
     from pyanaconda import anaconda_logging
     from pyanaconda import anaconda_loggers
-    anaconda_logging.init(write_to_journal=conf.target.is_hardware)
+    anaconda_logging.init(write_to_journal=conf.target.is_hardware,
+                          async_logging=conf.anaconda.async_logging)
     anaconda_logging.logger.setupVirtio(opts.virtiolog)
 
     # Load the remaining configuration after a logging is set up.
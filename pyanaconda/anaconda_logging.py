@@ -19,11 +19,15 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 
+import atexit
+import copy
 import logging
-from logging.handlers import SysLogHandler, SocketHandler
+from logging.handlers import SysLogHandler, SocketHandler, QueueHandler
 from systemd.journal import JournalHandler
 import os
+import queue
 import sys
+import threading
 import warnings
 
 from pyanaconda.core import constants
@@ -44,6 +48,9 @@ SENSITIVE_INFO_LOG_FILE = "/tmp/sensitive-info.log"
 ANACONDA_SYSLOG_FACILITY = SysLogHandler.LOG_LOCAL1
 ANACONDA_SYSLOG_IDENTIFIER = "anaconda"
 
+# The maximal number of log records written in one batch.
+LOG_WRITER_BATCH_SIZE = 1024
+
 from threading import Lock
 program_log_lock = Lock()
 
@@ -113,6 +120,30 @@ class _AnacondaLogFixer(object):
         self._stream = WriteProxy()  # pylint: disable=attribute-defined-outside-init
 
 
+class _AnacondaBatchWriter(object):
+    """ A mixin for logging.StreamHandler that writes records in batches.
+
+        The formatted records are written to the stream at once and the
+        stream is flushed only once per batch.
+    """
+
+    # filter, format, flush, stream and terminator need to be implemented
+    # in a subclass
+
+    def handle_batch(self, records):
+        records = [r for r in records if self.filter(r)]  # pylint: disable=no-member
+        if not records:
+            return
+
+        try:
+            data = "".join(self.format(r) + self.terminator  # pylint: disable=no-member
+                           for r in records)
+            self.stream.write(data)  # pylint: disable=no-member
+            self.flush()  # pylint: disable=no-member
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(records[0])  # pylint: disable=no-member
+
+
 class AnacondaJournalHandler(_AnacondaLogFixer, JournalHandler):
     def __init__(self, tag='', facility=ANACONDA_SYSLOG_FACILITY,
                  identifier=ANACONDA_SYSLOG_IDENTIFIER):
@@ -136,14 +167,166 @@ class AnacondaSocketHandler(_AnacondaLogFixer, SocketHandler):
         return bytes(self.formatter.format(record) + "\n", "utf-8")
 
 
-class AnacondaFileHandler(_AnacondaLogFixer, logging.FileHandler):
+class AnacondaFileHandler(_AnacondaBatchWriter, _AnacondaLogFixer, logging.FileHandler):
     pass
 
 
-class AnacondaStreamHandler(_AnacondaLogFixer, logging.StreamHandler):
+class AnacondaStreamHandler(_AnacondaBatchWriter, _AnacondaLogFixer, logging.StreamHandler):
     pass
 
 
+class AnacondaQueueHandler(QueueHandler):
+    """Pass log records of the target handler to the log writer.
+
+    The level of the handler is the same as the level of the target
+    handler. The filters of the target handler are applied by the
+    log writer.
+    """
+
+    def __init__(self, writer, target):
+        super().__init__(writer)
+        self.target = target
+        self.setLevel(target.level)
+
+    def setLevel(self, level):
+        super().setLevel(level)
+
+        if hasattr(self, "target"):
+            self.target.setLevel(level)
+
+    def prepare(self, record):
+        # Merge the arguments with the message only once for all handlers,
+        # so the log writer doesn't access objects of the calling thread.
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+
+        return copy.copy(record)
+
+    def enqueue(self, record):
+        self.queue.put(self.target, record)
+
+
+class AnacondaLogWriter(object):
+    """Write log records of multiple handlers in a single thread.
+
+    The records are queued by the calling threads and written in batches
+    by the writer thread. Records of every handler are written in the
+    order they were queued and the stream handlers are flushed only once
+    per batch.
+    """
+
+    def __init__(self, batch_size=LOG_WRITER_BATCH_SIZE):
+        self._batch_size = batch_size
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self):
+        """Is the writer thread running?"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the writer thread."""
+        with self._lock:
+            if self.is_running:
+                return
+
+            self._thread = threading.Thread(
+                name="AnaLogWriterThread",
+                target=self._run,
+                daemon=True
+            )
+            self._thread.start()
+
+    def put(self, handler, record):
+        """Queue the log record of the handler."""
+        self._queue.put((handler, record))
+
+    def flush(self):
+        """Wait until all queued records are written.
+
+        If the writer thread is not running, the records are
+        written by the calling thread.
+        """
+        if threading.current_thread() is self._thread:
+            return
+
+        if not self.is_running:
+            self._write_pending()
+            return
+
+        self._queue.join()
+
+    def stop(self):
+        """Write all queued records and stop the writer thread."""
+        if self.is_running:
+            self._queue.put(None)
+            self._thread.join()
+
+        self._write_pending()
+
+    def _run(self):
+        """Write the queued records until the writer is stopped."""
+        while True:
+            batch = [self._queue.get()]
+
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            self._write(batch)
+
+            if None in batch:
+                return
+
+    def _write_pending(self):
+        """Write the queued records in the calling thread."""
+        batch = []
+
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        self._write(batch)
+
+    def _write(self, batch):
+        """Write the batch of queued records."""
+        records = {}
+
+        for item in batch:
+            if item is None:
+                continue
+
+            handler, record = item
+            records.setdefault(handler, []).append(record)
+
+        try:
+            for handler, handler_records in records.items():
+                self._write_records(handler, handler_records)
+        finally:
+            for _item in batch:
+                self._queue.task_done()
+
+    @staticmethod
+    def _write_records(handler, records):
+        """Write the records of the handler."""
+        if hasattr(handler, "handle_batch"):
+            handler.handle_batch(records)
+            return
+
+        for record in records:
+            try:
+                handler.handle(record)
+            except Exception:  # pylint: disable=broad-except
+                handler.handleError(record)
+
+
 class AnacondaPrefixFilter(logging.Filter):
     """Add a log_prefix field, which is based on the name property,
     but without the "anaconda." prefix.
@@ -167,10 +350,17 @@ class AnacondaPrefixFilter(logging.Filter):
 class AnacondaLog(object):
     SYSLOG_CFGFILE = "/etc/rsyslog.conf"
 
-    def __init__(self, write_to_journal=False):
+    def __init__(self, write_to_journal=False, async_logging=False):
         self.loglevel = DEFAULT_LEVEL
         self.remote_syslog = None
         self.write_to_journal = write_to_journal
+        self.writer = None
+
+        if async_logging:
+            self.writer = AnacondaLogWriter()
+            self.writer.start()
+            atexit.register(self.flush)
+
         # Rename the loglevels so they are the same as in syslog.
         logging.addLevelName(logging.CRITICAL, "CRT")
         logging.addLevelName(logging.ERROR, "ERR")
@@ -258,10 +448,28 @@ class AnacondaLog(object):
             logfile_handler.setLevel(minLevel)
             logfile_handler.setFormatter(logging.Formatter(fmtStr, DATE_FORMAT))
             autoSetLevel(logfile_handler, autoLevel)
-            addToLogger.addHandler(logfile_handler)
+            self._add_handler(addToLogger, logfile_handler)
         except IOError:
             pass
 
+    def _add_handler(self, logr, handler):
+        """Add the handler to the logger.
+
+        If the asynchronous logging is enabled, the handler is called
+        by the log writer. Otherwise, it is called directly.
+        """
+        if self.writer:
+            queue_handler = AnacondaQueueHandler(self.writer, handler)
+            autoSetLevel(queue_handler, getattr(handler, "autoSetLevel", False))
+            handler = queue_handler
+
+        logr.addHandler(handler)
+
+    def flush(self):
+        """Write all queued log records."""
+        if self.writer:
+            self.writer.flush()
+
     def forwardToJournal(self, logr, log_formatter=None, log_filter=None):
         """Forward everything that goes in the logger to the journal daemon."""
         # Don't add syslog tag if custom formatter is in use.
@@ -280,7 +488,7 @@ class AnacondaLog(object):
             journal_handler.addFilter(log_filter)
         if log_formatter:
             journal_handler.setFormatter(log_formatter)
-        logr.addHandler(journal_handler)
+        self._add_handler(logr, journal_handler)
 
     # pylint: disable=redefined-builtin
     def showwarning(self, message, category, filename, lineno,
@@ -331,9 +539,19 @@ class AnacondaLog(object):
         self.restartSyslog()
 
 
-def init(write_to_journal=False):
+def init(write_to_journal=False, async_logging=False):
     global logger
-    logger = AnacondaLog(write_to_journal=write_to_journal)
+    logger = AnacondaLog(write_to_journal=write_to_journal, async_logging=async_logging)
+
+
+def flush():
+    """Write all queued log records.
+
+    Call this function before the logs are collected or the process
+    terminates, so no records are lost if the logging is asynchronous.
+    """
+    if logger:
+        logger.flush()
 
 
 logger = None
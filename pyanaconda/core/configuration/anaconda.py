@@ -56,6 +56,15 @@ class AnacondaSection(Section):
         """List of enabled kickstart modules."""
         return self._get_option("kickstart_modules").split()
 
+    @property
+    def async_logging(self):
+        """Write the logs in a separate thread.
+
+        Log records are queued and written in batches by a single
+        thread, so the logging doesn't block the calling threads.
+        """
+        return self._get_option("async_logging", bool)
+
 
 class AnacondaConfiguration(Configuration):
     """Representation of the Anaconda configuration."""
@@ -74,37 +83,37 @@ class AnacondaConfiguration(Configuration):
         """Initialize the configuration."""
         super().__init__()
         self._anaconda = AnacondaSection(
-            "Anaconda", self.get_parser()
+            "Anaconda", self.get_parser(), self.get_snapshot()
         )
         self._system = SystemSection(
-            "Installation System", self.get_parser()
+            "Installation System", self.get_parser(), self.get_snapshot()
         )
         self._target = TargetSection(
-            "Installation Target", self.get_parser()
+            "Installation Target", self.get_parser(), self.get_snapshot()
         )
         self._network = NetworkSection(
-            "Network", self.get_parser()
+            "Network", self.get_parser(), self.get_snapshot()
         )
         self._payload = PayloadSection(
-            "Payload", self.get_parser()
+            "Payload", self.get_parser(), self.get_snapshot()
         )
         self._bootloader = BootloaderSection(
-            "Bootloader", self.get_parser()
+            "Bootloader", self.get_parser(), self.get_snapshot()
         )
         self._storage = StorageSection(
-            "Storage", self.get_parser()
+            "Storage", self.get_parser(), self.get_snapshot()
         )
         self._storage_constraints = StorageConstraints(
-            "Storage Constraints", self.get_parser()
+            "Storage Constraints", self.get_parser(), self.get_snapshot()
         )
         self._security = SecuritySection(
-            "Security", self.get_parser()
+            "Security", self.get_parser(), self.get_snapshot()
         )
         self._ui = UserInterfaceSection(
-            "User Interface", self.get_parser()
+            "User Interface", self.get_parser(), self.get_snapshot()
         )
         self._license = LicenseSection(
-            "License", self.get_parser()
+            "License", self.get_parser(), self.get_snapshot()
         )
 
     @property
@@ -18,8 +18,11 @@
 #  Author(s):  Vendula Poncova <vponcova@redhat.com>
 #
 import configparser
+import copy
 import os
+import threading
 from abc import ABC
+from enum import Enum
 
 
 class ConfigurationError(Exception):
@@ -138,12 +141,75 @@ def set_option(parser, section_name, option_name, value):
         raise ConfigurationDataError(str(e), section_name, option_name) from e
 
 
+class ConfigurationSnapshot(object):
+    """A snapshot of converted values of configuration options.
+
+    The options are parsed and converted only once per generation of
+    the configuration. The generation is increased every time the
+    configuration is changed, so the snapshot never returns old values.
+
+    Values of mutable types are copied, so the snapshot can't be
+    modified by the caller.
+    """
+
+    # Types of values that don't have to be copied.
+    IMMUTABLE_TYPES = (str, int, float, bool, tuple, frozenset, Enum, type(None))
+
+    def __init__(self):
+        self._generation = 0
+        self._values = {}
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self):
+        """The generation of the configuration."""
+        return self._generation
+
+    def get_option(self, parser, section_name, option_name, converter=None):
+        """Get a converted value of the option.
+
+        :param parser: an instance of ConfigParser
+        :param section_name: a section name
+        :param option_name: an option name
+        :param converter: a function or None
+        :return: a converted value
+        :raises: ConfigurationAccessError
+        """
+        key = (section_name, option_name, converter)
+        values = self._values
+
+        if key in values:
+            value = values[key]
+        else:
+            generation = self._generation
+            value = get_option(parser, section_name, option_name, converter)
+
+            with self._lock:
+                if generation == self._generation:
+                    self._values[key] = value
+
+        if isinstance(value, self.IMMUTABLE_TYPES):
+            return value
+
+        return copy.deepcopy(value)
+
+    def invalidate(self):
+        """Invalidate the snapshot.
+
+        Call this method every time the configuration changes.
+        """
+        with self._lock:
+            self._generation += 1
+            self._values = {}
+
+
 class Section(ABC):
     """A base class for representation of a configuration section."""
 
-    def __init__(self, section_name, parser):
+    def __init__(self, section_name, parser, snapshot=None):
         self._section_name = section_name
         self._parser = parser
+        self._snapshot = snapshot
 
     def _get_option(self, option_name, converter=None):
         """Get a converted value of the option.
@@ -152,6 +218,11 @@ class Section(ABC):
         :param converter: a function or None
         :return: a converted value
         """
+        if self._snapshot is not None:
+            return self._snapshot.get_option(
+                self._parser, self._section_name, option_name, converter
+            )
+
         return get_option(self._parser, self._section_name, option_name, converter)
 
     def _set_option(self, option_name, value):
@@ -162,6 +233,9 @@ class Section(ABC):
         """
         set_option(self._parser, self._section_name, option_name, value)
 
+        if self._snapshot is not None:
+            self._snapshot.invalidate()
+
 
 class Configuration(object):
     """A base class for representation of a configuration handler."""
@@ -170,14 +244,35 @@ class Configuration(object):
         """Initialize the configuration."""
         self._sources = []
         self._parser = create_parser()
+        self._snapshot = ConfigurationSnapshot()
 
     def get_parser(self):
         """Get the configuration parser.
 
+        The snapshot of the configuration doesn't know about changes
+        made directly in the parser. Validate the configuration after
+        such changes.
+
         :return: instance of the ConfigParser
         """
         return self._parser
 
+    def get_snapshot(self):
+        """Get the snapshot of converted values of options.
+
+        :return: an instance of ConfigurationSnapshot
+        """
+        return self._snapshot
+
+    def get_generation(self):
+        """Get the generation of the configuration.
+
+        The generation is increased every time the configuration changes.
+
+        :return: a number of the generation
+        """
+        return self._snapshot.generation
+
     def get_sources(self):
         """Get the configuration sources.
 
@@ -192,6 +287,7 @@ class Configuration(object):
         """
         read_config(self._parser, path)
         self._sources.append(path)
+        self._snapshot.invalidate()
 
     def read_from_directory(self, path):
         """Read all configuration files in a directory
@@ -214,7 +310,12 @@ class Configuration(object):
         write_config(self._parser, path)
 
     def validate(self):
-        """Validate the configuration."""
+        """Validate the configuration.
+
+        All options are read and converted again, so the validated
+        values are stored in a new snapshot of the configuration.
+        """
+        self._snapshot.invalidate()
         self._validate_members(self)
 
     def _validate_members(self, obj):
@@ -112,6 +112,61 @@ class PayloadSection(Section):
         """
         return self._get_option("verify_ssl", bool)
 
+    @property
+    def repo_metadata_workers(self):
+        """The maximal number of repositories that check their cached metadata at the same time.
+
+        The repomd.xml files of the enabled repositories are downloaded and
+        their cached metadata are restored concurrently. The repositories
+        are always loaded one by one. Set to 1 to check them one by one.
+        """
+        value = self._get_option("repo_metadata_workers", int)
+
+        if value < 1:
+            raise ValueError("Invalid value: {}".format(value))
+
+        return value
+
+    @property
+    def liveimg_chunk_size(self):
+        """The size of chunks of live images read from the network or from the disk.
+
+        The value is specified in KiB and returned in bytes.
+        """
+        value = self._get_option("liveimg_chunk_size", int)
+
+        if value < 1:
+            raise ValueError("Invalid value: {}".format(value))
+
+        return value * 1024
+
+    @property
+    def liveimg_download_retries(self):
+        """How many times should we try to resume an interrupted download of a live image."""
+        value = self._get_option("liveimg_download_retries", int)
+
+        if value < 0:
+            raise ValueError("Invalid value: {}".format(value))
+
+        return value
+
+    @property
+    def liveimg_preallocate(self):
+        """Preallocate the file of a downloaded live image to its expected size."""
+        return self._get_option("liveimg_preallocate", bool)
+
+    @property
+    def liveimg_stream_tar(self):
+        """Extract remote tar live images while they are downloaded.
+
+        The image is not stored on the disk, so only the space for the
+        extracted data is required. The images with a checksum are always
+        downloaded first, because the checksum can be verified only after
+        the extraction of a streamed image. If an interrupted download
+        can't be resumed, the whole image is downloaded to the disk.
+        """
+        return self._get_option("liveimg_stream_tar", bool)
+
     @property
     def default_rpm_gpg_keys(self):
         """List of GPG keys to import into RPM database at end of installation."""
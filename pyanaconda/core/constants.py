@@ -105,10 +105,18 @@ GRAPHICAL_TARGET = 'graphical.target'
 # See: https://3.python-requests.org/user/advanced/#timeouts
 NETWORK_CONNECTION_TIMEOUT = 46  # in seconds
 NETWORK_CONNECTED_CHECK_INTERVAL = 0.1  # in seconds
+NETWORK_DEVICES_CHECK_INTERVAL = 1  # in seconds
 
 # DBus
 DEFAULT_DBUS_TIMEOUT = -1       # use default
 
+# How often should we check the state of a remote task in case
+# that its signals can't be delivered (for example in the main thread).
+TASK_SIGNAL_CHECK_INTERVAL = 1  # in seconds
+
+# The maximal number of installation tasks running at the same time.
+PARALLEL_TASK_QUEUE_WORKERS = 4
+
 # Thread names
 THREAD_EXECUTE_STORAGE = "AnaExecuteStorageThread"
 THREAD_STORAGE = "AnaStorageThread"
@@ -117,7 +125,6 @@ THREAD_WAIT_FOR_CONNECTING_NM = "AnaWaitForConnectingNMThread"
 THREAD_PAYLOAD = "AnaPayloadThread"
 THREAD_PAYLOAD_RESTART = "AnaPayloadRestartThread"
 THREAD_EXCEPTION_HANDLING_TEST = "AnaExceptionHandlingTest"
-THREAD_LIVE_PROGRESS = "AnaLiveProgressThread"
 THREAD_SOFTWARE_WATCHER = "AnaSoftwareWatcher"
 THREAD_CHECK_SOFTWARE = "AnaCheckSoftwareThread"
 THREAD_SOURCE_WATCHER = "AnaSourceWatcher"
@@ -459,6 +466,15 @@ SOURCE_TYPES_OVERRIDEN_BY_CDN = (
     SOURCE_TYPE_CDROM
 )
 
+# Payload sources that require the storage.
+#
+# These sources are located on local devices, so
+# they can't be set up before the storage is scanned.
+SOURCE_TYPES_REQUIRING_STORAGE = (
+    SOURCE_TYPE_HDD,
+    SOURCE_TYPE_CDROM,
+)
+
 # Payload URL source types.
 URL_TYPE_BASEURL = "BASEURL"
 URL_TYPE_MIRRORLIST = "MIRRORLIST"
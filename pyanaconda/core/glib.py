@@ -33,7 +33,7 @@ from gi.repository.GLib import markup_escape_text, format_size_full, \
                                MainLoop, MainContext, \
                                GError, Variant, VariantType, Bytes, \
                                IOCondition, IOChannel, SpawnFlags, \
-                               MAXUINT
+                               MAXUINT, PRIORITY_LOW
 
 __all__ = ["create_main_loop", "create_new_context",
            "markup_escape_text", "format_size_full",
@@ -43,7 +43,7 @@ __all__ = ["create_main_loop", "create_new_context",
            "spawn_close_pid", "spawn_async_with_pipes",
            "GError", "Variant", "VariantType", "Bytes",
            "IOCondition", "IOChannel", "SpawnFlags",
-           "MAXUINT"]
+           "MAXUINT", "PRIORITY_LOW"]
 
 
 def create_main_loop():
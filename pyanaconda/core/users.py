@@ -21,6 +21,7 @@
 import os
 import os.path
 import subprocess
+import threading
 from contextlib import contextmanager
 from pyanaconda.core import util
 from pyanaconda.core.configuration.anaconda import conf
@@ -174,6 +175,46 @@ def guess_username(fullname):
     return username
 
 
+# Parsed database files indexed by their paths.
+_database_cache = {}
+_database_lock = threading.Lock()
+
+
+def _read_database(path):
+    """Read a database file like /etc/passwd or /etc/group.
+
+    The file is parsed again only if it has changed since the last read,
+    so a lot of lookups don't have to scan the file from the top.
+
+    :param str path: a path to the database file
+    :return: a tuple of dictionaries of entries by names and by ids
+    """
+    stats = os.stat(path)
+    key = (stats.st_ino, stats.st_mtime_ns, stats.st_size)
+
+    with _database_lock:
+        cached = _database_cache.get(path)
+
+    if cached and cached[0] == key:
+        return cached[1]
+
+    by_name = {}
+    by_id = {}
+
+    with open(path, "r") as f:
+        for line in f:
+            fields = line.split(":")
+            by_name.setdefault(fields[0], fields)
+
+            if len(fields) > 2:
+                by_id.setdefault(fields[2], fields)
+
+    with _database_lock:
+        _database_cache[path] = (key, (by_name, by_id))
+
+    return by_name, by_id
+
+
 def _getpwnam(user_name, root):
     """Like pwd.getpwnam, but is able to use a different root.
 
@@ -182,13 +223,8 @@ def _getpwnam(user_name, root):
     :param str user_name: user name
     :param str root: filesystem root for the operation
     """
-    with open(root + "/etc/passwd", "r") as f:
-        for line in f:
-            fields = line.split(":")
-            if fields[0] == user_name:
-                return fields
-
-    return None
+    by_name, _by_id = _read_database(root + "/etc/passwd")
+    return by_name.get(user_name)
 
 
 def _getgrnam(group_name, root):
@@ -199,13 +235,8 @@ def _getgrnam(group_name, root):
     :param str group_name: group name
     :param str root: filesystem root for the operation
     """
-    with open(root + "/etc/group", "r") as f:
-        for line in f:
-            fields = line.split(":")
-            if fields[0] == group_name:
-                return fields
-
-    return None
+    by_name, _by_id = _read_database(root + "/etc/group")
+    return by_name.get(group_name)
 
 
 def _getgrgid(gid, root):
@@ -217,15 +248,8 @@ def _getgrgid(gid, root):
     :param str root: filesystem root for the operation
     """
     # Convert the probably-int GID to a string
-    gid = str(gid)
-
-    with open(root + "/etc/group", "r") as f:
-        for line in f:
-            fields = line.split(":")
-            if fields[2] == gid:
-                return fields
-
-    return None
+    _by_name, by_id = _read_database(root + "/etc/group")
+    return by_id.get(str(gid))
 
 
 @contextmanager
@@ -284,7 +308,7 @@ def create_group(group_name, gid=None, root=None):
 
 def create_user(username, password=False, is_crypted=False, lock=False,
                 homedir=None, uid=None, gid=None, groups=None, shell=None, gecos="",
-                root=None):
+                root=None, batch=None):
     """Create a new user on the system with the given name.
 
     :param str username: The username for the new user to be created.
@@ -313,6 +337,9 @@ def create_user(username, password=False, is_crypted=False, lock=False,
     :param str root: The directory of the system to create the new user in.
                      The homedir option will be interpreted relative to this.
                      Defaults to conf.target.system_root.
+    :param batch: An instance of UserBatch to defer the password setup
+                  and the relabeling of the home directory to. If none
+                  is given, everything is done immediately.
     """
 
     # resolve the optional arguments that need a default that can't be
@@ -423,12 +450,19 @@ def create_user(username, password=False, is_crypted=False, lock=False,
             util.chown_dir_tree(root + homedir,
                                 int(pwent[2]), int(pwent[3]),
                                 orig_uid, orig_gid)
-            util.execWithRedirect("restorecon", ["-r", root + homedir])
+
+            if batch:
+                batch.restore_context(root + homedir)
+            else:
+                util.execWithRedirect("restorecon", ["-r", root + homedir])
         except OSError as e:
             log.critical("Unable to change owner of existing home directory: %s", e.strerror)
             raise
 
-    set_user_password(username, password, is_crypted, lock, root)
+    if batch:
+        batch.set_user_password(username, password, is_crypted, lock)
+    else:
+        set_user_password(username, password, is_crypted, lock, root)
 
 
 def check_user_exists(username, root=None):
@@ -446,6 +480,58 @@ def check_user_exists(username, root=None):
     return False
 
 
+def _get_password_entry(username, password, is_crypted, lock):
+    """Get the password for chpasswd.
+
+    :param str username: username of the user
+    :param str password: user password
+    :param bool is_crypted: is the password already crypted ?
+    :param bool lock: should the password for this username be locked ?
+    :return: a crypted password or None if the password shouldn't be set
+    """
+    # Only set the password if it is a string, including the empty string.
+    # Otherwise leave it alone (defaults to locked for new users).
+    if not password and password != "":
+        return None
+
+    if password == "":
+        log.info("user account %s setup with no password", username)
+    elif not is_crypted:
+        password = crypt_password(password)
+
+    if lock:
+        password = "!" + password
+        log.info("user account %s locked", username)
+
+    return password
+
+
+def _set_passwords(entries, root):
+    """Set crypted passwords of users with a single call of chpasswd.
+
+    :param entries: a list of tuples with usernames and crypted passwords
+    :param str root: target system sysroot path
+    """
+    data = "".join("%s:%s\n" % entry for entry in entries)
+    proc = util.startProgram(["chpasswd", "-R", root, "-e"], stdin=subprocess.PIPE)
+    proc.communicate(data.encode("utf-8"))
+    if proc.returncode != 0:
+        raise OSError("Unable to set password for new user: status=%s" % proc.returncode)
+
+
+def _reset_password_change(username, root):
+    """Reset the date of the last password change.
+
+    Reset sp_lstchg to an empty string. On systems with no rtc, this
+    field can be set to 0, which has a special meaning that the password
+    must be reset on the next login.
+
+    :param str username: username of the user
+    :param str root: target system sysroot path
+    """
+    util.execWithRedirect("chage", ["-R", root, "-d", "", username])
+
+
 def set_user_password(username, password, is_crypted, lock, root="/"):
     """Set user password.
 
@@ -455,28 +541,12 @@ def set_user_password(username, password, is_crypted, lock, root="/"):
     :param bool lock: should the password for this username be locked ?
     :param str root: target system sysroot path
     """
+    password = _get_password_entry(username, password, is_crypted, lock)
 
-    # Only set the password if it is a string, including the empty string.
-    # Otherwise leave it alone (defaults to locked for new users) and reset sp_lstchg
-    if password or password == "":
-        if password == "":
-            log.info("user account %s setup with no password", username)
-        elif not is_crypted:
-            password = crypt_password(password)
-
-        if lock:
-            password = "!" + password
-            log.info("user account %s locked", username)
-
-        proc = util.startProgram(["chpasswd", "-R", root, "-e"], stdin=subprocess.PIPE)
-        proc.communicate(("%s:%s\n" % (username, password)).encode("utf-8"))
-        if proc.returncode != 0:
-            raise OSError("Unable to set password for new user: status=%s" % proc.returncode)
-
-    # Reset sp_lstchg to an empty string. On systems with no rtc, this
-    # field can be set to 0, which has a special meaning that the password
-    # must be reset on the next login.
-    util.execWithRedirect("chage", ["-R", root, "-d", "", username])
+    if password is not None:
+        _set_passwords([(username, password)], root)
+
+    _reset_password_change(username, root)
 
 
 def set_root_password(password, is_crypted=False, lock=False, root="/"):
@@ -490,12 +560,13 @@ def set_root_password(password, is_crypted=False, lock=False, root="/"):
     return set_user_password("root", password, is_crypted, lock, root)
 
 
-def set_user_ssh_key(username, key, root=None):
+def set_user_ssh_key(username, key, root=None, batch=None):
     """Set an SSH key for a given username.
 
     :param str username: a username
     :param str key: the SSH key to set
     :param str root: target system sysroot path
+    :param batch: an instance of UserBatch to defer the relabeling to or None
     """
     if root is None:
         root = conf.target.system_root
@@ -525,4 +596,66 @@ def set_user_ssh_key(username, key, root=None):
     # Only change ownership if we created it
     if not authfile_existed:
         os.chown(authfile, int(uid), int(gid))
-        util.execWithRedirect("restorecon", ["-r", sshdir])
+
+        if batch:
+            batch.restore_context(sshdir)
+        else:
+            util.execWithRedirect("restorecon", ["-r", sshdir])
+
+
+class UserBatch(object):
+    """A batch of deferred operations with new users.
+
+    The passwords of all users in the batch are set with a single
+    call of chpasswd and the SELinux contexts of all collected paths
+    are restored with a single call of restorecon when the batch is
+    committed. The result is the same as if the operations were done
+    one by one.
+    """
+
+    def __init__(self, root):
+        """Create a new batch.
+
+        :param str root: target system sysroot path
+        """
+        self._root = root
+        self._passwords = []
+        self._usernames = []
+        self._paths = []
+
+    def set_user_password(self, username, password, is_crypted, lock):
+        """Set the user password on commit.
+
+        :param str username: username of the user
+        :param str password: user password
+        :param bool is_crypted: is the password already crypted ?
+        :param bool lock: should the password for this username be locked ?
+        """
+        password = _get_password_entry(username, password, is_crypted, lock)
+
+        if password is not None:
+            self._passwords.append((username, password))
+
+        self._usernames.append(username)
+
+    def restore_context(self, path):
+        """Restore the SELinux context of the path recursively on commit.
+
+        :param str path: a full path in the target system
+        """
+        self._paths.append(path)
+
+    def commit(self):
+        """Run the deferred operations."""
+        if self._passwords:
+            _set_passwords(self._passwords, self._root)
+
+        for username in self._usernames:
+            _reset_password_change(username, self._root)
+
+        if self._paths:
+            util.execWithRedirect("restorecon", ["-r"] + self._paths)
+
+        self._passwords = []
+        self._usernames = []
+        self._paths = []
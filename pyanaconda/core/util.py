@@ -18,9 +18,11 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 
+import codecs
 import glob
 import os
 import os.path
+import selectors
 import subprocess
 import unicodedata
 # Used for ascii_lowercase, ascii_uppercase constants
@@ -35,6 +37,7 @@ import imp
 import types
 import inspect
 import functools
+import threading
 import blivet.arch
 
 import requests
@@ -58,6 +61,9 @@ program_log = get_program_logger()
 
 from pykickstart.constants import KS_SCRIPT_ONERROR
 
+# The maximal size of the output of a program read at once.
+PROGRAM_OUTPUT_CHUNK_SIZE = 64 * 1024
+
 _child_env = {}
 
 
@@ -262,10 +268,200 @@ def startX(argv, output_redirect=None, timeout=X_TIMEOUT):
         signal.signal(signal.SIGALRM, old_sigalrm_handler)
 
 
+class _ProgramOutput(object):
+    """Drain the output of a running program incrementally.
+
+    The standard output and the error output are read as soon as they
+    are available, so the program can't be blocked by a full pipe. The
+    complete lines are logged in real time and only the standard output
+    is kept in the memory if it should be captured.
+
+    If more programs are running at the same time, their logged lines
+    are prefixed with the name and the PID of the program, so their
+    output can be told apart in program.log.
+    """
+
+    # The number of programs whose output is being read.
+    _running = 0
+    _running_lock = threading.Lock()
+
+    def __init__(self, stdout=None, log_output=True, capture_output=True, binary_output=False):
+        """Create a new output.
+
+        :param stdout: Optional file object to write the output to.
+        :param log_output: whether to log the output of command
+        :param capture_output: whether to keep the standard output
+        :param binary_output: whether to treat the output of command as binary data
+        """
+        self._stdout = stdout
+        self._log_output = log_output
+        self._capture_output = capture_output
+        self._binary_output = binary_output
+        self._chunks = []
+        self._partial_lines = {}
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._decode_error = None
+        self._last_char = None
+        self._log_prefix = ""
+        self._concurrent = False
+
+    @property
+    def log_prefix(self):
+        """A prefix of the logged lines.
+
+        It is empty unless another program has run at the same time.
+        """
+        if _ProgramOutput._running > 1:
+            self._concurrent = True
+
+        if not self._concurrent:
+            return ""
+
+        return self._log_prefix
+
+    def read(self, proc):
+        """Read the output until the program closes its pipes.
+
+        :param proc: a Popen object
+        :return: the captured output
+        :raise: UnicodeDecodeError if the output can't be decoded
+        """
+        self._log_prefix = _get_program_log_prefix(proc)
+
+        with _ProgramOutput._running_lock:
+            _ProgramOutput._running += 1
+
+        try:
+            self._read(proc)
+        finally:
+            with _ProgramOutput._running_lock:
+                _ProgramOutput._running -= 1
+
+        self._finish_output()
+        return self._get_output()
+
+    def _read(self, proc):
+        """Read and process the output of the program."""
+        with selectors.DefaultSelector() as selector:
+            for stream in (proc.stdout, proc.stderr):
+                if stream is not None:
+                    selector.register(stream, selectors.EVENT_READ, stream is proc.stdout)
+
+            while selector.get_map():
+                for key, _events in selector.select():
+                    data = os.read(key.fd, PROGRAM_OUTPUT_CHUNK_SIZE)
+
+                    if not data:
+                        selector.unregister(key.fileobj)
+                        self._log_data(key.fd, b"", last=True)
+                        continue
+
+                    if key.data:
+                        self._process_output(data)
+
+                    self._log_data(key.fd, data)
+
+    def _process_output(self, data):
+        """Process data of the standard output."""
+        if self._capture_output:
+            self._chunks.append(data)
+
+        if self._stdout is None:
+            return
+
+        if self._binary_output:
+            self._stdout.write(data)
+            return
+
+        if self._decode_error:
+            return
+
+        try:
+            text = self._decoder.decode(data)
+        except UnicodeDecodeError as e:
+            self._decode_error = e
+            return
+
+        if text:
+            self._stdout.write(text)
+            self._last_char = text[-1]
+
+    def _finish_output(self):
+        """Finish the processing of the standard output."""
+        if self._stdout is None or self._binary_output or self._decode_error:
+            return
+
+        try:
+            text = self._decoder.decode(b"", final=True)
+        except UnicodeDecodeError as e:
+            self._decode_error = e
+            return
+
+        if text:
+            self._stdout.write(text)
+            self._last_char = text[-1]
+
+        if self._last_char is not None and self._last_char != "\n":
+            self._stdout.write("\n")
+
+    def _get_output(self):
+        """Get the captured output."""
+        if self._decode_error:
+            raise self._decode_error
+
+        output = b"".join(self._chunks)
+        self._chunks = []
+
+        if self._binary_output:
+            return output
+
+        output = output.decode("utf-8")
+        if output and output[-1] != "\n":
+            output = output + "\n"
+
+        return output
+
+    def _log_data(self, fd, data, last=False):
+        """Log complete lines of the given data."""
+        if not self._log_output:
+            return
+
+        lines = (self._partial_lines.pop(fd, b"") + data).split(b"\n")
+        partial_line = lines.pop()
+
+        # Don't keep long lines without the end in the memory.
+        if len(partial_line) > PROGRAM_OUTPUT_CHUNK_SIZE or (last and partial_line):
+            lines.append(partial_line)
+        elif not last:
+            self._partial_lines[fd] = partial_line
+
+        if not lines:
+            return
+
+        # try to decode as utf-8 and replace all undecodable data by
+        # "safe" printable representations when logging the output
+        with program_log_lock:
+            for line in lines:
+                program_log.info("%s%s", self.log_prefix, line.decode("utf-8", "replace").strip())
+
+
+def _get_program_log_prefix(proc):
+    """Get a prefix of the logged output of the given program.
+
+    :param proc: a Popen object
+    :return: a string with the name and the PID of the program
+    """
+    args = proc.args
+    name = args[0] if isinstance(args, (list, tuple)) else args
+    return "{}[{}]: ".format(os.path.basename(name), proc.pid)
+
+
 def _run_program(argv, root='/', stdin=None, stdout=None, env_prune=None, log_output=True,
-                 binary_output=False, filter_stderr=False):
+                 binary_output=False, filter_stderr=False, capture_output=True):
     """ Run an external program, log the output and return it to the caller
 
+        The output is logged in real time while the program is running.
+
         NOTE/WARNING: UnicodeDecodeError will be raised if the output of the of the
                       external command can't be decoded as UTF-8.
 
@@ -277,6 +473,7 @@ def _run_program(argv, root='/', stdin=None, stdout=None, env_prune=None, log_ou
         :param log_output: whether to log the output of command
         :param binary_output: whether to treat the output of command as binary data
         :param filter_stderr: whether to exclude the contents of stderr from the returned output
+        :param capture_output: whether to return the output of command
         :return: The return code of the command and the output
     """
     try:
@@ -288,38 +485,21 @@ def _run_program(argv, root='/', stdin=None, stdout=None, env_prune=None, log_ou
         proc = startProgram(argv, root=root, stdin=stdin, stdout=subprocess.PIPE, stderr=stderr,
                             env_prune=env_prune)
 
-        (output_string, err_string) = proc.communicate()
-        if not binary_output:
-            output_string = output_string.decode("utf-8")
-            if output_string and output_string[-1] != "\n":
-                output_string = output_string + "\n"
-
-        if log_output:
-            with program_log_lock:
-                if binary_output:
-                    # try to decode as utf-8 and replace all undecodable data by
-                    # "safe" printable representations when logging binary output
-                    decoded_output_lines = output_string.decode("utf-8", "replace")
-                else:
-                    # output_string should already be a Unicode string
-                    decoded_output_lines = output_string.splitlines(True)
-
-                for line in decoded_output_lines:
-                    program_log.info(line.strip())
-
-        if stdout:
-            stdout.write(output_string)
-
-        # If stderr was filtered, log it separately
-        if filter_stderr and err_string and log_output:
-            # try to decode as utf-8 and replace all undecodable data by
-            # "safe" printable representations when logging binary output
-            decoded_err_string = err_string.decode("utf-8", "replace")
-            err_lines = decoded_err_string.splitlines(True)
-
-            with program_log_lock:
-                for line in err_lines:
-                    program_log.info(line.strip())
+        try:
+            output_reader = _ProgramOutput(
+                stdout=stdout,
+                log_output=log_output,
+                capture_output=capture_output,
+                binary_output=binary_output
+            )
+            output_string = output_reader.read(proc)
+        finally:
+            proc.stdout.close()
+
+            if proc.stderr:
+                proc.stderr.close()
+
+            proc.wait()
 
     except OSError as e:
         with program_log_lock:
@@ -327,7 +507,7 @@ def _run_program(argv, root='/', stdin=None, stdout=None, env_prune=None, log_ou
         raise
 
     with program_log_lock:
-        program_log.debug("Return code: %d", proc.returncode)
+        program_log.debug("%sReturn code: %d", output_reader.log_prefix, proc.returncode)
 
     return (proc.returncode, output_string)
 
@@ -362,7 +542,8 @@ def execWithRedirect(command, argv, stdin=None, stdout=None,
     """
     argv = [command] + argv
     return _run_program(argv, stdin=stdin, stdout=stdout, root=root, env_prune=env_prune,
-                        log_output=log_output, binary_output=binary_output)[0]
+                        log_output=log_output, binary_output=binary_output,
+                        capture_output=False)[0]
 
 
 def execWithCapture(command, argv, stdin=None, root='/', log_output=True, filter_stderr=False):
@@ -558,15 +739,15 @@ def setup_translations():
     gettext.textdomain("anaconda")
 
 
-def _run_systemctl(command, service, root="/"):
+def _run_systemctl(command, *services, root="/"):
     """
-    Runs 'systemctl command service.service'
+    Runs 'systemctl command service.service ...'
 
     :return: exit status of the systemctl
 
     """
 
-    args = [command, service]
+    args = [command] + list(services)
     if root != "/":
         args += ["--root", root]
 
@@ -647,6 +828,50 @@ def disable_service(service, root=None):
         log.warning("Disabling %s failed. It probably doesn't exist", service)
 
 
+def enable_services(services, root=None):
+    """Enable systemd services in the sysroot.
+
+    All services are enabled with a single call of systemctl. If it
+    fails, the services are enabled one by one to report the error.
+
+    :param services: a list of names of services to enable
+    :param str root: path to the sysroot or None to use default sysroot path
+    """
+    if root is None:
+        root = conf.target.system_root
+
+    if not services:
+        return
+
+    if _run_systemctl("enable", *services, root=root) == 0:
+        return
+
+    for service in services:
+        enable_service(service, root=root)
+
+
+def disable_services(services, root=None):
+    """Disable systemd services in the sysroot.
+
+    All services are disabled with a single call of systemctl. If it
+    fails, the services are disabled one by one to report the error.
+
+    :param services: a list of names of services to disable
+    :param str root: path to the sysroot or None to use default sysroot path
+    """
+    if root is None:
+        root = conf.target.system_root
+
+    if not services:
+        return
+
+    if _run_systemctl("disable", *services, root=root) == 0:
+        return
+
+    for service in services:
+        disable_service(service, root=root)
+
+
 def dracut_eject(device):
     """
     Use dracut shutdown hook to eject media after the system is shutdown.
@@ -33,6 +33,7 @@ from meh import Config
 from meh.dump import ReverseExceptionDump
 from meh.handler import ExceptionHandler
 
+from pyanaconda import anaconda_logging
 from pyanaconda import kickstart
 from pyanaconda.core import util
 from pyanaconda import product
@@ -120,6 +121,9 @@ class AnacondaExceptionHandler(ExceptionHandler):
             self._run_kickstart_scripts(dump_info)
             sys.exit(0)
         else:
+            # Make sure that the logs are complete before they are collected.
+            anaconda_logging.flush()
+
             # This will call postWriteHook.
             super().handleException(dump_info)
             return False
@@ -137,6 +141,7 @@ class AnacondaExceptionHandler(ExceptionHandler):
         log.debug("running handleException")
         exception_lines = traceback.format_exception(*dump_info.exc_info)
         log.critical("\n".join(exception_lines))
+        anaconda_logging.flush()
 
         ty = dump_info.exc_info.type
         value = dump_info.exc_info.value
@@ -190,6 +195,7 @@ class AnacondaExceptionHandler(ExceptionHandler):
                     # for a few seconds before exiting the installer
                     print(cmdline_error_msg)
                     self._run_kickstart_scripts(dump_info)
+                    anaconda_logging.flush()
                     time.sleep(180)
                     sys.exit(1)
                 else:
@@ -17,6 +17,8 @@
 # License and may only be used or replicated with the express permission of
 # Red Hat, Inc.
 #
+from threading import Lock
+
 from pyanaconda.core.configuration.anaconda import conf
 from pyanaconda.core.constants import PAYLOAD_LIVE_TYPES, PAYLOAD_TYPE_DNF
 from pyanaconda.modules.common.constants.objects import BOOTLOADER, SNAPSHOT, FIREWALL
@@ -33,7 +35,7 @@ from pyanaconda.core.i18n import N_
 from pyanaconda.threading import threadMgr
 from pyanaconda.kickstart import runPostScripts, runPreInstallScripts
 from pyanaconda.kexec import setup_kexec
-from pyanaconda.installation_tasks import Task, TaskQueue
+from pyanaconda.installation_tasks import Task, TaskQueue, ParallelTaskQueue
 from pykickstart.constants import SNAPSHOT_WHEN_POST_INSTALL
 
 from pyanaconda.anaconda_loggers import get_module_logger
@@ -41,6 +43,9 @@ log = get_module_logger(__name__)
 
 __all__ = ["run_installation"]
 
+# Names of resources locked by the installation tasks.
+RESOURCE_SYSTEMD_UNITS = "systemd units"
+
 
 class WriteResolvConfTask(Task):
     """Custom task subclass for handling the resolv.conf copy task.
@@ -89,33 +94,50 @@ def _prepare_configuration(payload, ksdata):
         configuration_queue.append(subscription_config)
 
     # schedule the execute methods of ksdata that require an installed system to be present
-    os_config = TaskQueue("Installed system configuration", N_("Configuring installed system"))
+    # - independent tasks of the modules run concurrently
+    os_config = ParallelTaskQueue("Installed system configuration",
+                                  N_("Configuring installed system"))
 
     # add installation tasks for the Security DBus module
+    # - the realm join can enable the sssd service
     security_proxy = SECURITY.get_proxy()
     security_dbus_tasks = security_proxy.InstallWithTasks()
-    os_config.append_dbus_tasks(SECURITY, security_dbus_tasks)
+    security_tasks = os_config.append_dbus_tasks(
+        SECURITY, security_dbus_tasks,
+        resources=[RESOURCE_SYSTEMD_UNITS]
+    )
 
     # add installation tasks for the Timezone DBus module
     # run these tasks before tasks of the Services module
     timezone_proxy = TIMEZONE.get_proxy()
     timezone_dbus_tasks = timezone_proxy.InstallWithTasks()
-    os_config.append_dbus_tasks(TIMEZONE, timezone_dbus_tasks)
+    timezone_tasks = os_config.append_dbus_tasks(
+        TIMEZONE, timezone_dbus_tasks,
+        resources=[RESOURCE_SYSTEMD_UNITS]
+    )
 
     # add installation tasks for the Services DBus module
     services_proxy = SERVICES.get_proxy()
     services_dbus_tasks = services_proxy.InstallWithTasks()
-    os_config.append_dbus_tasks(SERVICES, services_dbus_tasks)
+    services_tasks = os_config.append_dbus_tasks(
+        SERVICES, services_dbus_tasks,
+        dependencies=timezone_tasks,
+        resources=[RESOURCE_SYSTEMD_UNITS]
+    )
 
     # add installation tasks for the Localization DBus module
     localization_proxy = LOCALIZATION.get_proxy()
     localization_dbus_tasks = localization_proxy.InstallWithTasks()
-    os_config.append_dbus_tasks(LOCALIZATION, localization_dbus_tasks)
+    localization_tasks = os_config.append_dbus_tasks(LOCALIZATION, localization_dbus_tasks)
 
     # add the Firewall configuration task
+    # - the firewall-offline-cmd tool enables or disables the firewalld service
     firewall_proxy = NETWORK.get_proxy(FIREWALL)
     firewall_dbus_task = firewall_proxy.InstallWithTask()
-    os_config.append_dbus_tasks(NETWORK, [firewall_dbus_task])
+    os_config.append_dbus_tasks(
+        NETWORK, [firewall_dbus_task],
+        resources=[RESOURCE_SYSTEMD_UNITS]
+    )
 
     configuration_queue.append(os_config)
 
@@ -131,7 +153,12 @@ def _prepare_configuration(payload, ksdata):
     user_config = TaskQueue("User creation", N_("Creating users"))
     users_proxy = USERS.get_proxy()
     users_dbus_tasks = users_proxy.InstallWithTasks()
-    os_config.append_dbus_tasks(USERS, users_dbus_tasks)
+    # create users after the authentication is configured and after the
+    # tasks of the Services and Localization modules that also write to /etc
+    os_config.append_dbus_tasks(
+        USERS, users_dbus_tasks,
+        dependencies=security_tasks + services_tasks + localization_tasks
+    )
     configuration_queue.append(user_config)
 
     # Anaconda addon configuration
@@ -345,18 +372,25 @@ def run_installation(payload, ksdata):
 
     # log tasks and queues when they are started
     # - note that we are using generators to add the counter
+    # - the generators are shared by tasks running in parallel
+    counter_lock = Lock()
     queue_counter = util.item_counter(queue.queue_count)
     task_started_counter = util.item_counter(queue.task_count)
     task_completed_counter = util.item_counter(queue.task_count)
+
+    def next_item(counter):
+        with counter_lock:
+            return next(counter)
+
     queue.queue_started.connect(
-        lambda x: log.info("Queue started: %s (%s)", x.name, next(queue_counter))
+        lambda x: log.info("Queue started: %s (%s)", x.name, next_item(queue_counter))
     )
     queue.task_started.connect(
-        lambda x: log.info("Task started: %s (%s)", x.name, next(task_started_counter))
+        lambda x: log.info("Task started: %s (%s)", x.name, next_item(task_started_counter))
     )
     queue.task_completed.connect(
         lambda x: log.debug("Task completed: %s (%s) (%1.1f s)", x.name,
-                            next(task_completed_counter), x.elapsed_time)
+                            next_item(task_completed_counter), x.elapsed_time)
     )
 
     # start the task queue
@@ -17,9 +17,11 @@
 # License and may only be used or replicated with the express permission of
 # Red Hat, Inc.
 #
-from threading import RLock
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from threading import Lock, RLock
 
 from dasbus.error import DBusError
+from pyanaconda.core.constants import PARALLEL_TASK_QUEUE_WORKERS
 from pyanaconda.core.signal import Signal
 from pyanaconda.core.util import synchronized
 from pyanaconda.errors import errorHandler, ERROR_RAISE
@@ -31,6 +33,10 @@ from pyanaconda.progress import progress_message
 
 log = get_module_logger(__name__)
 
+# DBus tasks can run in parallel, but the error handler can show dialogs,
+# so only one error should be handled at a time.
+_error_handler_lock = Lock()
+
 
 class BaseTask(object):
     """A base class for Task and TaskQueue.
@@ -46,6 +52,8 @@ class BaseTask(object):
         self._parent = None
         self._start_timestamp = None
         self._done_timestamp = None
+        self._dependencies = []
+        self._resources = set()
         self.started = Signal()
         self.completed = Signal()
 
@@ -90,6 +98,48 @@ class BaseTask(object):
         """
         return self._done
 
+    @property
+    @synchronized
+    def dependencies(self):
+        """Tasks and task queues that have to be done before this one is started.
+
+        The dependencies are used only by the ParallelTaskQueue. Items of
+        the TaskQueue are always started in order.
+
+        :returns: a list of tasks and task queues
+        :rtype: list
+        """
+        return list(self._dependencies)
+
+    @synchronized
+    def add_dependencies(self, *items):
+        """Don't start this task before the given tasks or task queues are done.
+
+        :param items: instances of Task or TaskQueue
+        """
+        self._dependencies.extend(items)
+
+    @property
+    @synchronized
+    def resources(self):
+        """Names of resources locked by this task while it is running.
+
+        The ParallelTaskQueue never runs two items that lock
+        the same resource at the same time.
+
+        :returns: a set of resource names
+        :rtype: set
+        """
+        return set(self._resources)
+
+    @synchronized
+    def add_resources(self, *resources):
+        """Lock the given resources while this task is running.
+
+        :param resources: names of resources, for example "sysroot rpmdb"
+        """
+        self._resources.update(resources)
+
     @property
     def summary(self):
         """A description of the task - to be overridden by subclasses."""
@@ -306,9 +356,9 @@ class TaskQueue(BaseTask):
             self.started.emit(self)
             if len(self) == 0:
                 log.warning("The task group %s is empty.", self.name)
-            for item in self:
-                # start the item (TaskQueue/Task)
-                item.start()
+
+            # start the items (TaskQueue/Task)
+            self._start_items()
 
             # we are done, set the task queue state accordingly
             with self._lock:
@@ -321,6 +371,11 @@ class TaskQueue(BaseTask):
             # trigger the "completed" signals
             self.completed.emit(self)
 
+    def _start_items(self):
+        """Start all items of the task queue in order."""
+        for item in self:
+            item.start()
+
     # implement the Python list "interface" and make sure parent is always
     # set to a correct value
     @synchronized
@@ -329,15 +384,33 @@ class TaskQueue(BaseTask):
         self._list.append(item)
 
     @synchronized
-    def append_dbus_tasks(self, service_id, dbus_tasks):
+    def append_dbus_tasks(self, service_id, dbus_tasks, dependencies=(), resources=()):
         """Append DBus Tasks from a module to the TaskQueue.
 
+        The DBus Tasks of the module will always run in the given order.
+
         :param service_id: DBusServiceIdentifier instance corresponding to an Anaconda DBus module
         :param dbus_tasks: list of DBus Tasks paths
+        :param dependencies: tasks and task queues the DBus Tasks depend on
+        :param resources: names of resources locked by the DBus Tasks
+        :returns: a list of the appended DBus Tasks
         """
+        tasks = []
+
         for dbus_task_path in dbus_tasks:
             task_proxy = service_id.get_proxy(dbus_task_path)
-            self.append(DBusTask(task_proxy))
+            task = DBusTask(task_proxy)
+            task.add_dependencies(*dependencies)
+            task.add_resources(*resources)
+
+            # keep the order of the module tasks
+            if tasks:
+                task.add_dependencies(tasks[-1])
+
+            self.append(task)
+            tasks.append(task)
+
+        return tasks
 
     @synchronized
     def insert(self, index, item):
@@ -386,6 +459,93 @@ class TaskQueue(BaseTask):
     # - __add__(), __radd__() - same as above
 
 
+class ParallelTaskQueue(TaskQueue):
+    """ParallelTaskQueue runs independent items of the queue concurrently.
+
+    An item is started once all its dependencies are done and no running
+    item locks any of its resources. At most max_workers items are running
+    at the same time. Items without any dependencies and resources are
+    considered to be independent of each other.
+
+    If an item fails, no other items are started and the first error
+    is raised once the running items are finished.
+    """
+
+    def __init__(self, name, status_message=None, max_workers=PARALLEL_TASK_QUEUE_WORKERS):
+        super().__init__(name=name, status_message=status_message)
+        self._max_workers = max_workers
+
+    @property
+    def max_workers(self):
+        """The maximal number of items running at the same time.
+
+        :returns: a number of workers
+        :rtype: int
+        """
+        return self._max_workers
+
+    def _start_items(self):
+        """Start the items of the task queue in a pool of workers."""
+        pending = list(self)
+        running = {}
+        locked = set()
+        error = None
+
+        with ThreadPoolExecutor(max_workers=self._max_workers,
+                                thread_name_prefix="AnaTaskQueue") as executor:
+
+            while pending or running:
+                # start all items that are ready unless something has failed
+                while error is None and len(running) < self._max_workers:
+                    item = self._find_ready_item(pending, locked)
+
+                    if not item:
+                        break
+
+                    pending.remove(item)
+                    locked.update(item.resources)
+                    running[executor.submit(item.start)] = item
+
+                if not running:
+                    if error is None:
+                        error = RuntimeError("Can't start the items {} of the task queue {}."
+                                             .format([i.name for i in pending], self.name))
+                    break
+
+                # wait for the next item to finish
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in finished:
+                    item = running.pop(future)
+                    locked.difference_update(item.resources)
+
+                    if future.exception() and error is None:
+                        log.error("Task queue %s has failed in %s.", self.name, item.name)
+                        error = future.exception()
+
+        if error:
+            raise error
+
+    @staticmethod
+    def _find_ready_item(pending, locked):
+        """Find the first pending item that can be started.
+
+        :param pending: a list of pending items
+        :param locked: a set of locked resources
+        :returns: an item or None
+        """
+        for item in pending:
+            if item.resources & locked:
+                continue
+
+            if not all(dependency.done for dependency in item.dependencies):
+                continue
+
+            return item
+
+        return None
+
+
 class Task(BaseTask):
     """Task is a wrapper for a single installation related task.
 
@@ -521,8 +681,9 @@ class DBusTask(Task):
             sync_run_task(self._task_proxy)
         except DBusError as e:
             # Handle a remote error.
-            if errorHandler.cb(e) == ERROR_RAISE:
-                raise
+            with _error_handler_lock:
+                if errorHandler.cb(e) == ERROR_RAISE:
+                    raise
         finally:
             # Disconnect from the signal.
             self._task_proxy.ProgressChanged.disconnect()
@@ -16,6 +16,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
+from concurrent.futures import ThreadPoolExecutor
+
 from pykickstart.errors import KickstartError
 from pykickstart.version import makeVersion
 
@@ -29,12 +31,21 @@ log = get_module_logger(__name__)
 
 __all__ = ['KickstartManager']
 
+# The maximal number of modules that are called at once.
+KICKSTART_MANAGER_MAX_WORKERS = 8
+
 
 class KickstartManager(object):
-    """Distributes kickstart to modules and collects it back."""
+    """Distributes kickstart to modules and collects it back.
+
+    The modules are called concurrently, so the distribution takes
+    about as long as the slowest module.
+    """
 
-    def __init__(self):
+    def __init__(self, max_workers=KICKSTART_MANAGER_MAX_WORKERS):
         self._module_observers = []
+        self._module_handlers = {}
+        self._max_workers = max_workers
 
     @property
     def module_observers(self):
@@ -44,6 +55,58 @@ class KickstartManager(object):
     def on_module_observers_changed(self, observers):
         """Set module observers for kickstart distribution."""
         self._module_observers = list(observers)
+        self._module_handlers = {}
+
+    def _get_module_handlers(self, observer):
+        """Get kickstart commands, sections and addons handled by the module.
+
+        The lists are static, so they are read only once per module.
+
+        :param observer: a module observer
+        :return: a tuple of lists of commands, sections and addons
+        """
+        handlers = self._module_handlers.get(observer.service_name)
+
+        if handlers is None:
+            handlers = (
+                observer.proxy.KickstartCommands,
+                observer.proxy.KickstartSections,
+                observer.proxy.KickstartAddons
+            )
+
+            log.info("%s handles commands %s sections %s addons %s.",
+                     observer.service_name, *handlers)
+
+            self._module_handlers[observer.service_name] = handlers
+
+        return handlers
+
+    def _get_available_observers(self):
+        """Get observers of available modules."""
+        observers = []
+
+        for observer in self._module_observers:
+            if not observer.is_service_available:
+                log.warning("Module %s not available!", observer.service_name)
+                continue
+
+            observers.append(observer)
+
+        return observers
+
+    def _call_modules(self, function, items):
+        """Call the function for every item concurrently.
+
+        :param function: a function with one argument
+        :param items: a list of arguments
+        :return: a list of results in the order of the items
+        """
+        if not items:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(self._max_workers, len(items)),
+                                thread_name_prefix="AnaKickstart") as executor:
+            return list(executor.map(function, items))
 
     def read_kickstart_file(self, path):
         """Read the specified kickstart file.
@@ -73,25 +136,19 @@ class KickstartManager(object):
         return parser.split(path)
 
     def _distribute_to_modules(self, elements):
-        """Distribute split kickstart to modules synchronously.
+        """Distribute split kickstart to modules.
+
+        The kickstart is split for all modules first. Then the
+        modules read their parts of the kickstart concurrently.
 
         :returns: list of (Line number, Message) errors reported by modules when
                   distributing kickstart
         :rtype: list of kickstart reports
         """
-        reports = []
-
-        for observer in self._module_observers:
-            if not observer.is_service_available:
-                log.warning("Module %s not available!", observer.service_name)
-                continue
-
-            commands = observer.proxy.KickstartCommands
-            sections = observer.proxy.KickstartSections
-            addons = observer.proxy.KickstartAddons
+        items = []
 
-            log.info("%s handles commands %s sections %s addons %s.",
-                     observer.service_name, commands, sections, addons)
+        for observer in self._get_available_observers():
+            commands, sections, addons = self._get_module_handlers(observer)
 
             module_elements = elements.get_and_process_elements(
                 commands=commands,
@@ -107,23 +164,34 @@ class KickstartManager(object):
                 log.info("There are no kickstart data for %s.", observer.service_name)
                 continue
 
-            module_report = KickstartReport.from_structure(
-                observer.proxy.ReadKickstart(module_kickstart)
-            )
-
             line_references = elements.get_references_from_elements(
                 module_elements
             )
 
-            for message in module_report.get_messages():
-                line_number, file_name = line_references[message.line_number]
-                message.line_number = line_number
-                message.file_name = file_name
-                message.module_name = observer.service_name
+            items.append((observer, module_kickstart, line_references))
+
+        return self._call_modules(self._read_module_kickstart, items)
 
-            reports.append(module_report)
+    def _read_module_kickstart(self, item):
+        """Let the module read its part of the kickstart.
 
-        return reports
+        :param item: a tuple of a module observer, a kickstart string
+                     and line references of the kickstart
+        :return: a kickstart report
+        """
+        observer, module_kickstart, line_references = item
+
+        module_report = KickstartReport.from_structure(
+            observer.proxy.ReadKickstart(module_kickstart)
+        )
+
+        for message in module_report.get_messages():
+            line_number, file_name = line_references[message.line_number]
+            message.line_number = line_number
+            message.file_name = file_name
+            message.module_name = observer.service_name
+
+        return module_report
 
     def _merge_module_reports(self, report, module_reports):
         """Merge the module reports into the final report."""
@@ -142,20 +210,20 @@ class KickstartManager(object):
     def _generate_from_modules(self):
         """Generate kickstart from modules.
 
+        The modules generate their kickstarts concurrently.
+
         :return: a map of module names and kickstart strings
         """
-        result = {}
-
-        for observer in self._module_observers:
-            if not observer.is_service_available:
-                log.warning("Module %s not available!", observer.service_name)
-                continue
-
-            module_name = observer.service_name
-            module_kickstart = observer.proxy.GenerateKickstart()
-            result[module_name] = module_kickstart
-
-        return result
+        observers = self._get_available_observers()
+        kickstarts = self._call_modules(
+            lambda observer: observer.proxy.GenerateKickstart(),
+            observers
+        )
+
+        return {
+            observer.service_name: module_kickstart
+            for observer, module_kickstart in zip(observers, kickstarts)
+        }
 
     def _merge_module_kickstarts(self, module_kickstarts):
         """Merge kickstart from modules
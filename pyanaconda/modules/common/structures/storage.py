@@ -19,7 +19,8 @@
 from dasbus.structure import DBusData
 from dasbus.typing import *  # pylint: disable=wildcard-import
 
-__all__ = ["DeviceData", "DeviceFormatData", "DeviceActionData", "OSData"]
+__all__ = ["DeviceData", "DeviceFormatData", "DeviceActionData", "DeviceTreeChangesData",
+           "OSData"]
 
 
 class DeviceData(DBusData):
@@ -444,3 +445,82 @@ class OSData(DBusData):
         devices.extend(self.swap_devices)
         devices.extend(self.mount_points.values())
         return devices
+
+
+class DeviceTreeChangesData(DBusData):
+    """Data of changes in the device tree."""
+
+    def __init__(self):
+        self._generation = 0
+        self._reset = False
+        self._added = []
+        self._removed = []
+        self._changed = []
+
+    @property
+    def generation(self) -> UInt64:
+        """The current generation of the device tree.
+
+        The generation is increased every time the devices
+        in the device tree change.
+
+        :return: a number of the generation
+        """
+        return UInt64(self._generation)
+
+    @generation.setter
+    def generation(self, generation: UInt64):
+        self._generation = generation
+
+    @property
+    def reset(self) -> Bool:
+        """Should all devices be reloaded?
+
+        The changes since the requested generation are not
+        available anymore. All devices in the device tree are
+        reported as added and the data of devices that are not
+        reported should be dropped.
+
+        :return: True or False
+        """
+        return self._reset
+
+    @reset.setter
+    def reset(self, value: Bool):
+        self._reset = value
+
+    @property
+    def added(self) -> List[Str]:
+        """Names of added devices.
+
+        :return: a list of device names
+        """
+        return self._added
+
+    @added.setter
+    def added(self, names: List[Str]):
+        self._added = names
+
+    @property
+    def removed(self) -> List[Str]:
+        """Names of removed devices.
+
+        :return: a list of device names
+        """
+        return self._removed
+
+    @removed.setter
+    def removed(self, names: List[Str]):
+        self._removed = names
+
+    @property
+    def changed(self) -> List[Str]:
+        """Names of changed devices.
+
+        :return: a list of device names
+        """
+        return self._changed
+
+    @changed.setter
+    def changed(self, names: List[Str]):
+        self._changed = names
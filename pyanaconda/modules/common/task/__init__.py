@@ -15,35 +15,143 @@
 # License and may only be used or replicated with the express permission of
 # Red Hat, Inc.
 #
-from time import sleep
+from threading import Event
+from time import monotonic
 
+from pyanaconda.core.constants import TASK_SIGNAL_CHECK_INTERVAL
 from pyanaconda.modules.common.task.task_interface import TaskInterface
 from pyanaconda.modules.common.task.task import Task, AbstractTask
 from pyanaconda.modules.common.task.meta import DBusMetaTask
 
+from pyanaconda.anaconda_loggers import get_module_logger
+log = get_module_logger(__name__)
+
 __all__ = ["sync_run_task", "async_run_task", "AbstractTask", "Task", "TaskInterface",
            "DBusMetaTask"]
 
 
-def sync_run_task(task_proxy, callback=None):
+class _TaskWaiter(object):
+    """Wait for a remote task to stop.
+
+    The waiter is woken up by the Stopped and ProgressChanged
+    signals of the task. The signals are delivered by the main
+    loop, so the state of the task is also checked once in a while
+    in case that the main loop can't dispatch them (for example,
+    if we are waiting in the main thread).
+    """
+
+    def __init__(self, task_proxy):
+        """Create a new waiter.
+
+        :param task_proxy: a proxy of the remote task
+        """
+        self._task_proxy = task_proxy
+        self._stopped = Event()
+        self._changed = Event()
+
+    def connect(self):
+        """Connect to the signals of the task."""
+        self._task_proxy.Stopped.connect(self._stopped_callback)
+        self._task_proxy.ProgressChanged.connect(self._progress_changed_callback)
+
+    def disconnect(self):
+        """Disconnect from the signals of the task."""
+        self._task_proxy.Stopped.disconnect(self._stopped_callback)
+        self._task_proxy.ProgressChanged.disconnect(self._progress_changed_callback)
+
+    def _stopped_callback(self):
+        """The task has stopped."""
+        self._stopped.set()
+        self._changed.set()
+
+    def _progress_changed_callback(self, step, msg):
+        """The task has reported a progress."""
+        self._changed.set()
+
+    def _is_stopped(self):
+        """Has the task stopped?"""
+        return self._stopped.is_set() or not self._task_proxy.IsRunning
+
+    def wait(self, callback=None, timeout=None):
+        """Wait for the task to stop.
+
+        :param callback: a callback called every iteration
+        :param timeout: a number of seconds to wait or None
+        :raise: TimeoutError if the task is still running after the timeout
+        """
+        deadline = None
+
+        if timeout is not None:
+            deadline = monotonic() + timeout
+
+        while True:
+            self._changed.clear()
+
+            if self._is_stopped():
+                break
+
+            if callback:
+                callback(self._task_proxy)
+
+            remaining = TASK_SIGNAL_CHECK_INTERVAL
+
+            if deadline is not None:
+                remaining = min(remaining, deadline - monotonic())
+
+            if remaining <= 0:
+                raise TimeoutError("The task {} hasn't stopped in {} seconds.".format(
+                    self._task_proxy.Name, timeout
+                ))
+
+            self._changed.wait(remaining)
+
+
+def sync_run_task(task_proxy, callback=None, timeout=None):
     """Run a remote task synchronously.
 
-    The given callback will be called every iteration.
+    Block until the task emits the Stopped signal. The given
+    callback will be called every iteration, at least every
+    time the task reports a progress.
+
+    If the task hasn't stopped in time, it is canceled and its
+    result is collected before the timeout error is raised.
 
     :param task_proxy: a proxy of the remote task
     :param callback: a callback
+    :param timeout: a number of seconds to wait or None to wait forever
+    :raise: TimeoutError if the task hasn't stopped in time
     :raise: a remote error
     """
-    task_proxy.Start()
+    waiter = _TaskWaiter(task_proxy)
+    waiter.connect()
+
+    try:
+        task_proxy.Start()
+        waiter.wait(callback, timeout)
+    except TimeoutError:
+        _cancel_task(task_proxy, waiter)
+        raise
+    finally:
+        waiter.disconnect()
 
-    while task_proxy.IsRunning:
+    task_proxy.Finish()
 
-        if callback:
-            callback(task_proxy)
 
-        sleep(1)
+def _cancel_task(task_proxy, waiter):
+    """Cancel a running remote task and finish it.
 
-    task_proxy.Finish()
+    :param task_proxy: a proxy of the remote task
+    :param waiter: a connected waiter of the task
+    """
+    log.warning("Canceling the task %s.", task_proxy.Name)
+    task_proxy.Cancel()
+    waiter.wait()
+
+    try:
+        task_proxy.Finish()
+    except Exception as e:  # pylint: disable=broad-except
+        # The timeout is the reason of the failure.
+        log.debug("The canceled task %s has failed: %s", task_proxy.Name, e)
 
 
 def async_run_task(task_proxy, callback):
@@ -73,6 +73,7 @@ class NetworkService(KickstartService):
             )
 
         self.connected_changed = Signal()
+        self.activated_interfaces_changed = Signal()
         self.nm_client = None
         # TODO fallback solution - use Gio/GNetworkMonitor ?
         if SystemBus.check_connection():
@@ -80,6 +81,7 @@ class NetworkService(KickstartService):
             if nm_client.get_nm_running():
                 self.nm_client = nm_client
                 self.nm_client.connect("notify::%s" % NM.CLIENT_STATE, self._nm_state_changed)
+                self._watch_nm_active_connections()
                 initial_state = self.nm_client.get_state()
                 self.set_connected(self._nm_state_connected(initial_state))
             else:
@@ -265,6 +267,26 @@ class NetworkService(KickstartService):
         log.debug("NeworkManager state changed to %s", state)
         self.set_connected(self._nm_state_connected(state))
 
+    def _watch_nm_active_connections(self):
+        """Watch the states of NM active connections."""
+        self.nm_client.connect("active-connection-added", self._nm_active_connection_added)
+        self.nm_client.connect("active-connection-removed", self._nm_active_connection_removed)
+
+        for active_connection in self.nm_client.get_active_connections():
+            active_connection.connect("state-changed", self._nm_active_connection_state_changed)
+
+    def _nm_active_connection_added(self, client, active_connection):
+        active_connection.connect("state-changed", self._nm_active_connection_state_changed)
+        self.activated_interfaces_changed.emit()
+
+    def _nm_active_connection_removed(self, client, active_connection):
+        self.activated_interfaces_changed.emit()
+
+    def _nm_active_connection_state_changed(self, active_connection, state, reason):
+        log.debug("NetworkManager active connection %s state changed to %s",
+                  active_connection.get_id(), state)
+        self.activated_interfaces_changed.emit()
+
     @property
     def disable_ipv6(self):
         """Disable IPv6 on target system."""
@@ -51,6 +51,9 @@ class NetworkInterface(KickstartModuleInterface):
         self.implementation.current_hostname_changed.connect(self.CurrentHostnameChanged)
         self.watch_property("Connected", self.implementation.connected_changed)
         self.implementation.configurations_changed.connect(self._device_configurations_changed)
+        self.implementation.activated_interfaces_changed.connect(
+            self.ActivatedInterfacesChanged
+        )
 
     @property
     def Hostname(self) -> Str:
@@ -125,6 +128,11 @@ class NetworkInterface(KickstartModuleInterface):
         """
         return self.implementation.get_activated_interfaces()
 
+    @dbus_signal
+    def ActivatedInterfacesChanged(self):
+        """Signal a possible change of activated network interfaces."""
+        pass
+
     def InstallNetworkWithTask(self, overwrite: Bool) -> ObjPath:
         """Install network with an installation task.
 
@@ -18,7 +18,7 @@
 from pyanaconda.modules.common.task import Task
 from pyanaconda.modules.common.errors.payload import InstallError
 from pyanaconda.core.constants import INSTALL_TREE
-from pyanaconda.core.util import execWithRedirect
+from pyanaconda.modules.payloads.base.progress import CopyProgress, run_rsync
 from pyanaconda.modules.payloads.base.utils import create_rescue_image
 
 from pyanaconda.anaconda_loggers import get_module_logger
@@ -53,7 +53,6 @@ class InstallFromImageTask(Task):
         if self._source is not None and not self._source.get_state():
             raise InstallError("Source is not set up!")
 
-        cmd = "rsync"
         # preserve: permissions, owners, groups, ACL's, xattrs, times,
         #           symlinks, hardlinks
         # go recursively, include devices and special files, don't cross
@@ -64,14 +63,14 @@ class InstallFromImageTask(Task):
                 "--exclude", "/boot/loader/", "--exclude", "/boot/efi/loader/",
                 "--exclude", "/etc/machine-id", INSTALL_TREE + "/", self._dest_path]
         try:
-            rc = execWithRedirect(cmd, args)
+            rc = run_rsync(args, CopyProgress(self.report_progress))
         except (OSError, RuntimeError) as e:
             msg = None
             err = str(e)
             log.error(err)
         else:
             err = None
-            msg = "%s exited with code %d" % (cmd, rc)
+            msg = "rsync exited with code %d" % rc
             log.info(msg)
 
         if err or rc == 11:
@@ -0,0 +1,193 @@
+#
+# Progress reporting of payload copies.
+#
+# Copyright (C) 2020 Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import re
+import subprocess
+import time
+
+from pyanaconda.core import util
+from pyanaconda.core.i18n import _
+
+from pyanaconda.anaconda_loggers import get_module_logger, get_program_logger
+log = get_module_logger(__name__)
+program_log = get_program_logger()
+
+__all__ = ["CopyProgress", "parse_rsync_progress", "run_rsync"]
+
+# The minimal interval between two progress reports in seconds.
+COPY_PROGRESS_INTERVAL = 0.5
+
+# The progress line of rsync --info=progress2 looks like:
+#   1,238,099,968  42%   98.85MB/s    0:00:11 (xfr#4005, ir-chk=1016/9135)
+RSYNC_PROGRESS_PATTERN = re.compile(r"^\s*([\d,]+)\s+(\d+)%\s")
+
+
+class CopyProgress(object):
+    """Report the progress of a copy based on the number of copied bytes.
+
+    The progress is reported as a message with the percentage, the
+    throughput and the estimated remaining time of the copy. Reports
+    are sent only if the percentage changes and not more often than
+    once per the given interval.
+    """
+
+    def __init__(self, report_callback, total_size=None, interval=COPY_PROGRESS_INTERVAL,
+                 message=None):
+        """Create a new progress.
+
+        :param report_callback: a callback with a progress message argument
+        :param total_size: a number of bytes to copy or None if unknown
+        :param interval: a minimal interval between two reports in seconds
+        :param message: a message that prefixes the progress
+        """
+        self._report = report_callback
+        self._total_size = total_size
+        self._interval = interval
+        self._message = message or _("Installing software")
+        self._start_time = time.monotonic()
+        self._last_time = None
+        self._last_pct = None
+
+    def update(self, bytes_copied, pct=None):
+        """Update the progress.
+
+        :param bytes_copied: a number of bytes copied so far
+        :param pct: a percentage of the copy or None to calculate it
+                    from the total size
+        """
+        if pct is None and self._total_size:
+            pct = int(100 * bytes_copied / self._total_size)
+
+        if pct is None:
+            return
+
+        pct = max(0, min(100, pct))
+        now = time.monotonic()
+
+        if pct == self._last_pct:
+            return
+
+        if self._last_time is not None and now - self._last_time < self._interval \
+                and pct < 100:
+            return
+
+        self._last_time = now
+        self._last_pct = pct
+        self._report(self._format(pct, bytes_copied, now - self._start_time))
+
+    def update_with_total(self, bytes_copied, total_size):
+        """Update the progress and the total size.
+
+        This method can be used as a progress callback of the image
+        downloader and the tar extraction.
+
+        :param bytes_copied: a number of bytes copied so far
+        :param total_size: a number of bytes to copy or None if unknown
+        """
+        self._total_size = total_size
+        self.update(bytes_copied)
+
+    def end(self):
+        """Report the end of the copy."""
+        if self._last_pct != 100:
+            self._report("{} 100%".format(self._message))
+
+    def _format(self, pct, bytes_copied, elapsed):
+        """Format the progress message."""
+        if not pct or not bytes_copied or elapsed <= 0:
+            return "{} {}%".format(self._message, pct)
+
+        speed = bytes_copied / elapsed / (1024 * 1024)
+        remaining = int(elapsed * (100 - pct) / pct)
+
+        return _("{message} {pct}% ({speed:.1f} MB/s, {minutes}:{seconds:02d} remaining)").format(
+            message=self._message,
+            pct=pct,
+            speed=speed,
+            minutes=remaining // 60,
+            seconds=remaining % 60
+        )
+
+
+def parse_rsync_progress(line):
+    """Parse a progress line of rsync --info=progress2.
+
+    :param line: a line of the rsync output
+    :return: a tuple of copied bytes and a percentage or None
+    """
+    match = RSYNC_PROGRESS_PATTERN.match(line)
+
+    if not match:
+        return None
+
+    return int(match.group(1).replace(",", "")), int(match.group(2))
+
+
+def _read_records(stream):
+    """Read records of the stream separated by new lines or carriage returns."""
+    buf = b""
+
+    while True:
+        data = stream.read1(4096)
+
+        if not data:
+            break
+
+        buf += data
+        *records, buf = re.split(b"[\r\n]", buf)
+        yield from records
+
+    if buf:
+        yield buf
+
+
+def run_rsync(args, progress):
+    """Run rsync and report its progress.
+
+    The rsync is asked to report the overall progress of the transfer
+    with the total size computed in advance, so the percentage is
+    based on the real number of transferred bytes.
+
+    :param args: a list of rsync arguments
+    :param progress: an instance of CopyProgress
+    :return: the return code of rsync
+    """
+    argv = ["rsync", "--info=progress2", "--no-inc-recursive"] + args
+    proc = util.startProgram(argv, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+    for record in _read_records(proc.stdout):
+        line = record.decode("utf-8", "replace")
+
+        if not line.strip():
+            continue
+
+        result = parse_rsync_progress(line)
+
+        if result:
+            progress.update(*result)
+        else:
+            program_log.info(line.strip())
+
+    rc = proc.wait()
+    program_log.debug("Return code: %d", rc)
+
+    if rc == 0:
+        progress.end()
+
+    return rc
@@ -121,13 +121,25 @@ def create_rescue_image(root, kernel_version_list):
         log.warning("new-kernel-pkg does not exist - grubby wasn't installed?")
         use_nkp = False
 
+    # There is only one rescue image for all kernels and the scripts update
+    # the boot loader configuration, so the kernels are processed one by one.
     for kernel in kernel_version_list:
         log.info("Generating rescue image for %s", kernel)
         if use_nkp:
-            execWithRedirect("new-kernel-pkg", ["--rpmposttrans", kernel], root=root)
+            _execute_for_kernel(kernel, "new-kernel-pkg", ["--rpmposttrans", kernel], root)
         else:
             files = glob.glob(root + "/etc/kernel/postinst.d/*")
             srlen = len(root)
             files = sorted([f[srlen:] for f in files if os.access(f, os.X_OK)])
             for file in files:
-                execWithRedirect(file, [kernel, "/boot/vmlinuz-%s" % kernel], root=root)
+                _execute_for_kernel(kernel, file, [kernel, "/boot/vmlinuz-%s" % kernel], root)
+
+
+def _execute_for_kernel(kernel, command, argv, root):
+    """Run the command for the given kernel and report a failure."""
+    rc = execWithRedirect(command, argv, root=root)
+
+    if rc:
+        log.error("%s failed for %s with the exit code %s", command, kernel, rc)
+
+    return rc
@@ -17,11 +17,25 @@
 #
 import dnf.subject
 
+from blivet.size import Size
+
 from pyanaconda.anaconda_loggers import get_module_logger
 from pyanaconda.core.util import is_lpae_available
 
 log = get_module_logger(__name__)
 
+# Bonus to required free space which depends on block size and rpm database size estimation.
+# Every file could be aligned to fragment size so 4KiB * number_of_files should be a worst
+# case scenario. 2KiB for RPM DB was acquired by testing.
+# 6KiB = 4K(max default fragment size) + 2K(rpm db could be taken for a header file)
+BONUS_SIZE_ON_FILE = Size("6 KiB")
+
+# The average size of an installed file. It is used to estimate the number
+# of installed files without the file lists of packages. Typical Fedora
+# installations have an average file size between 20 and 30 KiB, so the
+# lower bound is used to not underestimate the number of files.
+AVERAGE_FILE_SIZE = Size("20 KiB")
+
 
 def get_kernel_package(dnf_base, exclude_list):
     """Get an installable kernel package.
@@ -53,3 +67,41 @@ def get_kernel_package(dnf_base, exclude_list):
 
     log.error("kernel: failed to select a kernel from %s", kernels)
     return None
+
+
+def estimate_file_count(package):
+    """Estimate the number of files installed by the package.
+
+    The estimation is based on the primary metadata only, so the
+    file lists of packages don't have to be loaded.
+
+    :param package: a DNF package
+    :return: a number of files
+    """
+    return max(1, package.installsize // int(AVERAGE_FILE_SIZE))
+
+
+def calculate_installation_size(packages):
+    """Calculate the space required by the installed packages.
+
+    :param packages: an iterable of DNF packages
+    :return: an instance of Size
+    """
+    size = 0
+    files_nm = 0
+
+    for package in packages:
+        # space taken by all files installed by the packages
+        size += package.installsize
+        # estimated number of files installed on the system
+        files_nm += estimate_file_count(package)
+
+    # append bonus size depending on number of files
+    bonus_size = files_nm * BONUS_SIZE_ON_FILE
+    size = Size(size)
+    # add another 10% as safeguard
+    total_space = (size + bonus_size) * 1.1
+    log.debug("Size from DNF: %s", size)
+    log.debug("Bonus size %s by estimated number of files %s", bonus_size, files_nm)
+    log.debug("Total size required %s", total_space)
+    return total_space
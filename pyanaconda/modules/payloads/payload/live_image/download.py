@@ -0,0 +1,456 @@
+#
+# Copyright (C) 2020  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import hashlib
+import os
+import subprocess
+import threading
+
+from requests.exceptions import RequestException
+
+from pyanaconda.core import util
+from pyanaconda.core.configuration.anaconda import conf
+from pyanaconda.core.constants import NETWORK_CONNECTION_TIMEOUT
+from pyanaconda.modules.payloads.payload.live_image.utils import TAR_EXTRACTION_OPTIONS, \
+    get_tar_compression_options, get_tar_compression_options_from_file, \
+    get_kernel_version_list_from_names
+
+from pyanaconda.anaconda_loggers import get_module_logger
+log = get_module_logger(__name__)
+
+__all__ = ["ImageDownloader", "ImageDownloadError", "ImageExtractionError",
+           "calculate_image_checksum", "extract_tar_image"]
+
+
+class ImageDownloadError(RequestException):
+    """The image couldn't be downloaded completely."""
+
+
+class ImageExtractionError(Exception):
+    """The image couldn't be extracted."""
+
+
+class _ImageStreamError(ImageExtractionError):
+    """The streamed image can't be downloaded again."""
+
+
+def calculate_image_checksum(image_path, chunk_size=None):
+    """Calculate the SHA-256 checksum of a local image.
+
+    :param image_path: a path to the image
+    :param chunk_size: a size of chunks read from the disk or None
+    :return: a hex digest of the checksum
+    """
+    chunk_size = chunk_size or conf.payload.liveimg_chunk_size
+    sha256 = hashlib.sha256()
+
+    with open(image_path, "rb") as f:
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                break
+            sha256.update(data)
+
+    return sha256.hexdigest()
+
+
+def extract_tar_image(image_path, dest_path, chunk_size=None, progress_callback=None):
+    """Extract a local tar image and count the extracted bytes.
+
+    The image is read in chunks and passed to tar, so the progress
+    of the extraction is based on the real number of processed bytes.
+
+    :param image_path: a path to the tar image
+    :param dest_path: a path to the destination directory
+    :param chunk_size: a size of chunks read from the disk or None
+    :param progress_callback: a callback with bytes_read and total_size arguments
+    :return: a list of kernel versions found in the image
+    :raise: ImageExtractionError if the extraction fails
+    """
+    chunk_size = chunk_size or conf.payload.liveimg_chunk_size
+    total_size = os.path.getsize(image_path)
+    output = _TarProcess(dest_path, get_tar_compression_options_from_file(image_path))
+    bytes_read = 0
+
+    try:
+        with open(image_path, "rb") as f:
+            output.start(total_size)
+
+            while True:
+                data = f.read(chunk_size)
+                if not data:
+                    break
+
+                output.write(data)
+                bytes_read += len(data)
+
+                if progress_callback:
+                    progress_callback(bytes_read, total_size)
+
+    except BaseException:
+        output.kill()
+        raise
+
+    names = output.finish()
+    return get_kernel_version_list_from_names(names)
+
+
+class ImageDownloader(object):
+    """Download an image and calculate its checksum in one pass.
+
+    The SHA-256 checksum is calculated from the data as they are
+    downloaded, so the image doesn't have to be read again. If the
+    connection is dropped, the download is resumed with the HTTP
+    Range header if the server supports it. The image file can be
+    preallocated to the expected size to avoid fragmentation.
+
+    The default values of the chunk size, the preallocation and the
+    number of retries are taken from the configuration.
+    """
+
+    def __init__(self, session, url, proxies=None, verify=True, chunk_size=None,
+                 preallocate=None, retries=None, progress_callback=None):
+        """Create a new downloader.
+
+        :param session: a requests session
+        :param url: an url of the image
+        :param proxies: a dictionary of proxies for requests
+        :param verify: should we verify the SSL certificate?
+        :param chunk_size: a size of chunks read from the network or None
+        :param preallocate: should we preallocate the image file? or None
+        :param retries: how many times should we try to resume the download or None
+        :param progress_callback: a callback with bytes_read and total_size
+                                  arguments; total_size is None if unknown
+        """
+        self._session = session
+        self._url = url
+        self._proxies = proxies or {}
+        self._verify = verify
+        self._chunk_size = chunk_size or conf.payload.liveimg_chunk_size
+        self._preallocate = preallocate if preallocate is not None \
+            else conf.payload.liveimg_preallocate
+        self._retries = retries if retries is not None \
+            else conf.payload.liveimg_download_retries
+        self._progress_callback = progress_callback
+
+    def download(self, image_path):
+        """Download the image to the given path.
+
+        :param image_path: a path to the downloaded image
+        :return: a hex digest of the SHA-256 checksum of the image
+        :raise: RequestException if the download fails
+        :raise: ImageDownloadError if the image is incomplete
+        """
+        log.info("Starting image download")
+
+        with open(image_path, "wb") as f:
+            output = _ImageFile(f, self._preallocate)
+            sha256, bytes_read = self._download_to(output)
+
+            # Remove the unused preallocated space.
+            f.truncate(bytes_read)
+
+        log.info("Image download finished")
+        return sha256.hexdigest()
+
+    def extract(self, dest_path, image_path):
+        """Extract the tar image to the given path while it is downloaded.
+
+        The downloaded data are passed directly to tar, so the image is
+        not stored on the disk. The checksum is calculated from the
+        streamed data and it is available only after the extraction.
+
+        The extracted data can't be discarded, so if the interrupted
+        download can't be resumed, the whole image is downloaded to
+        the image path and extracted from there.
+
+        :param dest_path: a path to the destination directory
+        :param image_path: a path to the image for the fallback download
+        :return: a tuple of a hex digest of the SHA-256 checksum of the
+                 image and a list of kernel versions found in the image
+        :raise: RequestException if the download fails
+        :raise: ImageDownloadError if the image is incomplete
+        :raise: ImageExtractionError if the extraction fails
+        """
+        try:
+            return self._extract_stream(dest_path)
+        except _ImageStreamError as e:
+            log.warning("%s Downloading the whole image to %s.", e, image_path)
+
+        checksum = self.download(image_path)
+
+        try:
+            kernel_version_list = extract_tar_image(
+                image_path,
+                dest_path,
+                chunk_size=self._chunk_size,
+                progress_callback=self._progress_callback
+            )
+        finally:
+            os.unlink(image_path)
+
+        return checksum, kernel_version_list
+
+    def _extract_stream(self, dest_path):
+        """Extract the tar image to the given path from the HTTP stream."""
+        log.info("Starting image extraction from %s", self._url)
+        output = _TarProcess(dest_path, get_tar_compression_options(self._url))
+
+        try:
+            sha256, _bytes_read = self._download_to(output)
+        except BaseException:
+            output.kill()
+            raise
+
+        names = output.finish()
+        log.info("Image extraction finished")
+        return sha256.hexdigest(), get_kernel_version_list_from_names(names)
+
+    def _download_to(self, output):
+        """Download the image to the given output.
+
+        :param output: an instance of _ImageFile or _TarProcess
+        :return: a tuple of the hash object and the number of bytes
+        :raise: ImageDownloadError if the image is incomplete
+        """
+        sha256 = hashlib.sha256()
+        bytes_read = 0
+        total_size = None
+        retries = self._retries
+
+        while True:
+            try:
+                response = self._get(bytes_read)
+
+                if bytes_read and response.status_code != 206:
+                    # The server doesn't support ranges, start again.
+                    log.warning("Can't resume the image download, starting again.")
+                    output.restart()
+                    sha256 = hashlib.sha256()
+                    bytes_read = 0
+
+                if not bytes_read:
+                    total_size = self._get_content_length(response)
+                    output.start(total_size)
+
+                for data in response.iter_content(self._chunk_size):
+                    if not data:
+                        continue
+
+                    output.write(data)
+                    sha256.update(data)
+                    bytes_read += len(data)
+                    self._report_progress(bytes_read, total_size)
+
+                response.close()
+
+            except RequestException as e:
+                if not bytes_read or not retries:
+                    raise
+
+                retries -= 1
+                log.warning("Image download has been interrupted after %s bytes: %s",
+                            bytes_read, e)
+                continue
+
+            if total_size is not None and bytes_read < total_size:
+                if not retries:
+                    raise ImageDownloadError("The image download has ended after {} of {} "
+                                             "bytes.".format(bytes_read, total_size))
+
+                retries -= 1
+                log.warning("Image download has ended after %s of %s bytes.",
+                            bytes_read, total_size)
+                continue
+
+            return sha256, bytes_read
+
+    def _get(self, offset):
+        """Send the GET request for the image from the given offset."""
+        headers = {}
+
+        if offset:
+            log.info("Resuming the image download from %s bytes.", offset)
+            headers["Range"] = "bytes={}-".format(offset)
+
+        response = self._session.get(
+            self._url,
+            headers=headers,
+            proxies=self._proxies,
+            verify=self._verify,
+            stream=True,
+            timeout=NETWORK_CONNECTION_TIMEOUT
+        )
+        response.raise_for_status()
+        return response
+
+    @staticmethod
+    def _get_content_length(response):
+        """Get the size of the image or None."""
+        total_size = response.headers.get('content-length')
+
+        if total_size is None:
+            log.warning("content-length header is missing for the installation image, "
+                        "download progress reporting will not be available")
+            return None
+
+        # requests return headers as strings, so convert total_length to int
+        return int(total_size)
+
+    def _report_progress(self, bytes_read, total_size):
+        """Report the progress of the download."""
+        if self._progress_callback:
+            self._progress_callback(bytes_read, total_size)
+
+
+class _ImageFile(object):
+    """A file the downloaded image is written to."""
+
+    def __init__(self, f, preallocate):
+        self._file = f
+        self._preallocate = preallocate
+
+    def start(self, total_size):
+        """Preallocate the file of the given size."""
+        if not self._preallocate or not total_size:
+            return
+
+        try:
+            os.posix_fallocate(self._file.fileno(), 0, total_size)
+        except OSError as e:
+            log.debug("Failed to preallocate %s bytes for the image: %s", total_size, e)
+
+    def restart(self):
+        """Discard the written data."""
+        self._file.seek(0)
+        self._file.truncate()
+
+    def write(self, data):
+        """Write the downloaded data."""
+        self._file.write(data)
+
+
+class _TarProcess(object):
+    """A tar process the downloaded image is streamed to.
+
+    Tar prints names of the extracted members on its standard output.
+    The output and the error output are read in separate threads, so
+    the process can't be blocked by full pipes.
+    """
+
+    def __init__(self, dest_path, compression_options):
+        self._dest_path = dest_path
+        self._compression_options = compression_options
+        self._process = None
+        self._returncode = None
+        self._names = []
+        self._errors = []
+        self._threads = []
+
+    def start(self, total_size):
+        """Start the tar process."""
+        argv = ["tar"] + TAR_EXTRACTION_OPTIONS + self._compression_options \
+            + ["--verbose", "-xf", "-", "-C", self._dest_path]
+
+        try:
+            self._process = util.startProgram(
+                argv,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+        except OSError as e:
+            raise ImageExtractionError("Failed to start tar: {}".format(e)) from e
+
+        self._threads = [
+            self._read_lines(self._process.stdout, self._names),
+            self._read_lines(self._process.stderr, self._errors)
+        ]
+
+    @staticmethod
+    def _read_lines(stream, lines):
+        """Read lines of the stream in a new thread."""
+        def _read():
+            for line in stream:
+                lines.append(line.decode("utf-8", "replace").rstrip("\n"))
+
+        thread = threading.Thread(target=_read, daemon=True)
+        thread.start()
+        return thread
+
+    def restart(self):
+        """The streamed data can't be discarded."""
+        raise _ImageStreamError("The image extraction can't be restarted.")
+
+    def write(self, data):
+        """Pass the downloaded data to tar."""
+        try:
+            self._process.stdin.write(data)
+        except OSError as e:
+            self._wait()
+            raise ImageExtractionError(self._get_error_message(
+                "tar has failed to extract the image: {}".format(e)
+            )) from e
+
+    def finish(self):
+        """Wait for tar to finish.
+
+        :return: a list of names of the extracted members
+        """
+        if not self._process:
+            raise ImageExtractionError("The image is empty.")
+
+        rc = self._wait()
+
+        if rc != 0:
+            raise ImageExtractionError(self._get_error_message(
+                "tar exited with code {}".format(rc)
+            ))
+
+        return self._names
+
+    def kill(self):
+        """Kill the tar process."""
+        if not self._process or self._returncode is not None:
+            return
+
+        self._process.kill()
+        self._wait()
+
+    def _wait(self):
+        """Wait for the process and the reading threads."""
+        if self._returncode is not None:
+            return self._returncode
+
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+
+        self._returncode = self._process.wait()
+
+        for thread in self._threads:
+            thread.join()
+
+        for line in self._errors:
+            log.warning("tar: %s", line)
+
+        return self._returncode
+
+    def _get_error_message(self, message):
+        """Get an error message with the error output of tar."""
+        return "\n".join([message] + self._errors)
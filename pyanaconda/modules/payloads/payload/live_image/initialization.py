@@ -16,14 +16,15 @@
 # Red Hat, Inc.
 #
 import glob
-import hashlib
 import os
 from requests.exceptions import RequestException
 
-from pyanaconda.core.constants import NETWORK_CONNECTION_TIMEOUT, IMAGE_DIR
+from pyanaconda.core.constants import IMAGE_DIR
 from pyanaconda.core.util import lowerASCII, execWithRedirect
 from pyanaconda.modules.common.errors.payload import SourceSetupError
 from pyanaconda.modules.common.task import Task
+from pyanaconda.modules.payloads.payload.live_image.download import ImageDownloader, \
+    calculate_image_checksum
 from pyanaconda.modules.payloads.payload.live_image.utils import get_local_image_path_from_url, \
     get_proxies_from_option, url_target_is_tarfile
 from pyanaconda.payload.utils import mount, unmount
@@ -70,59 +71,65 @@ class SetupInstallationSourceImageTask(Task):
         return "Set up installation source image."
 
     def _download_image(self, url, image_path, session):
-        """Download the image using Requests with progress reporting"""
-        error = None
+        """Download the image using Requests with progress reporting.
+
+        :return: a SHA-256 checksum of the image
+        """
+        progress = None
+
+        def _report_progress(bytes_read, total_size):
+            nonlocal progress
+
+            if total_size is None:
+                return
+
+            if not progress:
+                progress = DownloadProgress(self._url, total_size, self.report_progress)
+
+            progress.update(bytes_read)
+
+        downloader = ImageDownloader(
+            session=session,
+            url=url,
+            proxies=get_proxies_from_option(self._proxy),
+            verify=not self._noverifyssl,
+            progress_callback=_report_progress
+        )
+
         try:
-            log.info("Starting image download")
-            with open(image_path, "wb") as f:
-                ssl_verify = not self._noverifyssl
-                proxies = get_proxies_from_option(self._proxy)
-                response = session.get(url, proxies=proxies, verify=ssl_verify, stream=True,
-                                       timeout=NETWORK_CONNECTION_TIMEOUT)
-                total_length = response.headers.get('content-length')
-                if total_length is None:
-                    # just download the file in one go and fake the progress reporting once done
-                    log.warning("content-length header is missing for the installation image, "
-                                "download progress reporting will not be available")
-                    f.write(response.content)
-                    size = f.tell()
-                    progress = DownloadProgress(self._url, size, self.report_progress)
-                    progress.end()
-                else:
-                    # requests return headers as strings, so convert total_length to int
-                    progress = DownloadProgress(self._url, int(total_length), self.report_progress)
-                    bytes_read = 0
-                    for buf in response.iter_content(1024 * 1024):
-                        if buf:
-                            f.write(buf)
-                            f.flush()
-                            bytes_read += len(buf)
-                            progress.update(bytes_read)
-                    progress.end()
-                log.info("Image download finished")
+            image_sum = downloader.download(image_path)
         except RequestException as e:
             error = "Error downloading liveimg: {}".format(e)
             log.error(error)
             raise SourceSetupError(error) from e
-        else:
-            if not os.path.exists(image_path):
-                error = "Failed to download {}, file doesn't exist".format(self._url)
-                log.error(error)
-                raise SourceSetupError(error)
-
-    def _check_image_sum(self, image_path, checksum):
-        self.report_progress("Checking image checksum")
-        sha256 = hashlib.sha256()
-        with open(image_path, "rb") as f:
-            while True:
-                data = f.read(1024 * 1024)
-                if not data:
-                    break
-                sha256.update(data)
-        filesum = sha256.hexdigest()
-        log.debug("sha256 of %s is %s", image_path, filesum)
-
-        if lowerASCII(checksum) != filesum:
+
+        if not os.path.exists(image_path):
+            error = "Failed to download {}, file doesn't exist".format(self._url)
+            log.error(error)
+            raise SourceSetupError(error)
+
+        if not progress:
+            # fake the progress reporting once done
+            size = os.path.getsize(image_path)
+            progress = DownloadProgress(self._url, size, self.report_progress)
+
+        progress.end()
+        return image_sum
+
+    def _check_image_sum(self, image_path, checksum, image_sum=None):
+        """Check the checksum of the image.
+
+        :param image_path: a path to the image
+        :param checksum: an expected checksum
+        :param image_sum: a checksum calculated during the download or None
+        """
+        if image_sum is None:
+            self.report_progress("Checking image checksum")
+            image_sum = calculate_image_checksum(image_path)
+
+        log.debug("sha256 of %s is %s", image_path, image_sum)
+
+        if lowerASCII(checksum) != image_sum:
             log.error("%s does not match checksum of %s.", checksum, image_path)
             raise SourceSetupError("Checksum of image {} does not match".format(image_path))
 
@@ -172,18 +179,19 @@ class SetupInstallationSourceImageTask(Task):
 
     def run(self):
         """Run set up or installation source."""
+        image_sum = None
         image_path_from_url = get_local_image_path_from_url(self._url)
         if image_path_from_url:
             self._image_path = image_path_from_url
         else:
-            self._download_image(self._url, self._image_path, self._session)
+            image_sum = self._download_image(self._url, self._image_path, self._session)
 
         # TODO - do we use it at all in LiveImage
         # Used to make install progress % look correct
         # self._adj_size = os.stat(self.image_path).st_size
 
         if self._checksum:
-            self._check_image_sum(self._image_path, self._checksum)
+            self._check_image_sum(self._image_path, self._checksum, image_sum)
 
         if not url_target_is_tarfile(self._url):
             self._mount_image(self._image_path, self._image_mount_point)
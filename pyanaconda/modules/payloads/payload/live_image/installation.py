@@ -15,10 +15,15 @@
 # License and may only be used or replicated with the express permission of
 # Red Hat, Inc.
 #
+from requests.exceptions import RequestException
+
 from pyanaconda.modules.common.task import Task
 from pyanaconda.modules.common.errors.payload import InstallError
-from pyanaconda.core.util import execWithRedirect
+from pyanaconda.modules.payloads.base.progress import CopyProgress
 from pyanaconda.modules.payloads.base.utils import create_rescue_image
+from pyanaconda.modules.payloads.payload.live_image.download import ImageDownloader, \
+    ImageExtractionError, extract_tar_image
+from pyanaconda.modules.payloads.payload.live_image.utils import get_proxies_from_option
 
 from pyanaconda.anaconda_loggers import get_module_logger
 log = get_module_logger(__name__)
@@ -39,25 +44,85 @@ class InstallFromTarTask(Task):
 
     def run(self):
         """Run installation of the payload from a tarball."""
-        cmd = "tar"
-        # preserve: ACL's, xattrs, and SELinux context
-        args = ["--numeric-owner", "--selinux", "--acls", "--xattrs", "--xattrs-include", "*",
-                "--exclude", "dev/*", "--exclude", "proc/*", "--exclude", "tmp/*",
-                "--exclude", "sys/*", "--exclude", "run/*", "--exclude", "boot/*rescue*",
-                "--exclude", "boot/loader", "--exclude", "boot/efi/loader",
-                "--exclude", "etc/machine-id", "-xaf", self._tarfile_path, "-C", self._dest_path]
+        progress = CopyProgress(self.report_progress)
+
         try:
-            rc = execWithRedirect(cmd, args)
-        except (OSError, RuntimeError) as e:
-            msg = None
-            err = str(e)
-            log.error(err)
-        else:
-            err = None
-            msg = "%s exited with code %d" % (cmd, rc)
-            log.info(msg)
-
-        if err:
-            raise InstallError(err or msg)
+            extract_tar_image(
+                self._tarfile_path,
+                self._dest_path,
+                progress_callback=progress.update_with_total
+            )
+        except (OSError, ImageExtractionError) as e:
+            log.error(str(e))
+            raise InstallError(str(e)) from e
 
+        progress.end()
         create_rescue_image(self._dest_path, self._kernel_version_list)
+
+
+class InstallFromTarStreamTask(Task):
+    """Task to install the payload from a remote tarball.
+
+    The tarball is extracted while it is downloaded, so it doesn't
+    have to be stored on the target system. The list of kernel
+    versions is collected from the names of the extracted files.
+
+    The checksum can be verified only after the extraction, so
+    the tarballs with a checksum should be installed from a file.
+    """
+
+    def __init__(self, url, proxy, noverifyssl, image_path, dest_path, session):
+        """Create a new task.
+
+        :param url: installation source image url
+        :type url: str
+        :param proxy: proxy to be used to fetch the image
+        :type proxy: str
+        :param image_path: path for the whole image if the download can't be resumed
+        :type image_path: str
+        :param dest_path: destination path for the extraction
+        :type dest_path: str
+        :param session: Requests session for image download
+        :type session:
+        """
+        super().__init__()
+        self._url = url
+        self._proxy = proxy
+        self._noverifyssl = noverifyssl
+        self._image_path = image_path
+        self._dest_path = dest_path
+        self._session = session
+
+    @property
+    def name(self):
+        return "Install the payload from a remote tarball"
+
+    def run(self):
+        """Run installation of the payload from a remote tarball.
+
+        :return: a list of kernel versions
+        """
+        progress = CopyProgress(self.report_progress)
+        downloader = ImageDownloader(
+            session=self._session,
+            url=self._url,
+            proxies=get_proxies_from_option(self._proxy),
+            verify=not self._noverifyssl,
+            progress_callback=progress.update_with_total
+        )
+
+        try:
+            image_sum, kernel_version_list = downloader.extract(
+                self._dest_path,
+                self._image_path
+            )
+        except (OSError, RequestException, ImageExtractionError) as e:
+            msg = "Failed to install the tarball {}: {}".format(self._url, e)
+            log.error(msg)
+            raise InstallError(msg) from e
+
+        progress.end()
+        log.debug("sha256 of %s is %s", self._url, image_sum)
+
+        create_rescue_image(self._dest_path, kernel_version_list)
+        return kernel_version_list
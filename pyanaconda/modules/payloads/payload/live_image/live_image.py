@@ -104,7 +104,20 @@ class LiveImageModule(PayloadBase):
 
     def install_with_tasks(self):
         """Install the payload."""
-        # if url_target_is_tarfile(self._url):
+        # if conf.payload.liveimg_stream_tar and url_target_is_tarfile(self._url) \
+        #         and not get_local_image_path_from_url(self._url) and not self.checksum:
+        #     task = InstallFromTarStreamTask(
+        #         self.url,
+        #         self.proxy,
+        #         self.noverifyssl,
+        #         self.image_path,
+        #         conf.target.system_root,
+        #         self.requests_session
+        #     )
+        #     task.succeeded_signal.connect(
+        #         lambda: self.set_kernel_version_list(task.get_result())
+        #     )
+        # elif url_target_is_tarfile(self._url):
         #     task = InstallFromTarTask(
         #         self.image_path,
         #         conf.target.system_root,
@@ -25,16 +25,66 @@ from pyanaconda.core.constants import TAR_SUFFIX
 from pyanaconda.anaconda_loggers import get_module_logger
 log = get_module_logger(__name__)
 
+# Options of tar for the extraction of a tar image. Preserve ACL's, xattrs,
+# and SELinux context and exclude files that shouldn't be installed.
+TAR_EXTRACTION_OPTIONS = [
+    "--numeric-owner", "--selinux", "--acls", "--xattrs", "--xattrs-include", "*",
+    "--exclude", "dev/*", "--exclude", "proc/*", "--exclude", "tmp/*",
+    "--exclude", "sys/*", "--exclude", "run/*", "--exclude", "boot/*rescue*",
+    "--exclude", "boot/loader", "--exclude", "boot/efi/loader",
+    "--exclude", "etc/machine-id"
+]
+
+# Options of tar for decompression of tar images based on their suffixes.
+TAR_COMPRESSION_OPTIONS = {
+    ".tbz": "--bzip2",
+    ".tar.bz2": "--bzip2",
+    ".tgz": "--gzip",
+    "tar.gz": "--gzip",
+    ".txz": "--xz",
+    "tar.xz": "--xz",
+}
+
+# Options of tar for decompression of tar images based on their magic numbers.
+TAR_COMPRESSION_MAGIC = {
+    b"\x1f\x8b": "--gzip",
+    b"BZh": "--bzip2",
+    b"\xfd7zXZ\x00": "--xz",
+}
+
 
 def get_kernel_version_list_from_tar(tarfile_path):
     with tarfile.open(tarfile_path) as archive:
         names = archive.getnames()
 
-        # Strip out vmlinuz- from the names
-        kernel_version_list = sorted((n.split("/")[-1][8:] for n in names
-                                      if "boot/vmlinuz-" in n),
-                                     key=functools.cmp_to_key(version_cmp))
-    return kernel_version_list
+    return get_kernel_version_list_from_names(names)
+
+
+def get_kernel_version_list_from_names(names):
+    """Get a sorted list of kernel versions from names of files.
+
+    :param names: an iterable of paths to files
+    :return: a list of kernel versions
+    """
+    # Strip out vmlinuz- from the names
+    return sorted((n.split("/")[-1][8:] for n in names if "boot/vmlinuz-" in n),
+                  key=functools.cmp_to_key(version_cmp))
+
+
+def get_tar_compression_options(url):
+    """Get options of tar for decompression of the tar image.
+
+    Tar can't detect the compression of an archive read from
+    the standard input, so we have to guess it from the url.
+
+    :param url: an url of the tar image
+    :return: a list of options
+    """
+    for suffix, option in TAR_COMPRESSION_OPTIONS.items():
+        if url.endswith(suffix):
+            return [option]
+
+    return []
 
 
 def get_local_image_path_from_url(url):
@@ -59,3 +109,23 @@ def get_proxies_from_option(proxy_option):
 def url_target_is_tarfile(url):
     """Does the url point to a tarfile?"""
     return any(url.endswith(suffix) for suffix in TAR_SUFFIX)
+
+
+def get_tar_compression_options_from_file(tarfile_path):
+    """Get options of tar for decompression of the local tar image.
+
+    The compression is detected from the magic number of the file,
+    because the name of a downloaded image doesn't have to keep the
+    original suffix.
+
+    :param tarfile_path: a path to the tar image
+    :return: a list of options
+    """
+    with open(tarfile_path, "rb") as f:
+        header = f.read(6)
+
+    for magic, option in TAR_COMPRESSION_MAGIC.items():
+        if header.startswith(magic):
+            return [option]
+
+    return []
@@ -171,13 +171,13 @@ class ConfigureServicesTask(Task):
         return "Configure services"
 
     def run(self):
-        for service_name in self._disabled_services:
-            log.debug("Disabling service: %s.", service_name)
-            util.disable_service(service_name, root=self._sysroot)
+        if self._disabled_services:
+            log.debug("Disabling services: %s.", ", ".join(self._disabled_services))
+            util.disable_services(self._disabled_services, root=self._sysroot)
 
-        for service_name in self._enabled_services:
-            log.debug("Enabling service: %s.", service_name)
-            util.enable_service(service_name, root=self._sysroot)
+        if self._enabled_services:
+            log.debug("Enabling services: %s.", ", ".join(self._enabled_services))
+            util.enable_services(self._enabled_services, root=self._sysroot)
 
 
 class ConfigureSystemdDefaultTargetTask(Task):
@@ -16,6 +16,8 @@
 # Red Hat, Inc.
 #
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from glob import glob
 
 from pyanaconda.core.kernel import kernel_arguments
@@ -55,11 +57,15 @@ def create_rescue_images(sysroot, kernel_versions):
         log.debug("new-kernel-pkg does not exist, calling scripts directly.")
         use_nkp = False
 
+    # There is only one rescue image for all kernels and the scripts
+    # update the boot loader configuration, so the kernels are processed
+    # one by one.
     for kernel in kernel_versions:
         log.info("Generating rescue image for %s.", kernel)
 
         if use_nkp:
-            execWithRedirect(
+            _execute_for_kernel(
+                kernel,
                 "new-kernel-pkg",
                 ["--rpmposttrans", kernel],
                 root=sysroot
@@ -73,7 +79,8 @@ def create_rescue_images(sysroot, kernel_versions):
             )
 
             for file in files:
-                execWithRedirect(
+                _execute_for_kernel(
+                    kernel,
                     file,
                     [kernel, "/boot/vmlinuz-%s" % kernel],
                     root=sysroot
@@ -270,6 +277,11 @@ def recreate_initrds(sysroot, kernel_versions):
     This needs to be done after all configuration files have been
     written, since dracut depends on some of them.
 
+    The initrds are generated by dracut in parallel, because every
+    kernel has its own initrd. The new-kernel-pkg tool updates also
+    the boot loader configuration, so it is called for one kernel
+    at a time.
+
     :param sysroot: a path to the root of the installed system
     :param kernel_versions: a list of kernel versions
     """
@@ -279,7 +291,7 @@ def recreate_initrds(sysroot, kernel_versions):
         log.debug("new-kernel-pkg does not exist, using dracut instead")
         use_dracut = True
 
-    for kernel in kernel_versions:
+    def _recreate_initrd(kernel):
         log.info("Recreating initrd for %s", kernel)
 
         if conf.target.is_image:
@@ -287,39 +299,95 @@ def recreate_initrds(sysroot, kernel_versions):
             # turn it off by passing the -N option, because the mode is not
             # sensible for disk image installations. Using /dev/disk/by-uuid/
             # is necessary due to disk image naming.
-            execWithRedirect(
+            _execute_for_kernel(
+                kernel,
                 "dracut", [
                     "-N", "--persistent-policy", "by-uuid",
                     "-f", "/boot/initramfs-%s.img" % kernel, kernel
                 ],
                 root=sysroot
             )
+        elif use_dracut:
+            _execute_for_kernel(
+                kernel,
+                "depmod", ["-a", kernel], root=sysroot
+            )
+            _execute_for_kernel(
+                kernel,
+                "dracut",
+                ["-f", "/boot/initramfs-%s.img" % kernel, kernel],
+                root=sysroot
+            )
         else:
-            if use_dracut:
-                execWithRedirect(
-                    "depmod", ["-a", kernel], root=sysroot
-                )
-                execWithRedirect(
-                    "dracut",
-                    ["-f", "/boot/initramfs-%s.img" % kernel, kernel],
-                    root=sysroot
-                )
-            else:
-                execWithRedirect(
-                    "new-kernel-pkg",
-                    ["--mkinitrd", "--dracut", "--depmod", "--update", kernel],
-                    root=sysroot
-                )
+            _execute_for_kernel(
+                kernel,
+                "new-kernel-pkg",
+                ["--mkinitrd", "--dracut", "--depmod", "--update", kernel],
+                root=sysroot
+            )
 
-            # if the installation is running in fips mode then make sure
-            # fips is also correctly enabled in the installed system
-            if kernel_arguments.get("fips") == "1":
-                # We use the --no-bootcfg option as we don't want fips-mode-setup
-                # to modify the bootloader configuration. Anaconda already does
-                # everything needed & it would require grubby to be available on
-                # the system.
-                execWithRedirect(
-                    "fips-mode-setup",
-                    ["--enable", "--no-bootcfg"],
-                    root=sysroot
-                )
+    if conf.target.is_image or use_dracut:
+        max_workers = os.cpu_count() or 1
+    else:
+        max_workers = 1
+
+    _run_for_kernels(_recreate_initrd, kernel_versions, max_workers)
+
+    if conf.target.is_image or not kernel_versions:
+        return
+
+    # if the installation is running in fips mode then make sure
+    # fips is also correctly enabled in the installed system
+    if kernel_arguments.get("fips") == "1":
+        # We use the --no-bootcfg option as we don't want fips-mode-setup
+        # to modify the bootloader configuration. Anaconda already does
+        # everything needed & it would require grubby to be available on
+        # the system.
+        execWithRedirect(
+            "fips-mode-setup",
+            ["--enable", "--no-bootcfg"],
+            root=sysroot
+        )
+
+
+def _execute_for_kernel(kernel, command, argv, root):
+    """Run the command for the given kernel and report a failure."""
+    rc = execWithRedirect(command, argv, root=root)
+
+    if rc:
+        log.error("%s failed for %s with the exit code %s.", command, kernel, rc)
+
+    return rc
+
+
+def _run_for_kernels(function, kernel_versions, max_workers):
+    """Call the function for each kernel version.
+
+    The calls run in a pool of at most max_workers threads. Failures
+    are reported per kernel and the first one is raised at the end.
+
+    :param function: a function with a kernel version argument
+    :param kernel_versions: a list of kernel versions
+    :param max_workers: a maximal number of concurrent calls
+    """
+    if not kernel_versions:
+        return
+
+    def _run(kernel):
+        start = time.monotonic()
+
+        try:
+            function(kernel)
+        except Exception as e:  # pylint: disable=broad-except
+            log.error("Failed to process the kernel %s: %s", kernel, e)
+            return e
+
+        log.debug("Processed the kernel %s in %.2f s.", kernel, time.monotonic() - start)
+        return None
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(kernel_versions)),
+                            thread_name_prefix="AnaKernel") as executor:
+        errors = [e for e in executor.map(_run, kernel_versions) if e]
+
+    if errors:
+        raise errors[0]
@@ -19,7 +19,11 @@ import gi
 gi.require_version("BlockDev", "2.0")
 from gi.repository import BlockDev as blockdev
 
+import threading
+import time
+
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 from blivet import arch, util
 from blivet.devicefactory import get_device_type
@@ -39,6 +43,9 @@ from pyanaconda.modules.storage.platform import platform
 from pyanaconda.anaconda_loggers import get_module_logger
 log = get_module_logger(__name__)
 
+# The maximal number of checks that run at the same time.
+STORAGE_CHECKER_MAX_WORKERS = 4
+
 
 def verify_root(storage, constraints, report_error, report_warning):
     """ Verify the root.
@@ -140,8 +147,8 @@ def verify_partition_format_sizes(storage, constraints, report_error, report_war
     :param report_error: a function for error reporting
     :param report_warning: a function for warning reporting
     """
-    # storage.mountpoints is a property that returns a new dict each time, so
-    # iterating over it is thread-safe.
+    # storage.mountpoints is a new or a shared read-only dict, so iterating
+    # over it is thread-safe.
     filesystems = storage.mountpoints
 
     for (mount, device) in filesystems.items():
@@ -476,6 +483,38 @@ def verify_lvm_destruction(storage, constraints, report_error, report_warning):
             ))
 
 
+class StorageIndex(object):
+    """Read-only index of the storage model.
+
+    Blivet computes the lists of devices and the mount points again
+    on every access. The index computes them only once, so they can
+    be shared by all checks. Other attributes are provided directly
+    by the storage model. The storage model shouldn't be modified
+    while the index is used.
+    """
+
+    INDEXED_ATTRIBUTES = ("devices", "disks", "partitions", "mountpoints")
+
+    def __init__(self, storage):
+        """Create a new index.
+
+        :param storage: a storage to index
+        """
+        self._storage = storage
+        self._values = dict()
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if name not in self.INDEXED_ATTRIBUTES:
+            return getattr(self._storage, name)
+
+        with self._lock:
+            if name not in self._values:
+                self._values[name] = getattr(self._storage, name)
+
+            return self._values[name]
+
+
 class StorageCheckerReport(object):
     """Class for results of the storage checking."""
 
@@ -483,6 +522,7 @@ class StorageCheckerReport(object):
         self.info = list()
         self.errors = list()
         self.warnings = list()
+        self.durations = dict()
 
     @property
     def success(self):
@@ -517,6 +557,26 @@ class StorageCheckerReport(object):
         self.add_info("Found sanity warning: %s" % msg)
         self.warnings.append(msg)
 
+    def add_duration(self, name, duration):
+        """ Add a duration of a check.
+
+        :param str name: a name of the check
+        :param float duration: a duration of the check in seconds
+        """
+        self.durations[name] = self.durations.get(name, 0) + duration
+
+    def add_report(self, report):
+        """ Add messages and durations of another report.
+
+        :param report: an instance of StorageCheckerReport
+        """
+        self.info.extend(report.info)
+        self.errors.extend(report.errors)
+        self.warnings.extend(report.warnings)
+
+        for name, duration in report.durations.items():
+            self.add_duration(name, duration)
+
     def log(self, logger, error=True, warning=True, info=True):
         """ Log the messages.
 
@@ -529,6 +589,9 @@ class StorageCheckerReport(object):
             for msg in self.info:
                 logger.debug(msg)
 
+            for name, duration in self.durations.items():
+                logger.debug("Sanity check %s took %.3f s.", name, duration)
+
         if error:
             for msg in self.errors:
                 logger.error(msg)
@@ -543,19 +606,28 @@ class StorageChecker(object):
 
     def __init__(self):
         self.checks = list()
+        self.concurrent_checks = set()
         self.constraints = dict()
 
-    def add_check(self, callback):
+    def add_check(self, callback, concurrent=False):
         """ Add a callback for storage checking.
 
+        A concurrent check can run at the same time as other concurrent
+        checks. It can only read the storage and it can't depend on
+        other checks.
+
         :param callback: a check for the storage checking
         :type callback: a function with arguments (storage, constraints,
         report_error, report_warning), where storage is an instance of the
         storage to check, constraints is a dictionary of constraints and
         report_error and report_warning are functions for reporting messages.
+        :param bool concurrent: can the check run concurrently?
         """
         self.checks.append(callback)
 
+        if concurrent:
+            self.concurrent_checks.add(callback)
+
     def remove_check(self, callback):
         """ Remove a callback for storage checking.
 
@@ -564,6 +636,8 @@ class StorageChecker(object):
         if callback in self.checks:
             self.checks.remove(callback)
 
+        self.concurrent_checks.discard(callback)
+
     def add_constraint(self, name, value):
         """ Add a new constraint for storage checking.
 
@@ -611,16 +685,20 @@ class StorageChecker(object):
         result.add_info("Storage check started with constraints %s."
                         % constraints)
 
-        # Process checks.
+        # Run checks. The checks share an index of the storage.
+        checks = [c for c in self.checks if not skip or c not in skip]
+        reports = self._run_checks(checks, StorageIndex(storage), constraints)
+
+        # Process the reports in the order of checks.
         for check in self.checks:
             # Skip this check.
             if skip and check in skip:
                 result.add_info("Skipped sanity check %s." % check.__name__)
                 continue
 
-            # Run the check.
+            # Add the report of the check.
             result.add_info("Run sanity check %s." % check.__name__)
-            check(storage, constraints, result.add_error, result.add_warning)
+            result.add_report(reports.pop(0))
 
         # Report the result.
         if result.success:
@@ -630,6 +708,54 @@ class StorageChecker(object):
 
         return result
 
+    def _run_checks(self, checks, storage, constraints):
+        """ Run the given checks.
+
+        Checks that are not concurrent run first in the given order.
+        Then the concurrent checks run in a pool of threads.
+
+        :param checks: a list of checks to run
+        :param storage: the storage object to check
+        :param constraints: an dictionary of constraints
+        :return: a list of reports in the order of the checks
+        """
+        reports = [None] * len(checks)
+        concurrent = [i for i, c in enumerate(checks) if c in self.concurrent_checks]
+
+        for i, check in enumerate(checks):
+            if i not in concurrent:
+                reports[i] = self._run_check(check, storage, constraints)
+
+        if not concurrent:
+            return reports
+
+        with ThreadPoolExecutor(max_workers=min(STORAGE_CHECKER_MAX_WORKERS, len(concurrent)),
+                                thread_name_prefix="AnaStorageCheck") as executor:
+            futures = [
+                (i, executor.submit(self._run_check, checks[i], storage, constraints))
+                for i in concurrent
+            ]
+
+        for i, future in futures:
+            reports[i] = future.result()
+
+        return reports
+
+    @staticmethod
+    def _run_check(check, storage, constraints):
+        """ Run the given check.
+
+        :param check: a check to run
+        :param storage: the storage object to check
+        :param constraints: an dictionary of constraints
+        :return: an instance of StorageCheckerReport
+        """
+        report = StorageCheckerReport()
+        start = time.monotonic()
+        check(storage, constraints, report.add_error, report.add_warning)
+        report.add_duration(check.__name__, time.monotonic() - start)
+        return report
+
     def get_default_constraint_names(self):
         """Get a list of default constraint names."""
         return [
@@ -656,23 +782,24 @@ class StorageChecker(object):
     def set_default_checks(self):
         """Set the default checks."""
         self.checks = list()
-        self.add_check(verify_root)
-        self.add_check(verify_s390_constraints)
-        self.add_check(verify_partition_formatting)
-        self.add_check(verify_partition_sizes)
-        self.add_check(verify_partition_format_sizes)
+        self.concurrent_checks = set()
+        self.add_check(verify_root, concurrent=True)
+        self.add_check(verify_s390_constraints, concurrent=True)
+        self.add_check(verify_partition_formatting, concurrent=True)
+        self.add_check(verify_partition_sizes, concurrent=True)
+        self.add_check(verify_partition_format_sizes, concurrent=True)
         self.add_check(verify_bootloader)
-        self.add_check(verify_gpt_biosboot)
-        self.add_check(verify_swap)
-        self.add_check(verify_swap_uuid)
-        self.add_check(verify_mountpoints_on_linuxfs)
-        self.add_check(verify_mountpoints_on_root)
-        self.add_check(verify_mountpoints_not_on_root)
-        self.add_check(verify_unlocked_devices_have_key)
-        self.add_check(verify_luks_devices_have_key)
-        self.add_check(verify_luks2_memory_requirements)
-        self.add_check(verify_mounted_partitions)
-        self.add_check(verify_lvm_destruction)
+        self.add_check(verify_gpt_biosboot, concurrent=True)
+        self.add_check(verify_swap, concurrent=True)
+        self.add_check(verify_swap_uuid, concurrent=True)
+        self.add_check(verify_mountpoints_on_linuxfs, concurrent=True)
+        self.add_check(verify_mountpoints_on_root, concurrent=True)
+        self.add_check(verify_mountpoints_not_on_root, concurrent=True)
+        self.add_check(verify_unlocked_devices_have_key, concurrent=True)
+        self.add_check(verify_luks_devices_have_key, concurrent=True)
+        self.add_check(verify_luks2_memory_requirements, concurrent=True)
+        self.add_check(verify_mounted_partitions, concurrent=True)
+        self.add_check(verify_lvm_destruction, concurrent=True)
 
 
 # Setup the storage checker.
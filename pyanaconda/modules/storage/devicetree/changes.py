@@ -0,0 +1,175 @@
+#
+# Tracking of changes in the device tree
+#
+# Copyright (C) 2020 Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+from collections import deque
+
+from pyanaconda.anaconda_loggers import get_module_logger
+from pyanaconda.modules.common.structures.storage import DeviceTreeChangesData
+
+log = get_module_logger(__name__)
+
+__all__ = ["DeviceTreeChangesTracker", "get_device_fingerprint", "DEVICE_CHANGES_HISTORY_SIZE"]
+
+# The maximal number of remembered generations of the device tree.
+DEVICE_CHANGES_HISTORY_SIZE = 64
+
+
+def get_device_fingerprint(device):
+    """Get a fingerprint of the device.
+
+    The fingerprint contains the attributes of the device that
+    are presented to the user. If the fingerprint changes, the
+    data of the device should be requested again.
+
+    :param device: a device
+    :return: a tuple of attributes
+    """
+    fmt = device.format
+
+    return (
+        device.id,
+        device.type,
+        device.size,
+        device.exists,
+        device.protected,
+        tuple(d.name for d in device.parents),
+        tuple(d.name for d in device.children),
+        fmt.type,
+        fmt.exists,
+        getattr(fmt, "uuid", None),
+        getattr(fmt, "label", None),
+        getattr(fmt, "mountpoint", None),
+    )
+
+
+class DeviceTreeChangesTracker(object):
+    """Tracker of changes in the device tree.
+
+    The tracker keeps fingerprints of the devices in the device tree.
+    Every update compares the current devices with the fingerprints.
+    If the devices have changed, the generation of the device tree is
+    increased and the names of added, removed and changed devices are
+    remembered, so clients can ask for the changes since a generation
+    they already know instead of requesting data of all devices again.
+    """
+
+    def __init__(self, max_history=DEVICE_CHANGES_HISTORY_SIZE):
+        """Create a new tracker.
+
+        :param max_history: the maximal number of remembered generations
+        """
+        self._generation = 0
+        self._fingerprints = {}
+        self._history = deque(maxlen=max_history)
+
+    @property
+    def generation(self):
+        """The current generation of the device tree."""
+        return self._generation
+
+    def update(self, devices):
+        """Update the tracker with the current devices.
+
+        :param devices: a list of devices in the device tree
+        :return: a tuple of lists of names of added, removed and
+                 changed devices or None if nothing has changed
+        """
+        fingerprints = {d.name: get_device_fingerprint(d) for d in devices}
+
+        added = sorted(fingerprints.keys() - self._fingerprints.keys())
+        removed = sorted(self._fingerprints.keys() - fingerprints.keys())
+        changed = sorted(
+            name for name in fingerprints.keys() & self._fingerprints.keys()
+            if fingerprints[name] != self._fingerprints[name]
+        )
+
+        self._fingerprints = fingerprints
+
+        if not added and not removed and not changed:
+            return None
+
+        self._generation += 1
+        self._history.append((self._generation, added, removed, changed))
+
+        log.debug(
+            "The device tree has changed to the generation %s: "
+            "added %s, removed %s, changed %s",
+            self._generation, added, removed, changed
+        )
+
+        return added, removed, changed
+
+    def get_changes_since(self, generation):
+        """Get changes since the specified generation.
+
+        If the changes are not available, all known devices
+        are reported as added and the reset flag is set.
+
+        :param generation: a number of the generation
+        :return: an instance of DeviceTreeChangesData
+        """
+        data = DeviceTreeChangesData()
+        data.generation = self._generation
+
+        if generation == self._generation:
+            return data
+
+        if not self._is_available(generation):
+            data.reset = True
+            data.added = sorted(self._fingerprints.keys())
+            return data
+
+        # Find the first and the last kind of change of every device.
+        first = {}
+        last = {}
+
+        for number, added, removed, changed in self._history:
+            if number <= generation:
+                continue
+
+            for kind, names in (("added", added), ("removed", removed), ("changed", changed)):
+                for name in names:
+                    first.setdefault(name, kind)
+                    last[name] = kind
+
+        # The device was known before if it wasn't added first and
+        # it is known now if it wasn't removed at last.
+        for name in sorted(first):
+            existed = first[name] != "added"
+            exists = last[name] != "removed"
+
+            if existed and exists:
+                data.changed.append(name)
+            elif exists:
+                data.added.append(name)
+            elif existed:
+                data.removed.append(name)
+
+        return data
+
+    def _is_available(self, generation):
+        """Are the changes since the specified generation available?"""
+        if generation > self._generation:
+            return False
+
+        if not self._history:
+            return generation == self._generation
+
+        # The oldest remembered change leads to the given generation.
+        return generation >= self._history[0][0] - 1
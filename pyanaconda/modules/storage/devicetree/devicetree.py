@@ -18,12 +18,15 @@
 # Red Hat, Inc.
 #
 from pyanaconda.core.dbus import DBus
+from pyanaconda.core.signal import Signal
+from pyanaconda.core.util import LazyObject
 
 from pyanaconda.anaconda_loggers import get_module_logger
 from dasbus.server.publishable import Publishable
 from pyanaconda.modules.common.base import KickstartBaseModule
 from pyanaconda.modules.common.constants.objects import DEVICE_TREE
 from pyanaconda.modules.common.errors.storage import UnavailableStorageError
+from pyanaconda.modules.storage.devicetree.changes import DeviceTreeChangesTracker
 from pyanaconda.modules.storage.devicetree.devicetree_interface import DeviceTreeInterface
 from pyanaconda.modules.storage.devicetree.handler import DeviceTreeHandler
 from pyanaconda.modules.storage.devicetree.viewer import DeviceTreeViewer
@@ -39,6 +42,8 @@ class DeviceTreeModule(KickstartBaseModule, DeviceTreeViewer, DeviceTreeHandler,
     def __init__(self):
         super().__init__()
         self._storage = None
+        self.devices_changed = Signal()
+        self._changes_tracker = DeviceTreeChangesTracker()
 
     @property
     def storage(self):
@@ -55,6 +60,42 @@ class DeviceTreeModule(KickstartBaseModule, DeviceTreeViewer, DeviceTreeHandler,
         """Keep the instance of the current storage."""
         self._storage = storage
 
+        # Don't create the lazy storage just to track its devices.
+        # The changes will be found with the next request.
+        if not isinstance(storage, LazyObject):
+            self.update_devices_changes()
+
+    def update_devices_changes(self):
+        """Find changes of the devices in the storage model.
+
+        Increase the generation of the device tree and emit
+        the devices_changed signal if the devices have changed.
+        """
+        if self._storage is None:
+            return
+
+        changes = self._changes_tracker.update(self.storage.devices)
+
+        if changes:
+            self.devices_changed.emit(self._changes_tracker.generation, *changes)
+
+    def get_generation(self):
+        """Get the current generation of the device tree.
+
+        :return: a number of the generation
+        """
+        self.update_devices_changes()
+        return self._changes_tracker.generation
+
+    def get_changes_since(self, generation):
+        """Get changes of the devices since the specified generation.
+
+        :param generation: a number of the generation
+        :return: an instance of DeviceTreeChangesData
+        """
+        self.update_devices_changes()
+        return self._changes_tracker.get_changes_since(generation)
+
     def for_publication(self):
         """Return a DBus representation."""
         return DeviceTreeInterface(self)
@@ -17,9 +17,11 @@
 #
 # Red Hat Author(s): David Lehman <dlehman@redhat.com>
 #
+import copy
 import os
 
 from blivet.blivet import Blivet
+from blivet.devicetree import DeviceTree
 from blivet.devices import BTRFSSubVolumeDevice
 from blivet.formats import get_format
 from blivet.formats.disklabel import DiskLabel
@@ -235,6 +237,42 @@ class InstallerStorage(Blivet):
 
         return list(filter(is_supported, disks))
 
+    def copy_without_devices(self):
+        """Create a copy of the storage model without devices.
+
+        A full copy creates deep copies of all devices, formats and
+        actions in the device tree, which is expensive on systems with
+        many devices. This copy shares the configuration of the storage
+        model, but it has an empty device tree, so it is cheap. It is
+        useful only if the device tree of the copy is populated again.
+
+        :return: an instance of InstallerStorage
+        """
+        log.debug("Creating a copy of the storage without devices.")
+
+        # Save passphrases for luks devices so we don't have to reprompt.
+        for device in self.devices:
+            if device.format.type == "luks" and device.format.exists:
+                self.save_passphrase(device)
+
+        # Don't copy the device tree and the references to its devices.
+        # pylint: disable=protected-access
+        devices = self.devicetree._devices + self.devicetree._hidden
+        memo = {id(device): None for device in devices}
+        memo[id(self.devicetree)] = DeviceTree()
+
+        new = copy.deepcopy(self, memo)
+
+        # Clear out attributes that refer to devices.
+        new.roots = []
+        new.size_sets = []
+        new.fsset = FSSet(new.devicetree)
+
+        if new._bootloader:
+            new._bootloader.reset()
+
+        return new
+
     def reset(self, cleanup_only=False):
         """ Reset storage configuration to reflect actual system state.
 
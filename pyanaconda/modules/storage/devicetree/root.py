@@ -17,6 +17,11 @@
 #
 import os
 import shlex
+import tempfile
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
 
 from blivet import util as blivet_util
 from blivet.errors import StorageError
@@ -30,7 +35,14 @@ from pyanaconda.modules.storage.devicetree.fsset import BlkidTab, CryptTab
 from pyanaconda.anaconda_loggers import get_module_logger
 log = get_module_logger(__name__)
 
-__all__ = ["mount_existing_system", "find_existing_installations", "Root"]
+__all__ = ["mount_existing_system", "find_existing_installations", "Root",
+           "DeviceProbeCache", "device_probe_cache"]
+
+# The maximal number of devices probed at the same time.
+DEVICE_PROBE_MAX_WORKERS = 8
+
+# Files of an existing installation that are needed to find its devices.
+DEVICE_PROBE_FILES = ["etc/fstab", "etc/crypttab", "etc/blkid/blkid.tab"]
 
 
 def mount_existing_system(storage, root_device, read_only=None):
@@ -88,21 +100,25 @@ def find_existing_installations(devicetree, teardown_all=True):
     return []
 
 
-def _find_existing_installations(devicetree):
+def _find_existing_installations(devicetree, max_workers=DEVICE_PROBE_MAX_WORKERS):
     """Find existing GNU/Linux installations on devices from the device tree.
 
+    Devices that are not cached are set up one by one, but they are
+    mounted and read concurrently, every device at its own temporary
+    mount point. The results are cached, so unchanged file systems are
+    not mounted again on the next rescan.
+
     :param devicetree: a device tree to find existing installations in
+    :param max_workers: the maximal number of devices probed at the same time
     :return: roots of all found installations
     """
-    if not os.path.exists(conf.target.physical_root):
-        blivet_util.makedirs(conf.target.physical_root)
+    devices = [dev for dev in devicetree.devices if dev.direct and _can_be_probed(dev)]
+    results = [device_probe_cache.get(dev) for dev in devices]
+    probed = []
 
-    sysroot = conf.target.physical_root
-    roots = []
-    direct_devices = (dev for dev in devicetree.devices if dev.direct)
-    for device in direct_devices:
-        if not device.format.linux_native or not device.format.mountable or \
-           not device.controllable or not device.format.exists:
+    for i, device in enumerate(devices):
+        if results[i]:
+            log.debug("Using the cached probe of %s.", device.name)
             continue
 
         try:
@@ -111,31 +127,37 @@ def _find_existing_installations(devicetree):
             log_exception_info(log.warning, "setup of %s failed", [device.name])
             continue
 
-        options = device.format.options + ",ro"
-        try:
-            device.format.mount(options=options, mountpoint=sysroot)
-        except Exception:  # pylint: disable=broad-except
-            log_exception_info(log.warning, "mount of %s as %s failed", [device.name, device.format.type])
-            blivet_util.umount(mountpoint=sysroot)
+        probed.append(i)
+
+    # Mount and read the devices concurrently.
+    probed_results = _probe_devices([devices[i] for i in probed], max_workers)
+
+    for i, result in zip(probed, probed_results):
+        if not result:
             continue
 
-        if not os.access(sysroot + "/etc/fstab", os.R_OK):
-            blivet_util.umount(mountpoint=sysroot)
-            device.teardown()
+        device_probe_cache.store(devices[i], result)
+        results[i] = result
+
+        if not result.files:
+            devices[i].teardown()
+
+    roots = []
+
+    for result in results:
+        if not result or not result.files:
             continue
 
-        architecture, product, version = get_release_string(chroot=sysroot)
-        (mounts, swaps) = _parse_fstab(devicetree, chroot=sysroot)
-        blivet_util.umount(mountpoint=sysroot)
+        (mounts, swaps) = result.parse_fstab(devicetree)
 
         if not mounts and not swaps:
             # empty /etc/fstab. weird, but I've seen it happen.
             continue
 
         roots.append(Root(
-            product=product,
-            version=version,
-            arch=architecture,
+            product=result.product,
+            version=result.version,
+            arch=result.arch,
             mounts=mounts,
             swaps=swaps
         ))
@@ -143,6 +165,180 @@ def _find_existing_installations(devicetree):
     return roots
 
 
+def _can_be_probed(device):
+    """Can the device contain an existing installation?"""
+    return device.format.linux_native and device.format.mountable \
+        and device.controllable and device.format.exists
+
+
+def _probe_devices(devices, max_workers):
+    """Probe the devices for existing installations.
+
+    :param devices: a list of devices that are set up
+    :param max_workers: the maximal number of devices probed at the same time
+    :return: a list of instances of DeviceProbeResult or None for failed probes
+    """
+    if not devices:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(devices)),
+                            thread_name_prefix="AnaProbe") as executor:
+        return list(executor.map(_probe_device, devices))
+
+
+def _probe_device(device):
+    """Mount the device and read files of an existing installation.
+
+    :param device: a device that is set up
+    :return: an instance of DeviceProbeResult or None if the mount failed
+    """
+    start = time.monotonic()
+    mount_point = tempfile.mkdtemp(prefix="anaconda-probe-")
+
+    try:
+        options = device.format.options + ",ro"
+        try:
+            device.format.mount(options=options, mountpoint=mount_point)
+        except Exception:  # pylint: disable=broad-except
+            log_exception_info(log.warning, "mount of %s as %s failed",
+                               [device.name, device.format.type])
+            blivet_util.umount(mountpoint=mount_point)
+            return None
+
+        try:
+            result = DeviceProbeResult.read(mount_point)
+        finally:
+            blivet_util.umount(mountpoint=mount_point)
+
+    finally:
+        try:
+            os.rmdir(mount_point)
+        except OSError as e:
+            log.warning("Failed to remove the mount point %s: %s", mount_point, e)
+
+    log.debug("Probed %s in %.2f s.", device.name, time.monotonic() - start)
+    return result
+
+
+class DeviceProbeResult(object):
+    """A result of probing a device for an existing installation."""
+
+    def __init__(self, files=None, arch=None, product=None, version=None):
+        """Create a new result.
+
+        :param files: a dictionary of relative paths and contents of files
+                      or None if there is no existing installation
+        :param arch: a machine's architecture or None
+        :param product: a distribution name or None
+        :param version: a distribution version or None
+        """
+        self.files = files or {}
+        self.arch = arch
+        self.product = product
+        self.version = version
+
+    @classmethod
+    def read(cls, sysroot):
+        """Read the existing installation at the given path.
+
+        :param sysroot: a path to the mounted device
+        :return: an instance of DeviceProbeResult
+        """
+        if not os.access(sysroot + "/etc/fstab", os.R_OK):
+            return cls()
+
+        files = {}
+
+        for name in DEVICE_PROBE_FILES:
+            path = os.path.join(sysroot, name)
+
+            if not os.access(path, os.R_OK):
+                continue
+
+            with open(path, "rb") as f:
+                files[name] = f.read()
+
+        architecture, product, version = get_release_string(chroot=sysroot)
+        return cls(files, architecture, product, version)
+
+    def parse_fstab(self, devicetree):
+        """Parse the copy of /etc/fstab.
+
+        :param devicetree: a device tree
+        :return: a tuple of a mount dict and swap list
+        """
+        with tempfile.TemporaryDirectory(prefix="anaconda-probe-") as chroot:
+            for name, data in self.files.items():
+                path = os.path.join(chroot, name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+
+                with open(path, "wb") as f:
+                    f.write(data)
+
+            return _parse_fstab(devicetree, chroot=chroot)
+
+
+class DeviceProbeCache(object):
+    """Cache of the probed devices.
+
+    The results of probing are stored under a key based on the UUID
+    and the format of the device, so unchanged file systems don't have
+    to be mounted again on rescans. Devices without UUID are not cached.
+    """
+
+    def __init__(self):
+        self._results = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(device):
+        """Get a key of the device.
+
+        :param device: a device
+        :return: a tuple or None
+        """
+        uuid = getattr(device.format, "uuid", None)
+
+        if not uuid:
+            return None
+
+        return device.format.type, uuid, device.format.options, int(device.size)
+
+    def get(self, device):
+        """Get a cached result of the device.
+
+        :param device: a device
+        :return: an instance of DeviceProbeResult or None
+        """
+        key = self.get_key(device)
+
+        with self._lock:
+            return self._results.get(key)
+
+    def store(self, device, result):
+        """Store a result of the device.
+
+        :param device: a device
+        :param result: an instance of DeviceProbeResult
+        """
+        key = self.get_key(device)
+
+        if key is None:
+            return
+
+        with self._lock:
+            self._results[key] = result
+
+    def clear(self):
+        """Remove all cached results."""
+        with self._lock:
+            self._results.clear()
+
+
+# The cache of devices probed for existing installations.
+device_probe_cache = DeviceProbeCache()
+
+
 def get_release_string(chroot):
     """Identify the installation of a Linux distribution.
 
@@ -112,6 +112,22 @@ class DeviceTreeViewer(ABC):
         data.attrs = self._prune_attributes(data.attrs)
         return data
 
+    def get_devices_data(self, names):
+        """Get data of the specified devices.
+
+        :param names: a list of device names
+        :return: a list of instances of DeviceData
+        :raise: UnknownDeviceError if a device is not found
+        """
+        return list(map(self.get_device_data, names))
+
+    def get_all_devices_data(self):
+        """Get data of all devices in the device tree.
+
+        :return: a list of instances of DeviceData
+        """
+        return self.get_devices_data(self.get_devices())
+
     def _set_device_data(self, device, data):
         """Set data for a device of any type."""
         data.type = device.type
@@ -171,6 +187,15 @@ class DeviceTreeViewer(ABC):
         device = self._get_device(device_name)
         return self._get_format_data(device.format)
 
+    def get_formats_data(self, device_names):
+        """Get format data of the specified devices.
+
+        :param device_names: a list of device names
+        :return: a list of instances of DeviceFormatData
+        :raise: UnknownDeviceError if a device is not found
+        """
+        return list(map(self.get_format_data, device_names))
+
     def get_format_type_data(self, format_name):
         """Get the format type data.
 
@@ -17,12 +17,12 @@
 # License and may only be used or replicated with the express permission of
 # Red Hat, Inc.
 #
-from dasbus.server.interface import dbus_interface
+from dasbus.server.interface import dbus_interface, dbus_signal
 from pyanaconda.modules.common.base.base_template import InterfaceTemplate
 from dasbus.typing import *  # pylint: disable=wildcard-import
 from pyanaconda.modules.common.constants.interfaces import DEVICE_TREE_VIEWER
 from pyanaconda.modules.common.structures.storage import DeviceData, DeviceActionData, \
-    DeviceFormatData, OSData
+    DeviceFormatData, DeviceTreeChangesData, OSData
 
 __all__ = ["DeviceTreeViewerInterface"]
 
@@ -31,6 +31,47 @@ __all__ = ["DeviceTreeViewerInterface"]
 class DeviceTreeViewerInterface(InterfaceTemplate):
     """DBus interface for the device tree viewer."""
 
+    def connect_signals(self):
+        """Connect the signals."""
+        super().connect_signals()
+        self.implementation.devices_changed.connect(self.DevicesChanged)
+
+    @dbus_signal
+    def DevicesChanged(self, generation: UInt64, added: List[Str], removed: List[Str],
+                       changed: List[Str]):
+        """Signal changes of the devices in the device tree.
+
+        :param generation: a new generation of the device tree
+        :param added: a list of names of added devices
+        :param removed: a list of names of removed devices
+        :param changed: a list of names of changed devices
+        """
+        pass
+
+    def GetGeneration(self) -> UInt64:
+        """Get the current generation of the device tree.
+
+        The generation is increased every time the devices
+        in the device tree change.
+
+        :return: a number of the generation
+        """
+        return self.implementation.get_generation()
+
+    def GetChangesSince(self, generation: UInt64) -> Structure:
+        """Get changes of the devices since the specified generation.
+
+        Only data of the reported devices have to be requested
+        again. If the reset flag is set, the changes are not
+        available and all devices are reported as added.
+
+        :param generation: a number of a known generation
+        :return: a structure with changes of the device tree
+        """
+        return DeviceTreeChangesData.to_structure(
+            self.implementation.get_changes_since(generation)
+        )
+
     def GetRootDevice(self) -> Str:
         """Get the root device.
 
@@ -70,6 +111,22 @@ class DeviceTreeViewerInterface(InterfaceTemplate):
         """
         return DeviceData.to_structure(self.implementation.get_device_data(name))
 
+    def GetDevicesData(self, names: List[Str]) -> List[Structure]:
+        """Get data of the specified devices.
+
+        :param names: a list of device names
+        :return: a list of structures with device data
+        :raise: UnknownDeviceError if a device is not found
+        """
+        return DeviceData.to_structure_list(self.implementation.get_devices_data(names))
+
+    def GetAllDevicesData(self) -> List[Structure]:
+        """Get data of all devices in the device tree.
+
+        :return: a list of structures with device data
+        """
+        return DeviceData.to_structure_list(self.implementation.get_all_devices_data())
+
     def GetFormatData(self, name: Str) -> Structure:
         """Get the device format data.
 
@@ -78,6 +135,15 @@ class DeviceTreeViewerInterface(InterfaceTemplate):
         """
         return DeviceFormatData.to_structure(self.implementation.get_format_data(name))
 
+    def GetFormatsData(self, names: List[Str]) -> List[Structure]:
+        """Get format data of the specified devices.
+
+        :param names: a list of device names
+        :return: a list of structures with format data
+        :raise: UnknownDeviceError if a device is not found
+        """
+        return DeviceFormatData.to_structure_list(self.implementation.get_formats_data(names))
+
     def GetFormatTypeData(self, name: Str) -> Structure:
         """Get the format type data.
 
@@ -318,6 +318,7 @@ class DeviceTreeSchedulerModule(DeviceTreeModule):
         """
         task = AddDeviceTask(self.storage, request)
         task.run()
+        self.update_devices_changes()
 
     def change_device(self, request, original_request):
         """Change a device in the storage model.
@@ -331,6 +332,7 @@ class DeviceTreeSchedulerModule(DeviceTreeModule):
         device = self._get_device(request.device_spec)
         task = ChangeDeviceTask(self.storage, device, request, original_request)
         task.run()
+        self.update_devices_changes()
 
     def reset_device(self, device_name):
         """Reset the specified device in the storage model.
@@ -342,6 +344,7 @@ class DeviceTreeSchedulerModule(DeviceTreeModule):
         """
         device = self._get_device(device_name)
         utils.reset_device(self.storage, device)
+        self.update_devices_changes()
 
     def destroy_device(self, device_name):
         """Destroy the specified device in the storage model.
@@ -351,6 +354,7 @@ class DeviceTreeSchedulerModule(DeviceTreeModule):
         """
         device = self._get_device(device_name)
         utils.destroy_device(self.storage, device)
+        self.update_devices_changes()
 
     def schedule_partitions_with_task(self, request):
         """Schedule the partitioning actions.
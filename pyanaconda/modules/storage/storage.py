@@ -255,11 +255,13 @@ class StorageService(KickstartService):
 
         We will reset a copy of the current storage model
         and switch the models if the reset is successful.
+        The devices are not copied, because they will be
+        discovered again.
 
         :return: a task
         """
         # Copy the storage.
-        storage = self.storage.copy()
+        storage = self.storage.copy_without_devices()
 
         # Set up the storage.
         storage.ignored_disks = self._disk_selection_module.ignored_disks
@@ -83,6 +83,9 @@ class CreateUsersTask(Task):
         self._create_users()
 
     def _create_users(self):
+        # Set the passwords and restore the SELinux contexts at once.
+        batch = users.UserBatch(self._sysroot)
+
         for user_data in self._user_data_list:
             # UserData uses -1 for not-set uid/gid while the function takes None for not-set
             uid = None
@@ -102,10 +105,13 @@ class CreateUsersTask(Task):
                                   groups=user_data.groups,
                                   shell=user_data.shell,
                                   gecos=user_data.gecos,
-                                  root=self._sysroot)
+                                  root=self._sysroot,
+                                  batch=batch)
             except ValueError as e:
                 log.warning(str(e))
 
+        batch.commit()
+
 
 class CreateGroupsTask(Task):
     """Create groups on the target system."""
@@ -162,8 +168,13 @@ class SetSshKeysTask(Task):
         self._set_ssh_keys()
 
     def _set_ssh_keys(self):
+        # Restore the SELinux contexts at once.
+        batch = users.UserBatch(self._sysroot)
+
         for key_data in self._ssh_key_data_list:
-            users.set_user_ssh_key(key_data.username, key_data.key)
+            users.set_user_ssh_key(key_data.username, key_data.key, batch=batch)
+
+        batch.commit()
 
 
 class ConfigureRootPasswordSSHLoginTask(Task):
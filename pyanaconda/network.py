@@ -364,6 +364,49 @@ def _set_ntp_servers_from_dhcp():
         )
 
 
+def _wait_for_network_state(check, signals, timeout, interval):
+    """Wait for a state of the Network module.
+
+    The state is checked again every time one of the given DBus signals
+    is emitted. The signals are delivered only if there is a running
+    main loop, so the state is also checked periodically in the given
+    interval.
+
+    :param check: a function that returns True or False if the wait is
+                  over and None if we should keep waiting
+    :param signals: a list of DBus signals of the Network module
+    :param timeout: timeout in seconds
+    :param interval: a maximal interval between two checks in seconds
+    :return: a tuple of the result and the elapsed time in seconds
+    """
+    event = threading.Event()
+
+    def callback(*args, **kwargs):
+        event.set()
+
+    for signal in signals:
+        signal.connect(callback)
+
+    start = time.monotonic()
+
+    try:
+        while True:
+            event.clear()
+            result = check()
+            elapsed = time.monotonic() - start
+
+            if result is not None:
+                return result, elapsed
+
+            if elapsed >= timeout:
+                return False, elapsed
+
+            event.wait(min(interval, timeout - elapsed))
+    finally:
+        for signal in signals:
+            signal.disconnect(callback)
+
+
 def wait_for_connected_NM(timeout=constants.NETWORK_CONNECTION_TIMEOUT, only_connecting=False):
     """Wait for NM being connected.
 
@@ -391,34 +434,48 @@ def wait_for_connected_NM(timeout=constants.NETWORK_CONNECTION_TIMEOUT, only_con
     else:
         log.debug("waiting for connected NM, timeout=%d", timeout)
 
-    i = 0
-    while i < timeout:
-        i += constants.NETWORK_CONNECTED_CHECK_INTERVAL
-        time.sleep(constants.NETWORK_CONNECTED_CHECK_INTERVAL)
+    def check():
         if network_proxy.Connected:
-            log.debug("NM connected, waited %d seconds", i)
             return True
-        elif only_connecting:
-            if not network_proxy.IsConnecting():
-                break
+        elif only_connecting and not network_proxy.IsConnecting():
+            return False
+        return None
 
-    log.debug("NM not connected, waited %d seconds", i)
-    return False
+    connected, elapsed = _wait_for_network_state(
+        check,
+        signals=[network_proxy.PropertiesChanged],
+        timeout=timeout,
+        interval=constants.NETWORK_CONNECTED_CHECK_INTERVAL
+    )
+
+    if connected:
+        log.debug("NM connected, waited %d seconds", elapsed)
+    else:
+        log.debug("NM not connected, waited %d seconds", elapsed)
+
+    return connected
 
 
 def wait_for_network_devices(devices, timeout=constants.NETWORK_CONNECTION_TIMEOUT):
     """Wait for network devices to be activated with a connection."""
     devices = set(devices)
-    i = 0
     log.debug("waiting for connection of devices %s for iscsi", devices)
-    while i < timeout:
-        network_proxy = NETWORK.get_proxy()
+    network_proxy = NETWORK.get_proxy()
+
+    def check():
         activated_devices = network_proxy.GetActivatedInterfaces()
         if not devices - set(activated_devices):
             return True
-        i += 1
-        time.sleep(1)
-    return False
+        return None
+
+    activated, _elapsed = _wait_for_network_state(
+        check,
+        signals=[network_proxy.ActivatedInterfacesChanged],
+        timeout=timeout,
+        interval=constants.NETWORK_DEVICES_CHECK_INTERVAL
+    )
+
+    return activated
 
 
 def wait_for_connecting_NM_thread():
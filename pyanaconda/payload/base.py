@@ -91,6 +91,14 @@ class Payload(metaclass=ABCMeta):
     def needs_network(self):
         return False
 
+    def needs_storage(self, checkmount=True):
+        """Does the payload setup require the scanned storage?
+
+        :param bool checkmount: whether to check for valid mounted media
+        :return: True or False
+        """
+        return True
+
     ###
     # METHODS FOR QUERYING STATE
     ###
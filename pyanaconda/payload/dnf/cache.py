@@ -0,0 +1,335 @@
+#
+# Copyright (C) 2020  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import glob
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from collections import OrderedDict
+
+from pyanaconda.anaconda_loggers import get_packaging_logger
+from pyanaconda.payload.dnf.repomd import RepoMDMetaHash
+
+log = get_packaging_logger()
+
+__all__ = ["RepoMetadataCache", "DepsolveCache", "DepsolveResult", "DEPSOLVE_CACHE_SIZE"]
+
+# The maximal number of cached results of the dependency resolution.
+DEPSOLVE_CACHE_SIZE = 8
+
+
+class RepoMetadataCache(object):
+    """Persistent cache of repository metadata.
+
+    The metadata and the solv files of a loaded repository are stored
+    under a key based on the hash of its repomd.xml file. If the hash
+    of the repomd.xml file provided by the repository doesn't change,
+    the metadata can be restored from the cache and DNF doesn't have
+    to download and parse them again.
+
+    The least recently used entries are removed if the cache is bigger
+    than the given size.
+    """
+
+    REPO_DIR = "repo"
+    SOLV_DIR = "solv"
+
+    def __init__(self, cache_dir, dnf_cache_dir, max_size):
+        """Create a new cache.
+
+        :param cache_dir: a path to the persistent cache
+        :param dnf_cache_dir: a path to the cache of DNF
+        :param max_size: the maximal size of the persistent cache in bytes
+        """
+        self._cache_dir = cache_dir
+        self._dnf_cache_dir = dnf_cache_dir
+        self._max_size = max_size
+        self._lock = threading.Lock()
+
+    def get_repomd_hash(self, dnf_repo, proxy_url):
+        """Download the repomd.xml file of the repository and get its hash.
+
+        Only repositories with a base url are supported.
+
+        :param dnf_repo: a DNF repository
+        :param proxy_url: a proxy url or None
+        :return: a string with the hash or None
+        """
+        if not dnf_repo.baseurl:
+            return None
+
+        repomd = RepoMDMetaHash(dnf_repo, proxy_url)
+        repomd.store_repoMD_hash()
+
+        if not repomd.repoMD_downloaded:
+            return None
+
+        return repomd.repoMD_hash.hex()
+
+    def restore(self, dnf_repo, repomd_hash):
+        """Restore the metadata of the repository from the cache.
+
+        :param dnf_repo: a DNF repository
+        :param repomd_hash: a hash of the repomd.xml file
+        :return: True if the metadata were restored, otherwise False
+        """
+        entry_path = self._get_entry_path(dnf_repo, repomd_hash)
+
+        if not os.path.isdir(entry_path):
+            log.debug("repo %s: no cached metadata", dnf_repo.id)
+            return False
+
+        # Update the time of the last use.
+        self._touch(entry_path)
+        repo_cache_dir = self._get_repo_cache_dir(dnf_repo)
+
+        try:
+            shutil.rmtree(repo_cache_dir, ignore_errors=True)
+            shutil.copytree(os.path.join(entry_path, self.REPO_DIR), repo_cache_dir)
+
+            # The repomd.xml file is the same, so the metadata are not expired.
+            for root, _dirs, files in os.walk(repo_cache_dir):
+                for name in files:
+                    self._touch(os.path.join(root, name))
+
+            os.makedirs(self._dnf_cache_dir, exist_ok=True)
+
+            for path in glob.glob(os.path.join(entry_path, self.SOLV_DIR, "*")):
+                shutil.copy2(path, self._dnf_cache_dir)
+
+        except OSError as e:
+            log.debug("repo %s: failed to restore cached metadata: %s", dnf_repo.id, e)
+            shutil.rmtree(repo_cache_dir, ignore_errors=True)
+            return False
+
+        log.debug("repo %s: restored cached metadata %s", dnf_repo.id, repomd_hash)
+        return True
+
+    def store(self, dnf_repo, repomd_hash):
+        """Store the metadata of the loaded repository in the cache.
+
+        :param dnf_repo: a DNF repository
+        :param repomd_hash: a hash of the repomd.xml file
+        """
+        entry_path = self._get_entry_path(dnf_repo, repomd_hash)
+        repo_cache_dir = self._get_repo_cache_dir(dnf_repo)
+
+        if os.path.isdir(entry_path) or not os.path.isdir(repo_cache_dir):
+            return
+
+        os.makedirs(self._cache_dir, exist_ok=True)
+        tmp_path = tempfile.mkdtemp(dir=self._cache_dir, prefix=".")
+
+        try:
+            shutil.copytree(repo_cache_dir, os.path.join(tmp_path, self.REPO_DIR))
+            os.makedirs(os.path.join(tmp_path, self.SOLV_DIR))
+
+            for path in self._get_solv_files(dnf_repo):
+                shutil.copy2(path, os.path.join(tmp_path, self.SOLV_DIR))
+
+            os.rename(tmp_path, entry_path)
+        except OSError as e:
+            log.debug("repo %s: failed to cache metadata: %s", dnf_repo.id, e)
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return
+
+        log.debug("repo %s: cached metadata %s", dnf_repo.id, repomd_hash)
+        self._evict()
+
+    def _get_entry_path(self, dnf_repo, repomd_hash):
+        """Get a path to the cache entry."""
+        return os.path.join(self._cache_dir, "{}-{}".format(dnf_repo.id, repomd_hash))
+
+    def _get_repo_cache_dir(self, dnf_repo):
+        """Get a path to the DNF cache of the repository."""
+        # pylint: disable=protected-access
+        return dnf_repo._cachedir
+
+    def _get_solv_files(self, dnf_repo):
+        """Get paths to the solv files of the repository."""
+        return glob.glob(os.path.join(self._dnf_cache_dir, "{}.solv".format(dnf_repo.id))) \
+            + glob.glob(os.path.join(self._dnf_cache_dir, "{}-*.solvx".format(dnf_repo.id)))
+
+    @staticmethod
+    def _touch(path):
+        """Set the access and modification times of the path to now."""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _get_size(path):
+        """Get the size of the directory in bytes."""
+        size = 0
+
+        for root, _dirs, files in os.walk(path):
+            for name in files:
+                try:
+                    size += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+
+        return size
+
+    def _evict(self):
+        """Remove the least recently used entries if the cache is too big."""
+        with self._lock:
+            entries = []
+
+            for name in os.listdir(self._cache_dir):
+                path = os.path.join(self._cache_dir, name)
+
+                if name.startswith(".") or not os.path.isdir(path):
+                    continue
+
+                entries.append((os.path.getmtime(path), self._get_size(path), path))
+
+            total_size = sum(size for _mtime, size, _path in entries)
+
+            for mtime, size, path in sorted(entries):
+                if total_size <= self._max_size:
+                    break
+
+                log.debug("Removing cached metadata %s last used %s.",
+                          path, time.ctime(mtime))
+
+                shutil.rmtree(path, ignore_errors=True)
+                total_size -= size
+
+
+class DepsolveResult(object):
+    """A result of the dependency resolution of a software selection."""
+
+    def __init__(self, module_specs, goal=None, transaction=None, comps_transaction=None,
+                 error=None):
+        """Create a new result.
+
+        :param module_specs: a tuple of lists of module specs to enable and disable
+        :param goal: a resolved DNF goal
+        :param transaction: a DNF transaction or None
+        :param comps_transaction: a DNF transaction of groups and environments
+        :param error: an error message of the failed resolution or None
+        """
+        self.module_specs = module_specs
+        self.goal = goal
+        self.transaction = transaction
+        self.comps_transaction = comps_transaction
+        self.error = error
+        self.install_size = None
+
+
+class DepsolveCache(object):
+    """Cache of the dependency resolution.
+
+    The results of the dependency resolution are stored under a digest
+    of the software selection and the enabled repositories, so the same
+    selection doesn't have to be resolved again. The cache has to be
+    cleared every time the package sack is loaded.
+
+    The least recently used results are removed if there are more
+    results than the given maximum.
+    """
+
+    def __init__(self, max_entries=DEPSOLVE_CACHE_SIZE):
+        """Create a new cache.
+
+        :param max_entries: the maximal number of cached results
+        """
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(repos, module_specs, include_list, exclude_list, ignore_missing):
+        """Get a key of the software selection.
+
+        :param repos: a list of tuples with ids and repomd.xml hashes of enabled repositories
+        :param module_specs: a tuple of lists of module specs to enable and disable
+        :param include_list: a list of specs to install
+        :param exclude_list: a list of specs to exclude
+        :param ignore_missing: should we ignore missing packages and groups?
+        :return: a string with the key
+        """
+        data = json.dumps({
+            "repos": sorted(repos),
+            "modules": module_specs,
+            "include": include_list,
+            "exclude": exclude_list,
+            "ignore_missing": ignore_missing,
+        }, sort_keys=True)
+
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Get a cached result.
+
+        :param key: a key of the software selection
+        :return: an instance of DepsolveResult or None
+        """
+        with self._lock:
+            result = self._entries.get(key)
+
+            if result is not None:
+                self._entries.move_to_end(key)
+
+            return result
+
+    def store(self, key, result):
+        """Store the result of the dependency resolution.
+
+        :param key: a key of the software selection
+        :param result: an instance of DepsolveResult
+        """
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def get_install_size(self, transaction, calculate_size):
+        """Get the install size of the transaction.
+
+        The size is calculated only once for every cached transaction.
+
+        :param transaction: a DNF transaction
+        :param calculate_size: a function that calculates the size of the transaction
+        :return: the install size
+        """
+        with self._lock:
+            results = [r for r in self._entries.values() if r.transaction is transaction]
+
+        if not results:
+            return calculate_size(transaction)
+
+        result = results[0]
+
+        if result.install_size is None:
+            result.install_size = calculate_size(transaction)
+
+        return result.install_size
+
+    def clear(self):
+        """Remove all cached results."""
+        with self._lock:
+            self._entries.clear()
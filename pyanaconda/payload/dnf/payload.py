@@ -44,7 +44,8 @@ from pyanaconda.modules.common.structures.payload import RepoConfigurationData
 from pyanaconda.modules.payloads.payload.dnf.requirements import collect_language_requirements, \
     collect_platform_requirements, collect_driver_disk_requirements, collect_remote_requirements, \
     apply_requirements
-from pyanaconda.modules.payloads.payload.dnf.utils import get_kernel_package
+from pyanaconda.modules.payloads.payload.dnf.utils import get_kernel_package, \
+    calculate_installation_size
 from pyanaconda.payload.source import SourceFactory, PayloadSourceTypeUnrecognized
 from pykickstart.constants import GROUP_ALL, GROUP_DEFAULT, KS_MISSING_IGNORE, KS_BROKEN_IGNORE, \
     GROUP_REQUIRED
@@ -56,7 +57,8 @@ from pyanaconda.core import constants, util
 from pyanaconda.core.configuration.anaconda import conf
 from pyanaconda.core.constants import INSTALL_TREE, ISO_DIR, PAYLOAD_TYPE_DNF, \
     SOURCE_TYPE_URL, SOURCE_TYPE_CDROM, URL_TYPE_BASEURL, URL_TYPE_MIRRORLIST, \
-    URL_TYPE_METALINK, SOURCE_REPO_FILE_TYPES, SOURCE_TYPE_CDN
+    URL_TYPE_METALINK, SOURCE_REPO_FILE_TYPES, SOURCE_TYPE_CDN, \
+    SOURCE_TYPES_REQUIRING_STORAGE
 from pyanaconda.core.i18n import N_, _
 from pyanaconda.core.kernel import kernel_arguments
 from pyanaconda.core.payload import ProxyString, ProxyStringError
@@ -73,10 +75,12 @@ from pyanaconda.modules.common.util import is_module_available
 from pyanaconda.payload import utils as payload_utils
 from pyanaconda.payload.base import Payload
 from pyanaconda.payload.dnf.utils import DNF_CACHE_DIR, DNF_PLUGINCONF_DIR, REPO_DIRS, \
-    DNF_LIBREPO_LOG, DNF_PACKAGE_CACHE_DIR_SUFFIX, BONUS_SIZE_ON_FILE, YUM_REPOS_DIR, \
-    go_to_failure_limbo, do_transaction, get_df_map, pick_mount_point
+    DNF_METADATA_CACHE_DIR, DNF_METADATA_CACHE_SIZE, DNF_LIBREPO_LOG, \
+    DNF_PACKAGE_CACHE_DIR_SUFFIX, YUM_REPOS_DIR, go_to_failure_limbo, do_transaction, \
+    get_df_map, pick_mount_point, load_repos_metadata
 from pyanaconda.payload.dnf.download_progress import DownloadProgress
 from pyanaconda.payload.dnf.repomd import RepoMDMetaHash
+from pyanaconda.payload.dnf.cache import RepoMetadataCache, DepsolveCache, DepsolveResult
 from pyanaconda.payload.errors import MetadataError, PayloadError, NoSuchGroup, DependencyError, \
     PayloadInstallError, PayloadSetupError
 from pyanaconda.payload.image import find_first_iso_image, mountImage, find_optical_install_media
@@ -91,6 +95,9 @@ log = get_packaging_logger()
 
 USER_AGENT = "%s (anaconda)/%s" % (productName, productVersion)
 
+# Private attributes of the DNF base used to restore a cached transaction.
+DEPSOLVE_BASE_ATTRIBUTES = ("_goal", "_transaction", "_comps_trans")
+
 __all__ = ["DNFPayload"]
 
 
@@ -119,6 +126,10 @@ class DNFPayload(Payload):
         self._download_location = None
         self._updates_enabled = True
 
+        # Cache of the dependency resolution and the applied module specs
+        self._depsolve_cache = DepsolveCache()
+        self._module_specs = None
+
         # FIXME: Don't call this method before set_from_opts.
         # This will create a default source if there is none.
         self._configure()
@@ -132,6 +143,13 @@ class DNFPayload(Payload):
         # save repomd metadata
         self._repoMD_list = []
 
+        # Persistent cache of the repo metadata
+        self._metadata_cache = RepoMetadataCache(
+            cache_dir=DNF_METADATA_CACHE_DIR,
+            dnf_cache_dir=DNF_CACHE_DIR,
+            max_size=DNF_METADATA_CACHE_SIZE.get_bytes()
+        )
+
         # Additional packages required by installer based on used features
         self._requirements = []
 
@@ -225,6 +243,24 @@ class DNFPayload(Payload):
         return (self.proxy.IsNetworkRequired() or
                 any(self._repo_needs_network(repo) for repo in self.data.repo.dataList()))
 
+    def needs_storage(self, checkmount=True):
+        """Test the sources if they require the scanned storage.
+
+        The local sources and the hard drive based repositories have to be
+        looked up in the device tree. The default source can be replaced by
+        a valid install media if we should check the mounted media.
+
+        :param bool checkmount: whether to check for valid mounted media
+        :return: True or False
+        """
+        if checkmount and self.is_source_default():
+            return True
+
+        if self.source_type in SOURCE_TYPES_REQUIRING_STORAGE:
+            return True
+
+        return any(repo.is_harddrive_based() for repo in self.data.repo.dataList())
+
     def _repo_needs_network(self, repo):
         """Returns True if the ksdata repo requires networking."""
         urls = [repo.baseurl]
@@ -264,8 +300,11 @@ class DNFPayload(Payload):
 
         return None
 
-    def _process_module_command(self):
-        """Enable/disable modules (if any)."""
+    def _get_module_specs(self):
+        """Get module specs to enable and disable.
+
+        :return: a tuple of lists of module specs to enable and disable
+        """
         # convert data from kickstart to module specs
         module_specs_to_enable = []
         module_specs_to_disable = []
@@ -284,6 +323,15 @@ class DNFPayload(Payload):
             else:
                 module_specs_to_disable.append(module_spec)
 
+        return module_specs_to_enable, module_specs_to_disable
+
+    def _process_module_command(self, module_specs):
+        """Enable/disable modules (if any).
+
+        :param module_specs: a tuple of lists of module specs to enable and disable
+        """
+        module_specs_to_enable, module_specs_to_disable = module_specs
+
         # forward the module specs to disable to DNF
         log.debug("disabling modules: %s", module_specs_to_disable)
         try:
@@ -306,8 +354,12 @@ class DNFPayload(Payload):
                       "or modules are missing or broken:\n%s", e)
             self._payload_setup_error(e)
 
-    def _apply_selections(self):
-        log.debug("applying DNF package/group/module selection")
+    def _get_selections(self):
+        """Get the package/group/module selection.
+
+        :return: a tuple of lists of specs to install and exclude
+        """
+        log.debug("getting DNF package/group/module selection")
 
         # note about package/group/module spec formatting:
         # - leading @ signifies a group or module
@@ -399,6 +451,16 @@ class DNFPayload(Payload):
         log.debug("transaction exclude list")
         log.debug(exclude_list)
 
+        return include_list, exclude_list
+
+    def _apply_selections(self, include_list, exclude_list):
+        """Apply the package/group/module selection.
+
+        :param include_list: a list of specs to install
+        :param exclude_list: a list of specs to exclude
+        """
+        log.debug("applying DNF package/group/module selection")
+
         # feed it to DNF
         try:
             # FIXME: Remove self._base.conf.strict workaround when bz1761518 is fixed
@@ -495,6 +557,8 @@ class DNFPayload(Payload):
 
     def _configure(self):
         self._base = dnf.Base()
+        self._module_specs = None
+        self._depsolve_cache.clear()
         config = self._base.conf
         config.cachedir = DNF_CACHE_DIR
         config.pluginconfpath = DNF_PLUGINCONF_DIR
@@ -603,16 +667,26 @@ class DNFPayload(Payload):
 
         return pkgdir
 
-    def _sync_metadata(self, dnf_repo):
-        try:
-            dnf_repo.load()
-        except dnf.exceptions.RepoError as e:
-            id_ = dnf_repo.id
-            log.info('_sync_metadata: addon repo error: %s', e)
-            self.disable_repo(id_)
-            self.verbose_errors.append(str(e))
-        log.debug('repo %s: _sync_metadata success from %s', dnf_repo.id,
-                  dnf_repo.baseurl or dnf_repo.mirrorlist or dnf_repo.metalink)
+    def _sync_metadata(self, dnf_repos):
+        """Load metadata of the given repositories.
+
+        Failed repositories are disabled.
+
+        :param dnf_repos: a list of DNF repositories
+        """
+        errors = self._load_repos_metadata(dnf_repos)
+
+        for dnf_repo in dnf_repos:
+            e = errors.get(dnf_repo.id)
+
+            if e:
+                log.info('_sync_metadata: addon repo error: %s', e)
+                self.disable_repo(dnf_repo.id)
+                self.verbose_errors.append(str(e))
+                continue
+
+            log.debug('repo %s: _sync_metadata success from %s', dnf_repo.id,
+                      dnf_repo.baseurl or dnf_repo.mirrorlist or dnf_repo.metalink)
 
     @property
     def base_repo(self):
@@ -854,6 +928,22 @@ class DNFPayload(Payload):
 
         log.info("added repo: '%s' - %s", ksrepo.name, url or mirrorlist or metalink)
 
+    def _load_repos_metadata(self, dnf_repos):
+        """Load metadata of the given repositories.
+
+        The metadata are restored from the persistent cache if the
+        repomd.xml files of the repositories haven't changed.
+
+        :param dnf_repos: a list of DNF repositories
+        :return: a dictionary of ids of failed repositories and their errors
+        """
+        return load_repos_metadata(
+            dnf_repos,
+            max_workers=conf.payload.repo_metadata_workers,
+            cache=self._metadata_cache,
+            proxy_url=self._get_proxy_url()
+        )
+
     def _fetch_md(self, repo_name):
         """Download repo metadata
 
@@ -861,19 +951,40 @@ class DNFPayload(Payload):
         :type repo_name: str
         :returns: None
         """
-        repo = self._base.repos[repo_name]
-        repo.enable()
-        try:
-            # Load the metadata to verify that the repo is valid
-            repo.load()
-        except dnf.exceptions.RepoError as e:
+        self._fetch_mds([repo_name])
+
+    def _fetch_mds(self, repo_names):
+        """Download metadata of repos concurrently.
+
+        All repos are loaded even if some of them fail. The failed
+        repos are disabled.
+
+        :param repo_names: names/ids of repos to fetch
+        :type repo_names: list of str
+        :raise: MetadataError for the first repo that failed to load
+        """
+        repos = [self._base.repos[repo_name] for repo_name in repo_names]
+
+        for repo in repos:
+            repo.enable()
+
+        # Load the metadata to verify that the repos are valid
+        errors = self._load_repos_metadata(repos)
+
+        for repo in repos:
+            if repo.id not in errors:
+                log.info("enabled repo: '%s' - %s and got repomd", repo.id,
+                         repo.baseurl or repo.mirrorlist or repo.metalink)
+                continue
+
             repo.disable()
             log.debug("repo: '%s' - %s failed to load repomd", repo.id,
                       repo.baseurl or repo.mirrorlist or repo.metalink)
-            raise MetadataError(e) from e
 
-        log.info("enabled repo: '%s' - %s and got repomd", repo.id,
-                 repo.baseurl or repo.mirrorlist or repo.metalink)
+        for repo in repos:
+            if repo.id in errors:
+                e = errors[repo.id]
+                raise MetadataError(e) from e
 
     def remove_repo(self, repo_id):
         repos = self.data.repo.dataList()
@@ -945,23 +1056,10 @@ class DNFPayload(Payload):
         if transaction is None:
             return Size("3000 MB")
 
-        size = 0
-        files_nm = 0
-        for tsi in transaction:
-            # space taken by all files installed by the packages
-            size += tsi.pkg.installsize
-            # number of files installed on the system
-            files_nm += len(tsi.pkg.files)
-
-        # append bonus size depending on number of files
-        bonus_size = files_nm * BONUS_SIZE_ON_FILE
-        size = Size(size)
-        # add another 10% as safeguard
-        total_space = (size + bonus_size) * 1.1
-        log.debug("Size from DNF: %s", size)
-        log.debug("Bonus size %s by number of files %s", bonus_size, files_nm)
-        log.debug("Total size required %s", total_space)
-        return total_space
+        return self._depsolve_cache.get_install_size(transaction, self._calculate_install_size)
+
+    def _calculate_install_size(self, transaction):
+        return calculate_installation_size(tsi.pkg for tsi in transaction)
 
     def _is_group_visible(self, grpid):
         grp = self._base.comps.group_by_pattern(grpid)
@@ -972,9 +1070,52 @@ class DNFPayload(Payload):
     def check_software_selection(self):
         log.info("checking software selection")
         self._bump_tx_id()
+
+        module_specs = self._get_module_specs()
+        include_list, exclude_list = self._get_selections()
+        key = self._get_software_selection_key(module_specs, include_list, exclude_list)
+        result = self._depsolve_cache.get(key)
+
+        if result and self._restore_software_selection(result):
+            log.info("checking dependencies: using the cached result")
+        else:
+            result = self._resolve_software_selection(module_specs, include_list, exclude_list)
+            self._depsolve_cache.store(key, result)
+
+        if result.error:
+            raise DependencyError(result.error)
+
+        log.info("%d packages selected totalling %s",
+                 len(self._base.transaction), self.space_required)
+
+    def _get_software_selection_key(self, module_specs, include_list, exclude_list):
+        """Get a key of the software selection for the depsolve cache."""
+        repomd_hashes = {r.id: r.repoMD_hash.hex() for r in self._repoMD_list}
+
+        with self._repos_lock:
+            repos = [(repo.id, repomd_hashes.get(repo.id, ""))
+                     for repo in self._base.repos.iter_enabled()]
+
+        return self._depsolve_cache.get_key(
+            repos=repos,
+            module_specs=module_specs,
+            include_list=include_list,
+            exclude_list=exclude_list,
+            ignore_missing=self.data.packages.handleMissing == KS_MISSING_IGNORE
+        )
+
+    def _resolve_software_selection(self, module_specs, include_list, exclude_list):
+        """Resolve dependencies of the software selection.
+
+        :return: an instance of DepsolveResult
+        """
+        # The reset rolls back the enabled and disabled modules.
         self._base.reset(goal=True)
-        self._process_module_command()
-        self._apply_selections()
+        self._module_specs = None
+
+        self._process_module_command(module_specs)
+        self._module_specs = module_specs
+        self._apply_selections(include_list, exclude_list)
 
         try:
             if self._base.resolve():
@@ -984,10 +1125,51 @@ class DNFPayload(Payload):
         except dnf.exceptions.DepsolveError as e:
             msg = str(e)
             log.warning(msg)
-            raise DependencyError(msg) from e
+            return DepsolveResult(module_specs, error=msg)
+
+        # The private attributes might not be available in other versions of DNF.
+        return DepsolveResult(
+            module_specs,
+            goal=getattr(self._base, "_goal", None),
+            transaction=self._base.transaction,
+            comps_transaction=getattr(self._base, "_comps_trans", None)
+        )
 
-        log.info("%d packages selected totalling %s",
-                 len(self._base.transaction), self.space_required)
+    def _restore_software_selection(self, result):
+        """Restore the cached result of the dependency resolution.
+
+        The modules are enabled and disabled in place, so the transaction
+        can be reused only if the same module specs are applied right now.
+
+        The transaction is restored with private attributes of the DNF
+        base. If DNF doesn't provide them, the selection has to be resolved
+        again.
+
+        :param result: an instance of DepsolveResult
+        :return: True if the result can be used, otherwise False
+        """
+        if result.error:
+            self._base.reset(goal=True)
+            self._module_specs = None
+            return True
+
+        if result.module_specs != self._module_specs:
+            return False
+
+        if result.goal is None or result.comps_transaction is None:
+            log.debug("The cached result can't be restored.")
+            return False
+
+        if not all(hasattr(self._base, name) for name in DEPSOLVE_BASE_ATTRIBUTES):
+            log.warning("The DNF base doesn't provide the expected attributes, "
+                        "the cached result can't be restored.")
+            return False
+
+        # pylint: disable=protected-access
+        self._base._goal = result.goal
+        self._base._transaction = result.transaction
+        self._base._comps_trans = result.comps_transaction
+        return True
 
     def set_updates_enabled(self, state):
         """Enable or Disable the repos used to update closest mirror.
@@ -1087,10 +1269,11 @@ class DNFPayload(Payload):
 
     def gather_repo_metadata(self):
         with self._repos_lock:
-            for repo in self._base.repos.iter_enabled():
-                self._sync_metadata(repo)
+            self._sync_metadata(list(self._base.repos.iter_enabled()))
         self._base.fill_sack(load_system_repo=False)
         self._base.read_comps(arch_filter=True)
+        self._depsolve_cache.clear()
+        self._module_specs = None
         self._refresh_environment_addons()
 
     def _refresh_environment_addons(self):
@@ -1549,9 +1732,10 @@ class DNFPayload(Payload):
 
             # fetch md for enabled repos
             enabled_repos = self.enabled_repos
-            for repo_name in self.addons:
-                if repo_name in enabled_repos:
-                    self._fetch_md(repo_name)
+            self._fetch_mds([
+                repo_name for repo_name in self.addons
+                if repo_name in enabled_repos
+            ])
 
     def _find_and_mount_iso(self, device, device_mount_dir, iso_path, iso_mount_dir):
         """Find and mount installation source from ISO on device.
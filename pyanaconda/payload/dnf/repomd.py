@@ -39,12 +39,18 @@ class RepoMDMetaHash(object):
         self._ssl_verify = repo.sslverify
         self._urls = repo.baseurl
         self._repomd_hash = ""
+        self._repomd_downloaded = False
 
     @property
     def repoMD_hash(self):
         """Return SHA256 hash of the repomd.xml file stored."""
         return self._repomd_hash
 
+    @property
+    def repoMD_downloaded(self):
+        """Was the stored repomd.xml file successfully downloaded?"""
+        return self._repomd_downloaded
+
     @property
     def id(self):
         """Name of the repository."""
@@ -53,6 +59,7 @@ class RepoMDMetaHash(object):
     def store_repoMD_hash(self):
         """Download and store hash of the repomd.xml file content."""
         repomd = self._download_repoMD()
+        self._repomd_downloaded = bool(repomd)
         self._repomd_hash = self._calculate_hash(repomd)
 
     def verify_repoMD(self):
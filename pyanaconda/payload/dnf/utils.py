@@ -18,7 +18,9 @@
 import os
 import operator
 import time
+import dnf.exceptions
 
+from concurrent.futures import ThreadPoolExecutor
 from blivet.size import Size
 
 from pyanaconda.anaconda_loggers import get_packaging_logger
@@ -32,6 +34,8 @@ log = get_packaging_logger()
 
 
 DNF_CACHE_DIR = '/tmp/dnf.cache'
+DNF_METADATA_CACHE_DIR = '/var/tmp/anaconda.dnf.metadata'
+DNF_METADATA_CACHE_SIZE = Size("1 GiB")
 DNF_PLUGINCONF_DIR = '/tmp/dnf.pluginconf'
 DNF_PACKAGE_CACHE_DIR_SUFFIX = 'dnf.package.cache'
 DNF_LIBREPO_LOG = '/tmp/dnf.librepo.log'
@@ -43,12 +47,6 @@ YUM_REPOS_DIR = "/etc/yum.repos.d/"
 
 USER_AGENT = "%s (anaconda)/%s" % (productName, productVersion)
 
-# Bonus to required free space which depends on block size and rpm database size estimation.
-# Every file could be aligned to fragment size so 4KiB * number_of_files should be a worst
-# case scenario. 2KiB for RPM DB was acquired by testing.
-# 6KiB = 4K(max default fragment size) + 2K(rpm db could be taken for a header file)
-BONUS_SIZE_ON_FILE = Size("6 KiB")
-
 
 def go_to_failure_limbo():
     progressQ.send_quit(1)
@@ -56,6 +54,77 @@ def go_to_failure_limbo():
         time.sleep(10000)
 
 
+def load_repos_metadata(repos, max_workers, cache=None, proxy_url=None):
+    """Load metadata of the given DNF repositories.
+
+    If the persistent cache is specified, the repomd.xml files of the
+    repositories are downloaded concurrently and the metadata are restored
+    from the cache if possible. Once loaded, the metadata are stored in the
+    cache. The time spent on every repository is logged.
+
+    The repositories are loaded one by one in the calling thread. They
+    share the configuration and the logging of the DNF base and libdnf
+    doesn't promise that they can be loaded from more threads at once.
+
+    :param repos: a list of DNF repositories
+    :param max_workers: the maximal number of repositories prepared at the same time
+    :param cache: an instance of RepoMetadataCache or None
+    :param proxy_url: a proxy url for the cache or None
+    :return: a dictionary of ids of failed repositories and their errors
+    """
+    def _prepare(repo):
+        start = time.monotonic()
+        repomd_hash = cache.get_repomd_hash(repo, proxy_url)
+
+        if repomd_hash:
+            cache.restore(repo, repomd_hash)
+
+        log.debug("repo %s: prepared metadata in %.2f s",
+                  repo.id, time.monotonic() - start)
+        return repomd_hash
+
+    def _load(repo, repomd_hash):
+        start = time.monotonic()
+
+        try:
+            repo.load()
+        except dnf.exceptions.RepoError as e:
+            log.debug("repo %s: failed to load metadata in %.2f s",
+                      repo.id, time.monotonic() - start)
+            return e
+
+        if repomd_hash:
+            cache.store(repo, repomd_hash)
+
+        log.debug("repo %s: loaded metadata in %.2f s",
+                  repo.id, time.monotonic() - start)
+        return None
+
+    errors = {}
+    start = time.monotonic()
+
+    if not repos:
+        return errors
+
+    repomd_hashes = [None] * len(repos)
+
+    if cache:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(repos)),
+                                thread_name_prefix="AnaRepoMetadata") as executor:
+            repomd_hashes = list(executor.map(_prepare, repos))
+
+    for repo, repomd_hash in zip(repos, repomd_hashes):
+        error = _load(repo, repomd_hash)
+
+        if error:
+            errors[repo.id] = error
+
+    log.debug("Loaded metadata of %d repositories in %.2f s.",
+              len(repos), time.monotonic() - start)
+
+    return errors
+
+
 def get_df_map():
     """Return (mountpoint -> size available) mapping."""
     output = util.execWithCapture('df', ['--output=target,avail'])
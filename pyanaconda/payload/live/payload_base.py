@@ -18,20 +18,17 @@
 import functools
 import glob
 import os
-from threading import Lock
-from time import sleep
 
 from pyanaconda.anaconda_loggers import get_packaging_logger
-from pyanaconda.core import util
 from pyanaconda.core.configuration.anaconda import conf
-from pyanaconda.core.constants import INSTALL_TREE, THREAD_LIVE_PROGRESS
+from pyanaconda.core.constants import INSTALL_TREE
 from pyanaconda.core.i18n import _
 from pyanaconda.errors import errorHandler, ERROR_RAISE
+from pyanaconda.modules.payloads.base.progress import CopyProgress, run_rsync
 from pyanaconda.payload import utils as payload_utils
 from pyanaconda.payload.base import Payload
 from pyanaconda.payload.errors import PayloadInstallError
 from pyanaconda.progress import progressQ
-from pyanaconda.threading import threadMgr, AnacondaThread
 
 log = get_packaging_logger()
 
@@ -46,50 +43,16 @@ class BaseLivePayload(Payload):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # Used to adjust size of sysroot when files are already present
-        self._adj_size = 0
-        self.pct = 0
-        self.pct_lock = None
         self.source_size = 1
 
         self._kernel_version_list = []
 
-    def progress(self):
-        """Monitor the amount of disk space used on the target and source and
-           update the hub's progress bar.
-        """
-        mountpoints = payload_utils.get_mount_points()
-        last_pct = -1
-
-        while self.pct < 100:
-            dest_size = 0
-            for mnt in mountpoints:
-                mnt_stat = os.statvfs(conf.target.system_root + mnt)
-                dest_size += mnt_stat.f_frsize * (mnt_stat.f_blocks - mnt_stat.f_bfree)
-            if dest_size >= self._adj_size:
-                dest_size -= self._adj_size
-
-            pct = int(100 * dest_size / self.source_size)
-            if pct != last_pct:
-                with self.pct_lock:
-                    self.pct = pct
-                last_pct = pct
-                progressQ.send_message(_("Installing software") + (" %d%%") %
-                                       (min(100, self.pct),))
-            sleep(0.777)
-
     def install(self):
         """ Install the payload. """
 
         if self.source_size <= 0:
             raise PayloadInstallError("Nothing to install")
 
-        self.pct_lock = Lock()
-        self.pct = 0
-        threadMgr.add(AnacondaThread(name=THREAD_LIVE_PROGRESS,
-                                     target=self.progress))
-
-        cmd = "rsync"
         # preserve: permissions, owners, groups, ACL's, xattrs, times,
         #           symlinks, hardlinks
         # go recursively, include devices and special files, don't cross
@@ -99,14 +62,14 @@ class BaseLivePayload(Payload):
                 "--exclude", "/boot/loader/", "--exclude", "/boot/efi/loader/",
                 "--exclude", "/etc/machine-id", INSTALL_TREE + "/", conf.target.system_root]
         try:
-            rc = util.execWithRedirect(cmd, args)
+            rc = run_rsync(args, CopyProgress(progressQ.send_message))
         except (OSError, RuntimeError) as e:
             msg = None
             err = str(e)
             log.error(err)
         else:
             err = None
-            msg = "%s exited with code %d" % (cmd, rc)
+            msg = "rsync exited with code %d" % rc
             log.info(msg)
 
         if err or rc == 11:
@@ -114,11 +77,6 @@ class BaseLivePayload(Payload):
             if errorHandler.cb(exn) == ERROR_RAISE:
                 raise exn
 
-        # Wait for progress thread to finish
-        with self.pct_lock:
-            self.pct = 100
-        threadMgr.wait(THREAD_LIVE_PROGRESS)
-
     def post_install(self):
         """ Perform post-installation tasks. """
         progressQ.send_message(_("Performing post-installation setup tasks"))
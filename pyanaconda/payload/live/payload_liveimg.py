@@ -15,12 +15,8 @@
 # License and may only be used or replicated with the express permission of
 # Red Hat, Inc.
 #
-import functools
 import glob
-import hashlib
 import os
-import stat
-from threading import Lock
 
 import requests
 from blivet.size import Size
@@ -28,16 +24,19 @@ from pyanaconda.anaconda_loggers import get_packaging_logger
 from pyanaconda.core import util
 from pyanaconda.core.configuration.anaconda import conf
 from pyanaconda.core.constants import PAYLOAD_TYPE_LIVE_IMAGE, TAR_SUFFIX, \
-    NETWORK_CONNECTION_TIMEOUT, INSTALL_TREE, IMAGE_DIR, THREAD_LIVE_PROGRESS
+    NETWORK_CONNECTION_TIMEOUT, INSTALL_TREE, IMAGE_DIR
 from pyanaconda.core.i18n import _
 from pyanaconda.core.payload import ProxyString, ProxyStringError
 from pyanaconda.errors import errorHandler, ERROR_RAISE
+from pyanaconda.modules.payloads.base.progress import CopyProgress
+from pyanaconda.modules.payloads.payload.live_image.download import ImageDownloader, \
+    ImageExtractionError, calculate_image_checksum, extract_tar_image
+from pyanaconda.modules.payloads.payload.live_image.utils import get_kernel_version_list_from_tar
 from pyanaconda.payload import utils as payload_utils
 from pyanaconda.payload.errors import PayloadInstallError
 from pyanaconda.payload.live.download_progress import DownloadProgress
 from pyanaconda.payload.live.payload_base import BaseLivePayload
 from pyanaconda.progress import progressQ
-from pyanaconda.threading import threadMgr, AnacondaThread
 
 log = get_packaging_logger()
 
@@ -51,6 +50,7 @@ class LiveImagePayload(BaseLivePayload):
         self._min_size = 0
         self._proxies = {}
         self._session = util.requests_session()
+        self._image_checksum = None
         self.image_path = conf.target.system_root + "/disk.img"
 
     def set_from_opts(self, opts):
@@ -74,6 +74,19 @@ class LiveImagePayload(BaseLivePayload):
         """ Return True if the url ends with a tar suffix """
         return any(self.data.liveimg.url.endswith(suffix) for suffix in TAR_SUFFIX)
 
+    @property
+    def is_tar_stream(self):
+        """ Return True if the tar image should be extracted while downloading
+
+            The checksum can be verified only after the extraction of
+            the streamed image, so the images with a checksum are always
+            downloaded first.
+        """
+        return conf.payload.liveimg_stream_tar \
+            and self.is_tarfile \
+            and not self.data.liveimg.url.startswith("file://") \
+            and not self.data.liveimg.checksum
+
     def _setup_url_image(self):
         """ Check to make sure the url is available and estimate the space
             needed to download and install it.
@@ -100,8 +113,10 @@ class LiveImagePayload(BaseLivePayload):
             # At this point we know we can get the image and what its size is
             # Make a guess as to minimum size needed:
             # Enough space for image and image * 3
+            # The streamed tar image is not stored, so only image * 3
             if response.headers.get('content-length'):
-                self._min_size = int(response.headers.get('content-length')) * 4
+                factor = 3 if self.is_tar_stream else 4
+                self._min_size = int(response.headers.get('content-length')) * factor
         except IOError as e:
             log.error("Error opening liveimg: %s", e)
             error = e
@@ -143,38 +158,26 @@ class LiveImagePayload(BaseLivePayload):
 
         error = None
         progress = DownloadProgress()
+
+        def _report_progress(bytes_read, total_size):
+            if total_size is None:
+                return
+
+            if not progress.size:
+                progress.start(self.data.liveimg.url, total_size)
+
+            progress.update(bytes_read)
+
+        downloader = ImageDownloader(
+            session=self._session,
+            url=self.data.liveimg.url,
+            proxies=self._proxies,
+            verify=not self.data.liveimg.noverifyssl,
+            progress_callback=_report_progress
+        )
+
         try:
-            log.info("Starting image download")
-            with open(self.image_path, "wb") as f:
-                ssl_verify = not self.data.liveimg.noverifyssl
-                response = self._session.get(
-                    self.data.liveimg.url,
-                    proxies=self._proxies,
-                    verify=ssl_verify,
-                    stream=True,
-                    timeout=NETWORK_CONNECTION_TIMEOUT
-                )
-                total_length = response.headers.get('content-length')
-                if total_length is None:  # no content length header
-                    # just download the file in one go and fake the progress reporting once done
-                    log.warning("content-length header is missing for the installation image, "
-                                "download progress reporting will not be available")
-                    f.write(response.content)
-                    size = f.tell()
-                    progress.start(self.data.liveimg.url, size)
-                    progress.end(size)
-                else:
-                    # requests return headers as strings, so convert total_length to int
-                    progress.start(self.data.liveimg.url, int(total_length))
-                    bytes_read = 0
-                    for buf in response.iter_content(1024 * 1024):  # 1 MB chunks
-                        if buf:
-                            f.write(buf)
-                            f.flush()
-                            bytes_read += len(buf)
-                            progress.update(bytes_read)
-                    progress.end(bytes_read)
-                log.info("Image download finished")
+            self._image_checksum = downloader.download(self.image_path)
         except requests.exceptions.RequestException as e:
             log.error("Error downloading liveimg: %s", e)
             error = e
@@ -182,6 +185,13 @@ class LiveImagePayload(BaseLivePayload):
             if not os.path.exists(self.image_path):
                 error = "Failed to download %s, file doesn't exist" % self.data.liveimg.url
                 log.error(error)
+            elif not progress.size:
+                # fake the progress reporting once done
+                size = os.path.getsize(self.image_path)
+                progress.start(self.data.liveimg.url, size)
+                progress.end(size)
+            else:
+                progress.end(progress.size)
 
         return error
 
@@ -196,6 +206,12 @@ class LiveImagePayload(BaseLivePayload):
             If it is a file:// source then use the file directly.
         """
         error = None
+        self._image_checksum = None
+
+        # The remote tar image is downloaded during the installation.
+        if self.is_tar_stream:
+            return
+
         if self.data.liveimg.url.startswith("file://"):
             self.image_path = self.data.liveimg.url[7:]
         else:
@@ -206,19 +222,14 @@ class LiveImagePayload(BaseLivePayload):
             if errorHandler.cb(exn) == ERROR_RAISE:
                 raise exn
 
-        # Used to make install progress % look correct
-        self._adj_size = os.stat(self.image_path)[stat.ST_SIZE]
-
         if self.data.liveimg.checksum:
-            progressQ.send_message(_("Checking image checksum"))
-            sha256 = hashlib.sha256()
-            with open(self.image_path, "rb") as f:
-                while True:
-                    data = f.read(1024 * 1024)
-                    if not data:
-                        break
-                    sha256.update(data)
-            filesum = sha256.hexdigest()
+            # The checksum of a downloaded image is calculated during the download.
+            filesum = self._image_checksum
+
+            if filesum is None:
+                progressQ.send_message(_("Checking image checksum"))
+                filesum = calculate_image_checksum(self.image_path)
+
             log.debug("sha256 of %s is %s", self.data.liveimg.url, filesum)
 
             if util.lowerASCII(self.data.liveimg.checksum) != filesum:
@@ -292,42 +303,59 @@ class LiveImagePayload(BaseLivePayload):
             super().install()
             return
 
-        # Use 2x the archive's size to estimate the size of the install
-        # This is used to drive the progress display
-        self.source_size = os.stat(self.image_path)[stat.ST_SIZE] * 2
-
-        self.pct_lock = Lock()
-        self.pct = 0
-        threadMgr.add(AnacondaThread(name=THREAD_LIVE_PROGRESS,
-                                     target=self.progress))
-
-        cmd = "tar"
-        # preserve: ACL's, xattrs, and SELinux context
-        args = ["--numeric-owner", "--selinux", "--acls", "--xattrs", "--xattrs-include", "*",
-                "--exclude", "dev/*", "--exclude", "proc/*", "--exclude", "tmp/*",
-                "--exclude", "sys/*", "--exclude", "run/*", "--exclude", "boot/*rescue*",
-                "--exclude", "boot/loader", "--exclude", "boot/efi/loader",
-                "--exclude", "etc/machine-id", "-xaf", self.image_path, "-C", conf.target.system_root]
+        if self.is_tar_stream:
+            self._install_tar_stream()
+            return
+
+        progress = CopyProgress(progressQ.send_message)
+
         try:
-            rc = util.execWithRedirect(cmd, args)
-        except (OSError, RuntimeError) as e:
-            msg = None
-            err = str(e)
-            log.error(err)
-        else:
-            err = None
-            msg = "%s exited with code %d" % (cmd, rc)
-            log.info(msg)
+            extract_tar_image(
+                self.image_path,
+                conf.target.system_root,
+                progress_callback=progress.update_with_total
+            )
+        except (OSError, ImageExtractionError) as e:
+            log.error("Error installing liveimg: %s", e)
+            exn = PayloadInstallError(str(e))
+            if errorHandler.cb(exn) == ERROR_RAISE:
+                raise exn
+            return
+
+        progress.end()
 
-        if err:
-            exn = PayloadInstallError(err or msg)
+    def _install_tar_stream(self):
+        """ Extract the tar image while it is downloaded.
+
+            The image is not stored on the target system unless the
+            download can't be resumed. The progress is based on the
+            amount of the downloaded data.
+        """
+        progress = CopyProgress(progressQ.send_message)
+        downloader = ImageDownloader(
+            session=self._session,
+            url=self.data.liveimg.url,
+            proxies=self._proxies,
+            verify=not self.data.liveimg.noverifyssl,
+            progress_callback=progress.update_with_total
+        )
+
+        progressQ.send_message(_("Installing software"))
+
+        try:
+            filesum, self._kernel_version_list = downloader.extract(
+                conf.target.system_root,
+                self.image_path
+            )
+        except (OSError, requests.exceptions.RequestException, ImageExtractionError) as e:
+            log.error("Error installing liveimg: %s", e)
+            exn = PayloadInstallError(str(e))
             if errorHandler.cb(exn) == ERROR_RAISE:
                 raise exn
+            return
 
-        # Wait for progress thread to finish
-        with self.pct_lock:
-            self.pct = 100
-        threadMgr.wait(THREAD_LIVE_PROGRESS)
+        progress.end()
+        log.debug("sha256 of %s is %s", self.data.liveimg.url, filesum)
 
     def post_install(self):
         """ Unmount and remove image
@@ -361,19 +389,13 @@ class LiveImagePayload(BaseLivePayload):
         if not self.is_tarfile:
             return super().kernel_version_list
 
-        if self._kernel_version_list:
+        # The kernels of the streamed tar image are collected during the extraction.
+        if self._kernel_version_list or self.is_tar_stream:
             return self._kernel_version_list
 
         # Cache a list of the kernels (the tar payload may be cleaned up on subsequent calls)
         if not os.path.exists(self.image_path):
             raise PayloadInstallError("kernel_version_list: missing tar payload")
 
-        import tarfile
-        with tarfile.open(self.image_path) as archive:
-            names = archive.getnames()
-
-            # Strip out vmlinuz- from the names
-            self._kernel_version_list = sorted((n.split("/")[-1][8:] for n in names
-                                               if "boot/vmlinuz-" in n),
-                                               key=functools.cmp_to_key(payload_utils.version_cmp))
+        self._kernel_version_list = get_kernel_version_list_from_tar(self.image_path)
         return self._kernel_version_list
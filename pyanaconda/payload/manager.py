@@ -59,6 +59,12 @@ class PayloadManager(object):
     will block the payload thread regardless, so try not to run anything
     that takes a long time.
 
+    The payload thread waits for the storage scan only if the installation
+    source requires it, so the metadata of network sources can be downloaded
+    while the storage is scanned. The storage is always scanned before the
+    FINISHED or ERROR state is reached, because the listeners of these states
+    can check the available space.
+
     All states except ERROR are expected to happen linearly, and adding
     a listener for a state that has already been reached or passed will
     immediately trigger that listener. For example, if the payload thread is
@@ -167,15 +173,24 @@ class PayloadManager(object):
             for func in self._event_listeners[event_id]:
                 func()
 
+    def _set_final_state(self, event_id):
+        # The listeners can check the space, so wait for storage
+        threadMgr.wait(THREAD_STORAGE)
+        self._set_state(event_id)
+
     def _run_thread(self, payload, fallback, checkmount, onlyOnChange):
         # This is the thread entry
         # Set the initial state
         self._error = None
         self._set_state(PayloadState.STARTED)
 
-        # Wait for storage
+        # Wait for storage if the source requires it
         self._set_state(PayloadState.WAITING_STORAGE)
-        threadMgr.wait(THREAD_STORAGE)
+
+        if payload.needs_storage(checkmount=checkmount):
+            threadMgr.wait(THREAD_STORAGE)
+        else:
+            log.debug("The payload source doesn't require the storage, not waiting for it.")
 
         # Wait for network
         self._set_state(PayloadState.WAITING_NETWORK)
@@ -190,7 +205,7 @@ class PayloadManager(object):
 
         # If this is a non-package Payload, we're done
         if payload.type != PAYLOAD_TYPE_DNF:
-            self._set_state(PayloadState.FINISHED)
+            self._set_final_state(PayloadState.FINISHED)
             return
 
         # Test if any repository changed from the last update
@@ -199,7 +214,7 @@ class PayloadManager(object):
             self._set_state(PayloadState.VERIFYING_AVAILABILITY)
             if payload.verify_available_repositories():
                 log.debug("Payload isn't restarted, repositories are still available.")
-                self._set_state(PayloadState.FINISHED)
+                self._set_final_state(PayloadState.FINISHED)
                 return
 
         # Keep setting up package-based repositories
@@ -211,7 +226,7 @@ class PayloadManager(object):
         except (OSError, DBusError, PayloadError) as e:
             log.error("PayloadError: %s", e)
             self._error = self.ERROR_SETUP
-            self._set_state(PayloadState.ERROR)
+            self._set_final_state(PayloadState.ERROR)
             payload.unsetup()
             return
 
@@ -223,14 +238,14 @@ class PayloadManager(object):
         if not payload.base_repo:
             log.error("No base repo configured")
             self._error = self.ERROR_MD
-            self._set_state(PayloadState.ERROR)
+            self._set_final_state(PayloadState.ERROR)
             payload.unsetup()
             return
 
         # run payload specific post configuration tasks
         payload.post_setup()
 
-        self._set_state(PayloadState.FINISHED)
+        self._set_final_state(PayloadState.FINISHED)
 
 
 # Initialize the PayloadManager instance
@@ -245,19 +245,15 @@ class Rescue(object):
 
         All LUKS devices are considered locked.
         """
-        device_names = []
-
-        for device_name in self._device_tree_proxy.GetDevices():
-            format_data = DeviceFormatData.from_structure(
-                self._device_tree_proxy.GetFormatData(device_name)
-            )
-
-            if not format_data.type == "luks":
-                continue
-
-            device_names.append(device_name)
+        device_names = self._device_tree_proxy.GetDevices()
+        formats_data = DeviceFormatData.from_structure_list(
+            self._device_tree_proxy.GetFormatsData(device_names)
+        )
 
-        return device_names
+        return [
+            device_name for device_name, format_data in zip(device_names, formats_data)
+            if format_data.type == "luks"
+        ]
 
     def unlock_device(self, device_name, passphrase):
         """Unlocks LUKS device."""
@@ -418,12 +418,58 @@ class NormalSpoke(Spoke):
        therefore hiding the Hub and its action area.  The NormalSpoke also
        provides some basic navigation information (where you are, what you're
        installing, how to get back to the Hub) at the top of the screen.
+
+       Class attributes:
+
+       lazy       -- Can the Hub postpone the creation of this Spoke until
+                     the user enters it?  The selector of a lazy Spoke is
+                     created from the class attributes and the lazy_showable
+                     and lazy_status class methods.  A lazy Spoke has to be
+                     direct, ready right after its initialization and not
+                     mandatory, because the Hub doesn't wait for it.
+
+       Instance attributes:
+
+       postponed  -- Has the Hub postponed the creation of this lazy Spoke?
+                     The Hub sets it before the Spoke is initialized.  Lazy
+                     Spokes created together with the Hub, for example in
+                     kickstart installations, are not postponed.
     """
 
+    lazy = False
+
     def __init__(self, storage, payload):
         """Create a NormalSpoke instance."""
         super().__init__(storage, payload)
         self.selector = None
+        self.postponed = False
+
+    @classmethod
+    def lazy_showable(cls, data, storage, payload):
+        """Should the selector of this lazy spoke be shown on the hub?
+
+           This is the showable property of a spoke that doesn't exist yet.
+           It should be cheap, because it is called before the hub is shown.
+        """
+        return True
+
+    @classmethod
+    def lazy_status(cls, data, storage, payload):
+        """Return the status of this lazy spoke.
+
+           This is the status property of a spoke that doesn't exist yet.
+           It should be cheap, because it is called before the hub is shown
+           and every time the user leaves a spoke.
+        """
+        return ""
+
+    @property
+    def initialization_controller(self):
+        # the hub doesn't wait for the initialization of postponed spokes
+        if self.postponed:
+            return None
+
+        return super().initialization_controller
 
     @property
     def indirect(self):
@@ -22,6 +22,7 @@ from pyanaconda.core.i18n import _, C_
 from pyanaconda.product import distributionText
 from pyanaconda import lifecycle
 from pyanaconda.core.timer import Timer
+from pyanaconda.core.glib import idle_add, PRIORITY_LOW
 
 from pyanaconda.ui import common
 from pyanaconda.ui.gui import GUIObject
@@ -99,6 +100,11 @@ class Hub(GUIObject, common.Hub):
         self._notReadySpokes = []
         self._spokes = {}
 
+        # Lazy spokes that haven't been created yet.  They are stored
+        # as tuples of spoke classes and selectors under class names.
+        self._lazySpokes = {}
+        self._prefetchId = None
+
         # Used to store the last result of _updateContinue
         self._warningMsg = None
 
@@ -143,6 +149,14 @@ class Hub(GUIObject, common.Hub):
                 if not any(spokeClass.should_run(environ, self.data) for environ in flags.environs):
                     continue
 
+                # Don't create a lazy spoke until the user enters it.  Kickstart
+                # installations need all spokes to execute and autostep them.
+                if spokeClass.lazy and self._lazyCreationAllowed:
+                    if spokeClass.lazy_showable(self.data, self.storage, self.payload):
+                        selectors.append(self._createLazySelector(spokeClass))
+
+                    continue
+
                 # Create the new spoke and populate its UI with whatever data.
                 # From here on, this Spoke will always exist.
                 spoke = spokeClass(self.data, self.storage, self.payload)
@@ -226,6 +240,83 @@ class Hub(GUIObject, common.Hub):
         spokeArea.add(viewport)
 
         self._updateContinue()
+        self._startPrefetch()
+
+    @property
+    def _lazyCreationAllowed(self):
+        """Can the creation of lazy spokes be postponed?"""
+        return not flags.automatedInstall and not self.data.autostep.seen
+
+    def _createLazySelector(self, spokeClass):
+        """Create a selector of a lazy spoke from its class."""
+        from gi.repository import AnacondaWidgets
+
+        selector = AnacondaWidgets.SpokeSelector(C_("GUI|Spoke", spokeClass.title),
+                                                 spokeClass.icon)
+
+        self._lazySpokes[spokeClass.__name__] = (spokeClass, selector)
+        self._updateLazyStatus(spokeClass, selector)
+
+        selector.connect("button-press-event", self._on_lazy_spoke_clicked, spokeClass.__name__)
+        selector.connect("key-release-event", self._on_lazy_spoke_clicked, spokeClass.__name__)
+        return selector
+
+    def _updateLazyStatus(self, spokeClass, selector):
+        status = spokeClass.lazy_status(self.data, self.storage, self.payload)
+        selector.set_property("status", status)
+        selector.set_tooltip_markup(escape_markup(status))
+
+    def _createLazySpoke(self, name):
+        """Create and initialize a lazy spoke.
+
+        :param name: a class name of the spoke
+        :return: an instance of the spoke
+        """
+        spokeClass, selector = self._lazySpokes.pop(name)
+        log.debug("Creating lazy spoke %s.", name)
+
+        spoke = spokeClass(self.data, self.storage, self.payload)
+        spoke.window.set_beta(self.window.get_beta())
+        spoke.window.set_property("distribution", distributionText())
+
+        self._spokes[name] = spoke
+        spoke.selector = selector
+        spoke.postponed = True
+        spoke.initialize()
+
+        if not spoke.ready:
+            self._notReadySpokes.append(spoke)
+
+        self._updateCompleteness(spoke)
+        return spoke
+
+    def _getSpoke(self, name):
+        """Get a spoke of this hub and create it if it is lazy.
+
+        :param name: a class name of the spoke
+        :return: an instance of the spoke or None
+        """
+        if name in self._lazySpokes:
+            return self._createLazySpoke(name)
+
+        return self._spokes.get(name, None)
+
+    def _startPrefetch(self):
+        """Create the lazy spokes one by one when nothing else is going on."""
+        if self._lazySpokes and self._prefetchId is None:
+            self._prefetchId = idle_add(self._prefetchSpoke, priority=PRIORITY_LOW)
+
+    def _prefetchSpoke(self):
+        # Don't slow down a spoke the user is working with.  The
+        # prefetching will continue when the user leaves the spoke.
+        # Stop if the event loop of the hub is disabled, because
+        # another hub is shown.
+        if not self._lazySpokes or self._inSpoke or self.timeout is None:
+            self._prefetchId = None
+            return False
+
+        self._createLazySpoke(sorted(self._lazySpokes)[0])
+        return True
 
     def _updateCompleteness(self, spoke, update_continue=True):
         spoke.selector.set_sensitive(spoke.sensitive and spoke.ready)
@@ -295,7 +386,8 @@ class Hub(GUIObject, common.Hub):
 
         q = hubQ.q
 
-        if not self._spokes and self.window.get_may_continue() and self.continue_if_empty:
+        if not self._spokes and not self._lazySpokes and self.window.get_may_continue() \
+                and self.continue_if_empty:
             # no spokes, move on
             log.debug("no spokes available on %s, continuing automatically", self)
             gtk_call_once(self.window.emit, "continue-clicked")
@@ -390,7 +482,7 @@ class Hub(GUIObject, common.Hub):
 
     ### SIGNAL HANDLERS
 
-    def _on_spoke_clicked(self, selector, event, spoke):
+    def _is_activation_event(self, event):
         import gi
 
         gi.require_version("Gdk", "3.0")
@@ -400,10 +492,29 @@ class Hub(GUIObject, common.Hub):
         # This handler only runs for these two kinds of events, and only for
         # activate-type keys (space, enter) in the latter event's case.
         if event and event.type not in [Gdk.EventType.BUTTON_PRESS, Gdk.EventType.KEY_RELEASE]:
-            return
+            return False
 
         if event and event.type == Gdk.EventType.KEY_RELEASE and \
            event.keyval not in [Gdk.KEY_space, Gdk.KEY_Return, Gdk.KEY_ISO_Enter, Gdk.KEY_KP_Enter, Gdk.KEY_KP_Space]:
+            return False
+
+        return True
+
+    def _on_lazy_spoke_clicked(self, selector, event, name):
+        if not self._is_activation_event(event):
+            return
+
+        # The spoke might be already created by the prefetching.
+        spoke = self._getSpoke(name)
+
+        # The selector is insensitive until the spoke is ready.
+        if not spoke.ready or not spoke.sensitive:
+            return
+
+        self._on_spoke_clicked(selector, event, spoke)
+
+    def _on_spoke_clicked(self, selector, event, spoke):
+        if not self._is_activation_event(event):
             return
 
         if selector:
@@ -453,20 +564,24 @@ class Hub(GUIObject, common.Hub):
             if not sp.indirect:
                 self._updateCompleteness(sp, update_continue=False)
 
+        for spokeClass, selector in self._lazySpokes.values():
+            self._updateLazyStatus(spokeClass, selector)
+
         self._updateContinue()
 
         # And then if that spoke wants us to jump straight to another one,
         # handle that now.
-        if spoke.skipTo and spoke.skipTo in self._spokes:
-            dest = spoke.skipTo
+        dest = self._getSpoke(spoke.skipTo) if spoke.skipTo else None
 
+        if dest:
             # Clear out the skipTo setting so we don't cycle endlessly.
             spoke.skipTo = None
 
-            self._on_spoke_clicked(self._spokes[dest].selector, None, self._spokes[dest])
+            self._on_spoke_clicked(dest.selector, None, dest)
         # Otherwise, switch back to the hub (that's us!)
         else:
             self.main_window.returnToHub()
+            self._startPrefetch()
 
     def _doAutostep(self):
         """Autostep through all spokes managed by this hub"""
@@ -590,10 +590,9 @@ class FilterSpoke(NormalSpoke):
         # view of all the disks on that page.
         self._store.clear()
 
-        disks_data = DeviceData.from_structure_list([
-            self._device_tree.GetDeviceData(device_name)
-            for device_name in self._disks
-        ])
+        disks_data = DeviceData.from_structure_list(
+            self._device_tree.GetDevicesData(self._disks)
+        )
 
         for page in self._pages.values():
             disks = [
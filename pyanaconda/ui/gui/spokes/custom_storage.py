@@ -47,7 +47,8 @@ from pyanaconda.modules.common.structures.partitioning import PartitioningReques
 from pyanaconda.modules.common.structures.device_factory import DeviceFactoryRequest, \
     DeviceFactoryPermissions
 from pyanaconda.product import productName, productVersion
-from pyanaconda.ui.lib.storage import reset_bootloader, create_partitioning
+from pyanaconda.ui.lib.storage import reset_bootloader, create_partitioning, \
+    DevicesDataCache
 from pyanaconda.core.storage import DEVICE_TYPE_UNSUPPORTED, DEVICE_TEXT_MAP, \
     MOUNTPOINT_DESCRIPTIONS, NAMED_DEVICE_TYPES, CONTAINER_DEVICE_TYPES, device_type_from_autopart, \
     PROTECTED_FORMAT_TYPES, DEVICE_TYPE_BTRFS, DEVICE_TYPE_MD, Size
@@ -122,6 +123,7 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
 
         self._partitioning = None
         self._device_tree = None
+        self._devices_cache = None
         self._request = DeviceFactoryRequest()
         self._original_request = DeviceFactoryRequest()
         self._permissions = DeviceFactoryPermissions()
@@ -294,6 +296,7 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
             # the storage spoke would use it as a default partitioning.
             self._partitioning = create_partitioning(PARTITIONING_METHOD_INTERACTIVE)
             self._device_tree = STORAGE.get_proxy(self._partitioning.GetDeviceTree())
+            self._devices_cache = DevicesDataCache(self._device_tree)
 
         # Get the name of the new installation.
         self._os_name = self._device_tree.GenerateSystemName()
@@ -396,13 +399,24 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
             )
             ui_roots.insert(0, new_root)
 
+        # Get data of all devices of the pages at once.
+        device_names = set(unused_devices)
+
+        for root in ui_roots:
+            device_names.update(root.mount_points.values())
+            device_names.update(root.swap_devices)
+
+        self._devices_cache.update()
+        devices_data = self._devices_cache.get_devices_data(device_names)
+        formats_data = self._devices_cache.get_formats_data(device_names)
+
         # Add root pages.
         for root in ui_roots:
-            self._add_root_page(root)
+            self._add_root_page(root, devices_data, formats_data)
 
         # Add the unknown page.
         if unused_devices:
-            self._add_unknown_page(unused_devices)
+            self._add_unknown_page(unused_devices, devices_data, formats_data)
 
     def _add_initial_page(self, reuse_existing=False):
         page = CreateNewPage(
@@ -417,7 +431,7 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
         self._partitionsNotebook.set_current_page(NOTEBOOK_LABEL_PAGE)
         self._set_page_label_text()
 
-    def _add_root_page(self, root: OSData):
+    def _add_root_page(self, root: OSData, devices_data, formats_data):
         page = Page(root.os_name)
         self._accordion.add_page(page, cb=self.on_page_clicked)
 
@@ -427,7 +441,9 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
                 selector,
                 device_name=device_name,
                 root_name=root.os_name,
-                mount_point=mount_point
+                mount_point=mount_point,
+                device_data=devices_data[device_name],
+                format_data=formats_data[device_name]
             )
             page.add_selector(selector, self.on_selector_clicked)
 
@@ -436,24 +452,32 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
             self._update_selector(
                 selector,
                 device_name=device_name,
-                root_name=root.os_name
+                root_name=root.os_name,
+                device_data=devices_data[device_name],
+                format_data=formats_data[device_name]
             )
             page.add_selector(selector, self.on_selector_clicked)
 
         page.show_all()
 
-    def _add_unknown_page(self, devices):
+    def _add_unknown_page(self, devices, devices_data, formats_data):
         page = UnknownPage(_("Unknown"))
         self._accordion.add_page(page, cb=self.on_page_clicked)
 
         for device_name in sorted(devices):
             selector = MountPointSelector()
-            self._update_selector(selector, device_name)
+            self._update_selector(
+                selector,
+                device_name=device_name,
+                device_data=devices_data[device_name],
+                format_data=formats_data[device_name]
+            )
             page.add_selector(selector, self.on_selector_clicked)
 
         page.show_all()
 
-    def _update_selector(self, selector, device_name="", root_name="", mount_point=""):
+    def _update_selector(self, selector, device_name="", root_name="", mount_point="",
+                         device_data=None, format_data=None):
         if not selector:
             return
 
@@ -463,13 +487,15 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
         if not root_name:
             root_name = selector.root_name
 
-        device_data = DeviceData.from_structure(
-            self._device_tree.GetDeviceData(device_name)
-        )
+        if not device_data:
+            device_data = DeviceData.from_structure(
+                self._device_tree.GetDeviceData(device_name)
+            )
 
-        format_data = DeviceFormatData.from_structure(
-            self._device_tree.GetFormatData(device_name)
-        )
+        if not format_data:
+            format_data = DeviceFormatData.from_structure(
+                self._device_tree.GetFormatData(device_name)
+            )
 
         mount_point = self._get_mount_point_description(
             mount_point, format_data
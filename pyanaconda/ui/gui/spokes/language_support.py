@@ -45,6 +45,17 @@ __all__ = ["LangsupportSpoke"]
 _HIGHLIGHT_COLOR = Gdk.RGBA(red=0.992157, green=0.984314, blue=0.752941, alpha=1.0)
 
 
+def _get_installed_langsupports(l12_module):
+    """Get the language and the additional language support locales."""
+    return [l12_module.Language] + sorted(l12_module.LanguageSupport)
+
+
+def _get_status(l12_module):
+    """Get the status of the language support."""
+    return ", ".join(localization.get_native_name(locale)
+                     for locale in _get_installed_langsupports(l12_module))
+
+
 class LangsupportSpoke(NormalSpoke, LangLocaleHandler):
     """
        .. inheritance-diagram:: LangsupportSpoke
@@ -61,6 +72,9 @@ class LangsupportSpoke(NormalSpoke, LangLocaleHandler):
     icon = "accessories-character-map-symbolic"
     title = CN_("GUI|Spoke", "_Language Support")
 
+    # the lists of languages and locales are built only if needed
+    lazy = True
+
     def __init__(self, *args, **kwargs):
         NormalSpoke.__init__(self, *args, **kwargs)
         LangLocaleHandler.__init__(self)
@@ -124,17 +138,24 @@ class LangsupportSpoke(NormalSpoke, LangLocaleHandler):
 
     @property
     def _installed_langsupports(self):
-        return [self._l12_module.Language] + sorted(self._l12_module.LanguageSupport)
+        return _get_installed_langsupports(self._l12_module)
+
+    @classmethod
+    def lazy_showable(cls, data, storage, payload):
+        # don't show the language support spoke on live media
+        return payload.type not in PAYLOAD_LIVE_TYPES
+
+    @classmethod
+    def lazy_status(cls, data, storage, payload):
+        return _get_status(LOCALIZATION.get_proxy())
 
     @property
     def showable(self):
-        # don't show the language support spoke on live media
-        return self.payload.type not in PAYLOAD_LIVE_TYPES
+        return self.lazy_showable(self.data, self.storage, self.payload)
 
     @property
     def status(self):
-        return ", ".join(localization.get_native_name(locale)
-                         for locale in self._installed_langsupports)
+        return _get_status(self._l12_module)
 
     @property
     def mandatory(self):
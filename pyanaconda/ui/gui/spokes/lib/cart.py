@@ -18,14 +18,13 @@
 #
 from blivet import arch
 
-from pyanaconda.modules.common.structures.storage import DeviceData
 from pyanaconda.core.constants import BOOTLOADER_ENABLED, BOOTLOADER_LOCATION_MBR, \
     BOOTLOADER_DRIVE_UNSET, BOOTLOADER_SKIPPED
 from pyanaconda.core.i18n import C_
 from pyanaconda.modules.common.constants.objects import BOOTLOADER, DEVICE_TREE
 from pyanaconda.modules.common.constants.services import STORAGE
 from pyanaconda.ui.gui import GUIObject
-from pyanaconda.ui.lib.storage import get_disks_summary
+from pyanaconda.ui.lib.storage import get_disks_summary, get_devices_data
 from blivet.size import Size
 
 __all__ = ["SelectedDisksDialog"]
@@ -89,10 +88,10 @@ class SelectedDisksDialog(GUIObject):
         return rc
 
     def _update_disks(self):
+        devices_data = get_devices_data(self._device_tree, self._disks)
+
         for device_name in self._disks:
-            device_data = DeviceData.from_structure(
-                self._device_tree.GetDeviceData(device_name)
-            )
+            device_data = devices_data[device_name]
 
             device_free_space = self._device_tree.GetDiskFreeSpace(
                 [device_name]
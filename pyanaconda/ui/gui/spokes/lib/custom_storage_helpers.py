@@ -30,7 +30,7 @@ from pyanaconda.modules.common.structures.device_factory import DeviceFactoryReq
     DeviceFactoryPermissions
 from pyanaconda.modules.common.structures.storage import DeviceFormatData, DeviceData
 from pyanaconda.modules.common.structures.validation import ValidationReport
-from pyanaconda.ui.lib.storage import size_from_input
+from pyanaconda.ui.lib.storage import size_from_input, get_devices_data
 from pyanaconda.ui.helpers import InputCheck
 from pyanaconda.ui.gui import GUIObject
 from pyanaconda.ui.gui.helpers import GUIDialogInputCheckHandler
@@ -408,10 +408,10 @@ class DisksDialog(GUIObject):
         return self._selected_disks
 
     def _populate_disks(self):
+        devices_data = get_devices_data(self._device_tree, self._disks)
+
         for device_name in self._disks:
-            device_data = DeviceData.from_structure(
-                self._device_tree.GetDeviceData(device_name)
-            )
+            device_data = devices_data[device_name]
             device_free_space = self._device_tree.GetDiskFreeSpace(
                 [device_name]
             )
@@ -526,10 +526,10 @@ class ContainerDialog(GUIObject, GUIDialogInputCheckHandler):
         self._dialog_label.set_text(dialog_text)
 
     def _populate_disks(self):
+        devices_data = get_devices_data(self._device_tree, self._disks)
+
         for device_name in self._disks:
-            device_data = DeviceData.from_structure(
-                self._device_tree.GetDeviceData(device_name)
-            )
+            device_data = devices_data[device_name]
             device_free_space = self._device_tree.GetDiskFreeSpace(
                 [device_name]
             )
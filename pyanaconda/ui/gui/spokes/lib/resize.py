@@ -22,9 +22,10 @@ from blivet.size import Size
 from pyanaconda.anaconda_loggers import get_module_logger
 from pyanaconda.core.i18n import _, C_, N_, P_
 from pyanaconda.modules.common.constants.services import STORAGE
-from pyanaconda.modules.common.structures.storage import OSData, DeviceData, DeviceFormatData
+from pyanaconda.modules.common.structures.storage import OSData
 from pyanaconda.ui.gui import GUIObject
 from pyanaconda.ui.gui.utils import blockedHandler, escape_markup, timed_action
+from pyanaconda.ui.lib.storage import get_devices_data, get_formats_data
 
 import gi
 gi.require_version("Gdk", "3.0")
@@ -83,6 +84,8 @@ class ResizeDialog(GUIObject):
         required_size = self._device_tree.GetRequiredDeviceSize(required_space)
 
         self._required_size = Size(required_size)
+        self._devices_data = {}
+        self._formats_data = {}
         self._initial_free_space = Size(0)
         self._selected_reclaimable_space = Size(0)
         self._can_shrink_something = False
@@ -140,8 +143,22 @@ class ResizeDialog(GUIObject):
         total_disks = 0
         total_reclaimable_space = Size(0)
 
+        # Get data of all disks and their partitions at once.
+        partitions = {
+            disk_name: self._device_tree.GetDevicePartitions(disk_name)
+            for disk_name in disks
+        }
+
+        device_names = list(disks)
+
         for disk_name in disks:
-            disk_reclaimable_space = self._add_disk(disk_name)
+            device_names.extend(partitions[disk_name])
+
+        self._devices_data = get_devices_data(self._device_tree, device_names)
+        self._formats_data = get_formats_data(self._device_tree, device_names)
+
+        for disk_name in disks:
+            disk_reclaimable_space = self._add_disk(disk_name, partitions[disk_name])
             total_reclaimable_space += disk_reclaimable_space
             total_disks += 1
 
@@ -163,14 +180,10 @@ class ResizeDialog(GUIObject):
         self._reclaim_desc_label.set_text(description)
         self._update_reclaim_button(Size(0))
 
-    def _add_disk(self, device_name):
+    def _add_disk(self, device_name, partitions):
         # Get the device data.
-        device_data = DeviceData.from_structure(
-            self._device_tree.GetDeviceData(device_name)
-        )
-        format_data = DeviceFormatData.from_structure(
-            self._device_tree.GetFormatData(device_name)
-        )
+        device_data = self._devices_data[device_name]
+        format_data = self._formats_data[device_name]
 
         # First add the disk itself.
         is_partitioned = self._device_tree.IsDevicePartitioned(device_name)
@@ -200,8 +213,6 @@ class ResizeDialog(GUIObject):
         ])
 
         # Then add all its partitions.
-        partitions = self._device_tree.GetDevicePartitions(device_name)
-
         for child_name in partitions:
             free_size = self._add_partition(itr, child_name)
             disk_reclaimable_space += free_size
@@ -219,12 +230,8 @@ class ResizeDialog(GUIObject):
 
     def _add_partition(self, itr, device_name):
         # Get the device data.
-        device_data = DeviceData.from_structure(
-            self._device_tree.GetDeviceData(device_name)
-        )
-        format_data = DeviceFormatData.from_structure(
-            self._device_tree.GetFormatData(device_name)
-        )
+        device_data = self._devices_data[device_name]
+        format_data = self._formats_data[device_name]
 
         # Calculate the free size.
         # Devices that are not resizable are still deletable.
@@ -388,9 +395,7 @@ class ResizeDialog(GUIObject):
             return
 
         device_name = obj.name
-        device_data = DeviceData.from_structure(
-            self._device_tree.GetDeviceData(device_name)
-        )
+        device_data = self._devices_data[device_name]
 
         # If the selected filesystem does not support shrinking, make that
         # button insensitive.
@@ -451,9 +456,7 @@ class ResizeDialog(GUIObject):
         if is_partitioned:
             return False
 
-        device_data = DeviceData.from_structure(
-            self._device_tree.GetDeviceData(device_name)
-        )
+        device_data = self._devices_data[device_name]
 
         if obj.action == _(PRESERVE):
             return False
@@ -509,9 +512,7 @@ class ResizeDialog(GUIObject):
                     self._disk_store[part_itr][EDITABLE_COL] = False
                 elif new_action == PRESERVE:
                     part_name = self._disk_store[part_itr][DEVICE_NAME_COL]
-                    part_data = DeviceData.from_structure(
-                        self._device_tree.GetDeviceData(part_name)
-                    )
+                    part_data = self._devices_data[part_name]
                     self._disk_store[part_itr][EDITABLE_COL] = not part_data.protected
 
                 part_itr = self._disk_store.iter_next(part_itr)
@@ -577,9 +578,7 @@ class ResizeDialog(GUIObject):
                 continue
 
             device_name = obj.name
-            device_data = DeviceData.from_structure(
-                self._device_tree.GetDeviceData(device_name)
-            )
+            device_data = self._devices_data[device_name]
 
             if device_data.is_disk:
                 self._on_action_changed(itr, action)
@@ -23,7 +23,7 @@ from pyanaconda.flags import flags
 from pyanaconda.core.signal import Signal
 from pyanaconda.core.i18n import _
 from pyanaconda.modules.common.structures.storage import DeviceData
-from pyanaconda.ui.lib.storage import reset_storage
+from pyanaconda.ui.lib.storage import reset_storage, get_devices_data
 from pyanaconda.modules.common.constants.objects import DASD, DEVICE_TREE
 from pyanaconda.modules.common.constants.services import STORAGE
 from pyanaconda.modules.common.task import sync_run_task
@@ -66,13 +66,19 @@ class DasdFormatting(object):
     @property
     def dasds_summary(self):
         """Returns a string summary of DASDs to format."""
-        return "\n".join(map(self.get_dasd_info, self.dasds))
+        devices_data = get_devices_data(self._device_tree, self.dasds)
+        return "\n".join(self._get_dasd_info(devices_data[d]) for d in self.dasds)
 
     def get_dasd_info(self, disk_name):
         """Returns a string with description of a DASD."""
         data = DeviceData.from_structure(
             self._device_tree.GetDeviceData(disk_name)
         )
+        return self._get_dasd_info(data)
+
+    @staticmethod
+    def _get_dasd_info(data):
+        """Returns a string with description of the DASD data."""
         return "{} ({})".format(data.path, data.attrs.get("bus-id"))
 
     def search_disks(self, disk_names):
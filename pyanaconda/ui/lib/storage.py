@@ -35,6 +35,8 @@ from pyanaconda.modules.common.constants.objects import DISK_SELECTION, BOOTLOAD
 from pyanaconda.modules.common.constants.services import STORAGE
 from pyanaconda.modules.common.errors.configuration import StorageConfigurationError, \
     BootloaderConfigurationError
+from pyanaconda.modules.common.structures.storage import DeviceData, DeviceFormatData, \
+    DeviceTreeChangesData
 from pyanaconda.modules.common.structures.validation import ValidationReport
 from pyanaconda.modules.common.task import sync_run_task
 from pyanaconda.core.storage import device_matches
@@ -216,6 +218,106 @@ def get_disks_summary(disks):
     )
 
 
+def get_devices_data(device_tree, device_names):
+    """Get data of the specified devices.
+
+    The data of all devices are requested with one DBus call.
+
+    :param device_tree: a proxy of a device tree
+    :param device_names: a list of device names
+    :return: a dictionary of device names and instances of DeviceData
+    """
+    device_names = list(device_names)
+
+    if not device_names:
+        return {}
+
+    data_list = DeviceData.from_structure_list(
+        device_tree.GetDevicesData(device_names)
+    )
+
+    return dict(zip(device_names, data_list))
+
+
+def get_formats_data(device_tree, device_names):
+    """Get format data of the specified devices.
+
+    The data of all formats are requested with one DBus call.
+
+    :param device_tree: a proxy of a device tree
+    :param device_names: a list of device names
+    :return: a dictionary of device names and instances of DeviceFormatData
+    """
+    device_names = list(device_names)
+
+    if not device_names:
+        return {}
+
+    data_list = DeviceFormatData.from_structure_list(
+        device_tree.GetFormatsData(device_names)
+    )
+
+    return dict(zip(device_names, data_list))
+
+
+class DevicesDataCache(object):
+    """Cache of device and format data.
+
+    The cached data are synchronized with the device tree by
+    the generations of the device tree, so only data of added
+    and changed devices are requested again.
+    """
+
+    def __init__(self, device_tree):
+        """Create a new cache.
+
+        :param device_tree: a proxy of a device tree
+        """
+        self._device_tree = device_tree
+        self._generation = 0
+        self._devices_data = {}
+        self._formats_data = {}
+
+    def update(self):
+        """Drop data of devices that have changed since the last update."""
+        changes = DeviceTreeChangesData.from_structure(
+            self._device_tree.GetChangesSince(self._generation)
+        )
+
+        if changes.reset:
+            self._devices_data.clear()
+            self._formats_data.clear()
+
+        for name in changes.removed + changes.changed + changes.added:
+            self._devices_data.pop(name, None)
+            self._formats_data.pop(name, None)
+
+        self._generation = changes.generation
+
+    def get_devices_data(self, device_names):
+        """Get data of the specified devices.
+
+        :param device_names: a list of device names
+        :return: a dictionary of device names and instances of DeviceData
+        """
+        return self._get_data(self._devices_data, get_devices_data, device_names)
+
+    def get_formats_data(self, device_names):
+        """Get format data of the specified devices.
+
+        :param device_names: a list of device names
+        :return: a dictionary of device names and instances of DeviceFormatData
+        """
+        return self._get_data(self._formats_data, get_formats_data, device_names)
+
+    def _get_data(self, cache, get_data, device_names):
+        """Get the cached data and request the missing ones."""
+        device_names = list(device_names)
+        missing = [name for name in device_names if name not in cache]
+        cache.update(get_data(self._device_tree, missing))
+        return {name: cache[name] for name in device_names}
+
+
 def mark_protected_device(spec):
     """Mark a device as protected.
 
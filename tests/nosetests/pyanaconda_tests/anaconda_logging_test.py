@@ -0,0 +1,123 @@
+#
+# Copyright (C) 2020  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import io
+import logging
+import unittest
+from unittest.mock import Mock
+
+from pyanaconda.anaconda_logging import AnacondaLogWriter, AnacondaQueueHandler, \
+    AnacondaStreamHandler
+
+
+class AnacondaLogWriterTestCase(unittest.TestCase):
+    """Test the asynchronous logging."""
+
+    def setUp(self):
+        self.writer = AnacondaLogWriter(batch_size=10)
+        self.logger = logging.getLogger("anaconda.test.writer")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+
+    def tearDown(self):
+        self.writer.stop()
+
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+
+    def _add_stream_handler(self, level=logging.DEBUG):
+        stream = io.StringIO()
+        handler = AnacondaStreamHandler(stream)
+        handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        handler.setLevel(level)
+        self.logger.addHandler(AnacondaQueueHandler(self.writer, handler))
+        return stream
+
+    def write_test(self):
+        """Test the log writer."""
+        first = self._add_stream_handler()
+        second = self._add_stream_handler(level=logging.WARNING)
+        self.writer.start()
+
+        for i in range(100):
+            self.logger.info("Message %s", i)
+
+        self.logger.warning("Warning %s", "!")
+        self.writer.flush()
+
+        lines = ["INFO Message {}".format(i) for i in range(100)] + ["WARNING Warning !"]
+        self.assertEqual(first.getvalue(), "\n".join(lines) + "\n")
+        self.assertEqual(second.getvalue(), "WARNING Warning !\n")
+
+    def write_not_running_test(self):
+        """Test the log writer without the writer thread."""
+        stream = self._add_stream_handler()
+        self.logger.debug("Message")
+        self.assertEqual(stream.getvalue(), "")
+
+        self.writer.flush()
+        self.assertEqual(stream.getvalue(), "DEBUG Message\n")
+
+    def stop_test(self):
+        """Test the stopped log writer."""
+        stream = self._add_stream_handler()
+        self.writer.start()
+        self.assertTrue(self.writer.is_running)
+
+        self.logger.debug("Message")
+        self.writer.stop()
+
+        self.assertFalse(self.writer.is_running)
+        self.assertEqual(stream.getvalue(), "DEBUG Message\n")
+
+    def message_arguments_test(self):
+        """Test that the arguments are formatted in the calling thread."""
+        stream = self._add_stream_handler()
+        data = ["a"]
+
+        self.logger.debug("Data: %s", data)
+        data.append("b")
+
+        self.writer.flush()
+        self.assertEqual(stream.getvalue(), "DEBUG Data: ['a']\n")
+
+    def set_level_test(self):
+        """Test the level of the queue handler."""
+        target = AnacondaStreamHandler(io.StringIO())
+        target.setLevel(logging.WARNING)
+
+        handler = AnacondaQueueHandler(self.writer, target)
+        self.assertEqual(handler.level, logging.WARNING)
+
+        handler.setLevel(logging.DEBUG)
+        self.assertEqual(target.level, logging.DEBUG)
+
+    def handler_error_test(self):
+        """Test a failing handler."""
+        target = Mock(spec=["handle", "handleError", "level", "setLevel"])
+        target.level = logging.DEBUG
+        target.handle.side_effect = OSError("Fake error!")
+
+        self.logger.addHandler(AnacondaQueueHandler(self.writer, target))
+        stream = self._add_stream_handler()
+        self.writer.start()
+
+        self.logger.debug("Message")
+        self.writer.flush()
+
+        target.handleError.assert_called_once()
+        self.assertEqual(stream.getvalue(), "DEBUG Message\n")
@@ -19,8 +19,10 @@
 #
 
 import unittest
+from unittest.mock import patch
 
 from pyanaconda.lifecycle import Controller
+from pyanaconda.ui.common import NormalSpoke
 
 class TestModule(object):
     def __init__(self):
@@ -124,3 +126,46 @@ class InstallTasksTestCase(unittest.TestCase):
 
         # check that the init_done signal has been triggered only once
         self.assertEqual(self._test_variable1, 1)
+
+    @patch("pyanaconda.lifecycle.get_controller_by_category")
+    def lazy_spoke_test(self, get_controller):
+        """Check that the controller doesn't wait for postponed lazy spokes."""
+        ctrl = Controller()
+        ctrl.init_done.connect(self._increment_var1)
+        get_controller.return_value = ctrl
+
+        class TestCategory(object):
+            pass
+
+        class TestSpoke(NormalSpoke):  # pylint: disable=abstract-method
+            category = TestCategory
+            data = None
+
+        class LazyTestSpoke(TestSpoke):  # pylint: disable=abstract-method
+            lazy = True
+
+        spoke = TestSpoke(None, None)
+        lazy_spoke = LazyTestSpoke(None, None)
+
+        # lazy spokes created together with the hub are tracked
+        self.assertEqual(spoke.initialization_controller, ctrl)
+        self.assertEqual(lazy_spoke.initialization_controller, ctrl)
+
+        # the hub has postponed the creation of the lazy spoke
+        lazy_spoke.postponed = True
+        self.assertEqual(lazy_spoke.initialization_controller, None)
+
+        spoke.initialize_start()
+        lazy_spoke.initialize_start()
+        ctrl.all_modules_added()
+
+        spoke.initialize_done()
+        self.assertEqual(self._test_variable1, 1)
+
+        # the late initialization of the lazy spoke is not reported
+        lazy_spoke.initialize_done()
+        self.assertEqual(self._test_variable1, 1)
+        get_controller.assert_called_with(category_name="TestCategory")
+
+        self.assertEqual(LazyTestSpoke.lazy_showable(None, None, None), True)
+        self.assertEqual(LazyTestSpoke.lazy_status(None, None, None), "")
@@ -21,13 +21,14 @@ import os
 import tempfile
 import unittest
 from textwrap import dedent
+from unittest.mock import patch
 
 from blivet.size import Size
 
 from pyanaconda.core.configuration.anaconda import AnacondaConfiguration
 from pyanaconda.core.configuration.base import create_parser, read_config, write_config, \
     get_option, set_option, ConfigurationError, ConfigurationDataError, ConfigurationFileError, \
-    Configuration
+    Configuration, ConfigurationSnapshot, Section
 from pyanaconda.core.configuration.storage import StorageSection
 from pyanaconda.modules.common.constants import services
 from pyanaconda.core.constants import SOURCE_TYPE_CLOSEST_MIRROR
@@ -185,6 +186,56 @@ class ConfigurationTestCase(unittest.TestCase):
                 ["a.conf", "b.conf", "d.conf"]
             )
 
+    def snapshot_test(self):
+        parser = self._read_content(create_parser())
+        snapshot = ConfigurationSnapshot()
+        section = Section("Main", parser, snapshot)
+
+        with patch("pyanaconda.core.configuration.base.get_option", wraps=get_option) as getter:
+            self.assertEqual(section._get_option("string"), "Hello")
+            self.assertEqual(section._get_option("string"), "Hello")
+            self.assertEqual(section._get_option("integer", int), 1)
+            self.assertEqual(section._get_option("integer", int), 1)
+            self.assertEqual(section._get_option("integer"), "1")
+            self.assertEqual(getter.call_count, 3)
+
+        # Change the option.
+        generation = snapshot.generation
+        section._set_option("integer", 2)
+        self.assertEqual(snapshot.generation, generation + 1)
+        self.assertEqual(section._get_option("integer", int), 2)
+
+        # Invalid values are not cached.
+        with self.assertRaises(ConfigurationDataError):
+            section._get_option("string", int)
+
+        with self.assertRaises(ConfigurationDataError):
+            section._get_option("string", int)
+
+    def snapshot_mutable_value_test(self):
+        parser = self._read_content(create_parser())
+        section = Section("Main", parser, ConfigurationSnapshot())
+
+        value = section._get_option("string", lambda x: [x])
+        self.assertEqual(value, ["Hello"])
+
+        value.append("World")
+        self.assertEqual(section._get_option("string", lambda x: [x]), ["Hello"])
+
+    def generation_test(self):
+        config = Configuration()
+        generation = config.get_generation()
+
+        with tempfile.NamedTemporaryFile("w") as f:
+            f.write(self._content)
+            f.flush()
+            config.read(f.name)
+
+        self.assertEqual(config.get_generation(), generation + 1)
+
+        config.validate()
+        self.assertEqual(config.get_generation(), generation + 2)
+
 
 class AnacondaConfigurationTestCase(unittest.TestCase):
     """Test the Anaconda configuration."""
@@ -297,6 +348,21 @@ class AnacondaConfigurationTestCase(unittest.TestCase):
                 ["a.conf", "conf.d/b.conf", "conf.d/c.conf"]
             )
 
+    def snapshot_test(self):
+        conf = AnacondaConfiguration.from_defaults()
+        self.assertEqual(conf.anaconda.debug, False)
+
+        # The snapshot is updated after the change.
+        generation = conf.get_generation()
+        conf.anaconda._set_option("debug", True)
+        self.assertGreater(conf.get_generation(), generation)
+        self.assertEqual(conf.anaconda.debug, True)
+
+        # The snapshot is updated after the validation.
+        conf.get_parser()["Anaconda"]["debug"] = "False"
+        conf.validate()
+        self.assertEqual(conf.anaconda.debug, False)
+
     def kickstart_modules_test(self):
         conf = AnacondaConfiguration.from_defaults()
 
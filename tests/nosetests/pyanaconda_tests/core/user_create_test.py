@@ -25,6 +25,7 @@ import os
 import crypt
 import platform
 import glob
+from unittest.mock import patch, Mock
 
 @unittest.skipIf(os.geteuid() != 0, "user creation must be run as root")
 class UserCreateTest(unittest.TestCase):
@@ -342,3 +343,90 @@ class UserCreateTest(unittest.TestCase):
         grp_fields = self._readFields("/etc/group", "test_group")
         self.assertIsNotNone(grp_fields)
         self.assertEqual(grp_fields[2], "1047")
+
+    def create_users_in_batch_test(self):
+        """Create users with passwords in a batch."""
+        batch = users.UserBatch(self.tmpdir)
+
+        users.create_user("test_user1", password="password", root=self.tmpdir, batch=batch)
+        users.create_user("test_user2", lock=True, password="", root=self.tmpdir, batch=batch)
+        users.create_user("test_user3", root=self.tmpdir, batch=batch)
+
+        # The users exist, but the passwords are not set yet.
+        self.assertTrue(users.check_user_exists("test_user1", root=self.tmpdir))
+        self.assertTrue(users.check_user_exists("test_user2", root=self.tmpdir))
+        self.assertTrue(users.check_user_exists("test_user3", root=self.tmpdir))
+        self.assertEqual(self._readFields("/etc/shadow", "test_user1")[1], "!")
+
+        batch.commit()
+
+        shadow_fields = self._readFields("/etc/shadow", "test_user1")
+        self.assertEqual(crypt.crypt("password", shadow_fields[1]), shadow_fields[1])
+        self.assertEqual(shadow_fields[2], "")
+
+        shadow_fields = self._readFields("/etc/shadow", "test_user2")
+        self.assertEqual("!", shadow_fields[1])
+        self.assertEqual(shadow_fields[2], "")
+
+        shadow_fields = self._readFields("/etc/shadow", "test_user3")
+        self.assertEqual("!", shadow_fields[1])
+        self.assertEqual(shadow_fields[2], "")
+
+    def lookup_test(self):
+        """Look up users and groups."""
+        self.assertIsNone(users._getpwnam("test_user", self.tmpdir))
+        self.assertIsNone(users._getgrnam("test_user", self.tmpdir))
+        self.assertIsNone(users._getgrgid(1047, self.tmpdir))
+
+        # The changed files are parsed again.
+        users.create_user("test_user", uid=1047, gid=1047, root=self.tmpdir)
+        self.assertEqual(users._getpwnam("test_user", self.tmpdir)[2], "1047")
+        self.assertEqual(users._getgrnam("test_user", self.tmpdir)[2], "1047")
+        self.assertEqual(users._getgrgid(1047, self.tmpdir)[0], "test_user")
+
+
+class UserBatchTest(unittest.TestCase):
+
+    @patch("pyanaconda.core.users.util")
+    def commit_test(self, util):
+        """Commit a batch of users."""
+        proc = Mock(returncode=0)
+        util.startProgram.return_value = proc
+
+        batch = users.UserBatch("/mnt/sysimage")
+        batch.set_user_password("user1", "$1$asdf$password", True, False)
+        batch.set_user_password("user2", "", False, True)
+        batch.set_user_password("user3", None, False, False)
+        batch.restore_context("/mnt/sysimage/home/user1")
+        batch.restore_context("/mnt/sysimage/home/user2/.ssh")
+
+        util.startProgram.assert_not_called()
+        util.execWithRedirect.assert_not_called()
+
+        batch.commit()
+
+        util.startProgram.assert_called_once()
+        proc.communicate.assert_called_once_with(b"user1:$1$asdf$password\nuser2:!\n")
+        self.assertEqual(util.execWithRedirect.call_args_list, [
+            (("chage", ["-R", "/mnt/sysimage", "-d", "", "user1"]),),
+            (("chage", ["-R", "/mnt/sysimage", "-d", "", "user2"]),),
+            (("chage", ["-R", "/mnt/sysimage", "-d", "", "user3"]),),
+            (("restorecon", ["-r", "/mnt/sysimage/home/user1", "/mnt/sysimage/home/user2/.ssh"]),),
+        ])
+
+        # The batch is empty now.
+        util.reset_mock()
+        batch.commit()
+        util.startProgram.assert_not_called()
+        util.execWithRedirect.assert_not_called()
+
+    @patch("pyanaconda.core.users.util")
+    def commit_failed_test(self, util):
+        """Commit a batch of users with a failed chpasswd."""
+        util.startProgram.return_value = Mock(returncode=1)
+
+        batch = users.UserBatch("/mnt/sysimage")
+        batch.set_user_password("user1", "$1$asdf$password", True, False)
+
+        with self.assertRaises(OSError):
+            batch.commit()
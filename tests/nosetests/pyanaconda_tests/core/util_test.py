@@ -85,6 +85,55 @@ class RunSystemctlTests(unittest.TestCase):
                 "list-unit-files", "fake.service", "--no-legend"
             ])
 
+    @patch('pyanaconda.core.util.execWithRedirect')
+    def enable_services_test(self, execute):
+        """Test the enable_services function."""
+        execute.return_value = 0
+        util.enable_services([], root="/")
+        execute.assert_not_called()
+
+        util.enable_services(["a", "b", "c"])
+        execute.assert_called_once_with("systemctl", [
+            "enable", "a", "b", "c", "--root", "/mnt/sysroot"
+        ])
+
+        # Enable the services one by one if the batch fails.
+        execute.reset_mock()
+        execute.side_effect = [1, 0, 1]
+
+        with self.assertRaises(ValueError) as cm:
+            util.enable_services(["a", "b", "c"], root="/")
+
+        self.assertEqual(str(cm.exception), "Error enabling service b: 1")
+        self.assertEqual(execute.call_args_list, [
+            (("systemctl", ["enable", "a", "b", "c"]),),
+            (("systemctl", ["enable", "a"]),),
+            (("systemctl", ["enable", "b"]),),
+        ])
+
+    @patch('pyanaconda.core.util.execWithRedirect')
+    def disable_services_test(self, execute):
+        """Test the disable_services function."""
+        execute.return_value = 0
+        util.disable_services(["a", "b"])
+        execute.assert_called_once_with("systemctl", [
+            "disable", "a", "b", "--root", "/mnt/sysroot"
+        ])
+
+        # Disable the services one by one if the batch fails.
+        execute.reset_mock()
+        execute.side_effect = [1, 1, 0]
+
+        with self.assertLogs(level="WARNING") as cm:
+            util.disable_services(["a", "b"], root="/")
+
+        self.assertIn("Disabling a failed.", "\n".join(cm.output))
+        self.assertEqual(execute.call_args_list, [
+            (("systemctl", ["disable", "a", "b"]),),
+            (("systemctl", ["disable", "a"]),),
+            (("systemctl", ["disable", "b"]),),
+        ])
+
 
 class RunProgramTests(unittest.TestCase):
     def run_program_test(self):
@@ -154,6 +203,62 @@ echo "error" >&2
         # check that the output is an empty string
         self.assertEqual(util.execWithCapture("/bin/sh", ["-c", "exit 0"]), "")
 
+    def exec_with_capture_large_output_test(self):
+        """Test execWithCapture with output bigger than the pipe buffer."""
+        script = "i=0; while [ $i -lt 20000 ]; do echo line$i; echo error$i >&2; i=$((i+1)); done"
+
+        output = util.execWithCapture("/bin/sh", ["-c", script], filter_stderr=True)
+        self.assertEqual(output, "".join("line{}\n".format(i) for i in range(20000)))
+
+        output = util.execWithCapture("/bin/sh", ["-c", script])
+        self.assertEqual(len(output.splitlines()), 40000)
+
+    @patch("pyanaconda.core.util.program_log")
+    def run_program_log_output_test(self, program_log):
+        """Test the logging of the output in _run_program."""
+        util._run_program(["/bin/sh", "-c", "echo first; echo; echo -n last"])
+        program_log.info.assert_any_call("%s%s", "", "first")
+        program_log.info.assert_any_call("%s%s", "", "")
+        program_log.info.assert_any_call("%s%s", "", "last")
+
+        program_log.reset_mock()
+        util._run_program(["/bin/sh", "-c", "echo output"], log_output=False)
+        self.assertNotIn("output", str(program_log.info.mock_calls))
+
+    @patch("pyanaconda.core.util.program_log")
+    def run_program_concurrent_log_output_test(self, program_log):
+        """Test the logging of the output of concurrent programs in _run_program."""
+        # Pretend that another program is running.
+        with patch.object(util._ProgramOutput, "_running", 1):
+            util._run_program(["/bin/sh", "-c", "echo first; echo -n last"])
+
+        output = [c[1] for c in program_log.info.mock_calls if c[1][0] == "%s%s"]
+        self.assertEqual([args[2] for args in output], ["first", "last"])
+
+        # Every line is prefixed with the name and the PID of the program.
+        prefixes = {args[1] for args in output}
+        self.assertEqual(len(prefixes), 1)
+        self.assertRegex(prefixes.pop(), r"^sh\[\d+\]: $")
+
+    def run_program_no_capture_test(self):
+        """Test _run_program without the captured output."""
+        stdout = StringIO()
+        rc, output = util._run_program(["/bin/sh", "-c", "echo first; echo -n last"],
+                                       stdout=stdout, capture_output=False)
+
+        self.assertEqual(rc, 0)
+        self.assertEqual(output, "")
+        self.assertEqual(stdout.getvalue(), "first\nlast\n")
+
+    def run_program_decode_error_test(self):
+        """Test _run_program with output that can't be decoded."""
+        with self.assertRaises(UnicodeDecodeError):
+            util._run_program(['echo', '-en', r'\xa0\xa1\xa2'])
+
+        with self.assertRaises(UnicodeDecodeError):
+            util._run_program(['echo', '-en', r'\xa0\xa1\xa2'], stdout=StringIO(),
+                              capture_output=False)
+
     def exec_readlines_test(self):
         """Test execReadlines."""
 
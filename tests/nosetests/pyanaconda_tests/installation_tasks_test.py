@@ -19,9 +19,15 @@
 #
 
 import unittest
+from threading import Barrier, Event, Lock
+from unittest.mock import Mock, patch
 
-from pyanaconda.installation_tasks import Task
+from dasbus.error import DBusError
+
+from pyanaconda.errors import ERROR_CONTINUE
+from pyanaconda.installation_tasks import Task, DBusTask
 from pyanaconda.installation_tasks import TaskQueue
+from pyanaconda.installation_tasks import ParallelTaskQueue
 
 class InstallTasksTestCase(unittest.TestCase):
 
@@ -369,3 +375,130 @@ class InstallTasksTestCase(unittest.TestCase):
         self.assertEqual(self._test_variable1, 3)
         self.assertEqual(self._test_variable2, 2)
         self.assertEqual(self._test_variable3, 1)
+
+    def parallel_task_queue_test(self):
+        """Check that a parallel task queue runs independent tasks concurrently."""
+        event = Event()
+
+        def wait_for_event():
+            # fails if the tasks don't run at the same time
+            self.assertTrue(event.wait(timeout=5))
+
+        queue = ParallelTaskQueue(name="queue", max_workers=2)
+        self.assertEqual(queue.max_workers, 2)
+        queue.append(Task("wait", wait_for_event))
+        queue.append(Task("set", event.set))
+        queue.task_completed.connect(lambda x: self._increment_var1())
+        queue.start()
+
+        self.assertTrue(queue.done)
+        self.assertFalse(queue.running)
+        self.assertEqual(self._test_variable1, 2)
+
+    def parallel_task_queue_dependencies_test(self):
+        """Check that a parallel task queue respects dependencies."""
+        order = []
+        lock = Lock()
+
+        def append(name):
+            with lock:
+                order.append(name)
+
+        task_a = Task("a", append, ("a",))
+        task_b = Task("b", append, ("b",))
+        task_c = Task("c", append, ("c",))
+        task_a.add_dependencies(task_b)
+        task_b.add_dependencies(task_c)
+        self.assertEqual(task_a.dependencies, [task_b])
+
+        queue = ParallelTaskQueue(name="queue")
+        queue.append(task_a)
+        queue.append(task_b)
+        queue.append(task_c)
+        queue.start()
+
+        self.assertEqual(order, ["c", "b", "a"])
+        self.assertTrue(queue.done)
+
+    def parallel_task_queue_resources_test(self):
+        """Check that a parallel task queue respects resources."""
+        lock = Lock()
+
+        def use_resource():
+            # fails if the resource is used by more tasks
+            self.assertTrue(lock.acquire(blocking=False))
+            self._increment_var1()
+            lock.release()
+
+        queue = ParallelTaskQueue(name="queue")
+
+        for _i in range(10):
+            task = Task("use resource", use_resource)
+            task.add_resources("resource")
+            self.assertEqual(task.resources, {"resource"})
+            queue.append(task)
+
+        queue.start()
+        self.assertEqual(self._test_variable1, 10)
+
+    def parallel_task_queue_failure_test(self):
+        """Check that a parallel task queue stops on failure."""
+        def fail():
+            raise ValueError("Fake error.")
+
+        failing_task = Task("fail", fail)
+        dependent_task = Task("increment var 1", self._increment_var1)
+        dependent_task.add_dependencies(failing_task)
+
+        queue = ParallelTaskQueue(name="queue")
+        queue.append(failing_task)
+        queue.append(dependent_task)
+
+        with self.assertRaises(ValueError):
+            queue.start()
+
+        self.assertEqual(self._test_variable1, 0)
+        self.assertFalse(dependent_task.done)
+
+    def parallel_task_queue_unsatisfiable_test(self):
+        """Check that a parallel task queue detects unsatisfiable dependencies."""
+        task = Task("increment var 1", self._increment_var1)
+        task.add_dependencies(Task("never started"))
+
+        queue = ParallelTaskQueue(name="queue")
+        queue.append(task)
+
+        with self.assertRaises(RuntimeError):
+            queue.start()
+
+        self.assertEqual(self._test_variable1, 0)
+
+    @patch("pyanaconda.installation_tasks.sync_run_task")
+    @patch("pyanaconda.installation_tasks.errorHandler")
+    def parallel_dbus_task_errors_test(self, error_handler, sync_run_task):
+        """Check that errors of parallel DBus tasks are handled one by one."""
+        barrier = Barrier(2, timeout=5)
+        lock = Lock()
+
+        def run_task(task_proxy):
+            # fails if the tasks don't run at the same time
+            barrier.wait()
+            raise DBusError("Fake error.")
+
+        def handle_error(exception):
+            # fails if the errors are handled at the same time
+            self.assertTrue(lock.acquire(blocking=False))
+            self._increment_var1()
+            lock.release()
+            return ERROR_CONTINUE
+
+        sync_run_task.side_effect = run_task
+        error_handler.cb.side_effect = handle_error
+
+        queue = ParallelTaskQueue(name="queue", max_workers=2)
+        queue.append(DBusTask(Mock(Name="Task 1")))
+        queue.append(DBusTask(Mock(Name="Task 2")))
+        queue.start()
+
+        self.assertTrue(queue.done)
+        self.assertEqual(self._test_variable1, 2)
@@ -158,6 +158,38 @@ class NetworkInterfaceTestCase(unittest.TestCase):
         self.callback.assert_called_with(NETWORK.interface_name, {'Connected': True}, [])
         self.assertFalse(self.network_interface.IsConnecting())
 
+    def activated_interfaces_changed_test(self):
+        """Test the ActivatedInterfacesChanged signal."""
+        callback = Mock()
+        self.network_interface.ActivatedInterfacesChanged.connect(callback)
+
+        nm_client = Mock()
+        active_connection = Mock()
+        nm_client.get_active_connections.return_value = [active_connection]
+        self.network_module.nm_client = nm_client
+
+        self.network_module._watch_nm_active_connections()
+        active_connection.connect.assert_called_once_with(
+            "state-changed", self.network_module._nm_active_connection_state_changed
+        )
+
+        self.network_module._nm_active_connection_state_changed(
+            active_connection, NM.ActiveConnectionState.ACTIVATED, 0
+        )
+        callback.assert_called_once_with()
+        callback.reset_mock()
+
+        new_connection = Mock()
+        self.network_module._nm_active_connection_added(nm_client, new_connection)
+        new_connection.connect.assert_called_once_with(
+            "state-changed", self.network_module._nm_active_connection_state_changed
+        )
+        callback.assert_called_once_with()
+        callback.reset_mock()
+
+        self.network_module._nm_active_connection_removed(nm_client, new_connection)
+        callback.assert_called_once_with()
+
     def nm_availability_test(self):
         self.network_module.nm_client = None
         self.assertTrue(self.network_interface.Connected)
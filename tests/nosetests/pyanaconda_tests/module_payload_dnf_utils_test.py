@@ -18,7 +18,10 @@
 import unittest
 from unittest.mock import patch, Mock
 
-from pyanaconda.modules.payloads.payload.dnf.utils import get_kernel_package
+from blivet.size import Size
+
+from pyanaconda.modules.payloads.payload.dnf.utils import get_kernel_package, \
+    estimate_file_count, calculate_installation_size
 
 
 class DNFUtilsPackagesTestCase(unittest.TestCase):
@@ -62,3 +65,30 @@ class DNFUtilsPackagesTestCase(unittest.TestCase):
 
         kernel = get_kernel_package(dnf_base=Mock(), exclude_list=[])
         self.assertEqual(kernel, "kernel")
+
+
+class DNFUtilsSizeTestCase(unittest.TestCase):
+
+    def _create_package(self, installsize):
+        """Create a package without the file list."""
+        package = Mock(spec=["installsize"])
+        package.installsize = installsize
+        return package
+
+    def estimate_file_count_test(self):
+        """Test the estimate_file_count function."""
+        self.assertEqual(estimate_file_count(self._create_package(0)), 1)
+        self.assertEqual(estimate_file_count(self._create_package(1024)), 1)
+        self.assertEqual(estimate_file_count(self._create_package(200 * 1024)), 10)
+
+    def calculate_installation_size_test(self):
+        """Test the calculate_installation_size function."""
+        self.assertEqual(int(calculate_installation_size([])), 0)
+
+        packages = [
+            self._create_package(200 * 1024),
+            self._create_package(100 * 1024),
+        ]
+
+        # (300 KiB + 15 * 6 KiB) * 1.1
+        self.assertEqual(int(calculate_installation_size(packages)), int(Size("429 KiB")))
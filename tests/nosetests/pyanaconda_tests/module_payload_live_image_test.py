@@ -17,7 +17,15 @@
 #
 # Red Hat Author(s): Jiri Konecny <jkonecny@redhat.com>
 #
+import hashlib
+import io
+import os
+import tarfile
+import tempfile
 import unittest
+from unittest.mock import Mock, patch
+
+from requests.exceptions import ConnectionError as RequestsConnectionError
 
 from tests.nosetests.pyanaconda_tests import patch_dbus_publish_object
 from tests.nosetests.pyanaconda_tests.module_payload_shared import PayloadKickstartSharedTest, \
@@ -29,6 +37,9 @@ from pyanaconda.modules.payloads.payloads_interface import PayloadsInterface
 from pyanaconda.modules.payloads.payload.live_image.live_image import LiveImageModule
 from pyanaconda.modules.payloads.payload.live_image.live_image_interface import \
     LiveImageInterface
+from pyanaconda.modules.payloads.payload.live_image.download import ImageDownloader, \
+    ImageDownloadError, ImageExtractionError, calculate_image_checksum, extract_tar_image
+from pyanaconda.modules.payloads.payload.live_image.utils import get_tar_compression_options
 from pyanaconda.modules.payloads.source.factory import SourceFactory
 
 
@@ -166,3 +177,237 @@ class LiveImageInterfaceTestCase(unittest.TestCase):
         #     self.assertIsInstance(obj, TaskInterface)
         #     self.assertIsInstance(obj.implementation, task_classes[i])
         self.assertEqual(self.live_image_interface.PostInstallWithTasks(), [])
+
+
+class ImageDownloaderTestCase(unittest.TestCase):
+    """Test the image downloader."""
+
+    def _create_response(self, chunks, status_code=200, length=None, error=None):
+        response = Mock()
+        response.status_code = status_code
+        response.headers = {}
+
+        if length is not None:
+            response.headers["content-length"] = str(length)
+
+        def iter_content(chunk_size):
+            yield from chunks
+
+            if error:
+                raise error
+
+        response.iter_content = iter_content
+        return response
+
+    def _download(self, responses, **kwargs):
+        session = Mock()
+        session.get.side_effect = responses
+        callback = Mock()
+
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "disk.img")
+            downloader = ImageDownloader(session, "http://my/image", progress_callback=callback,
+                                         **kwargs)
+            checksum = downloader.download(path)
+
+            with open(path, "rb") as f:
+                content = f.read()
+
+            self.assertEqual(checksum, calculate_image_checksum(path))
+
+        return session, callback, checksum, content
+
+    def download_test(self):
+        """Test a simple download."""
+        response = self._create_response([b"abc", b"def"], length=6)
+        _session, callback, checksum, content = self._download([response])
+
+        self.assertEqual(content, b"abcdef")
+        self.assertEqual(checksum, hashlib.sha256(b"abcdef").hexdigest())
+        callback.assert_called_with(6, 6)
+
+    def download_no_length_test(self):
+        """Test a download without the content length."""
+        response = self._create_response([b"abc", b"def"])
+        _session, callback, checksum, content = self._download([response])
+
+        self.assertEqual(content, b"abcdef")
+        self.assertEqual(checksum, hashlib.sha256(b"abcdef").hexdigest())
+        callback.assert_called_with(6, None)
+
+    def resume_download_test(self):
+        """Test a resumed download."""
+        responses = [
+            self._create_response([b"abc"], length=6, error=RequestsConnectionError()),
+            self._create_response([b"def"], status_code=206, length=3),
+        ]
+        session, _callback, checksum, content = self._download(responses)
+
+        self.assertEqual(content, b"abcdef")
+        self.assertEqual(checksum, hashlib.sha256(b"abcdef").hexdigest())
+
+        headers = session.get.call_args_list[1][1]["headers"]
+        self.assertEqual(headers, {"Range": "bytes=3-"})
+
+    def restart_download_test(self):
+        """Test a restarted download."""
+        responses = [
+            self._create_response([b"xyz"], length=6, error=RequestsConnectionError()),
+            self._create_response([b"abc", b"def"], status_code=200, length=6),
+        ]
+        _session, _callback, checksum, content = self._download(responses)
+
+        self.assertEqual(content, b"abcdef")
+        self.assertEqual(checksum, hashlib.sha256(b"abcdef").hexdigest())
+
+    def failed_download_test(self):
+        """Test a failed download."""
+        responses = [
+            self._create_response([b"abc"], length=6, error=RequestsConnectionError()),
+        ]
+
+        with self.assertRaises(RequestsConnectionError):
+            self._download(responses, retries=0)
+
+    def incomplete_download_test(self):
+        """Test an incomplete download."""
+        responses = [
+            self._create_response([b"abc"], length=6),
+            self._create_response([b"d"], status_code=206, length=3),
+        ]
+
+        with self.assertRaises(ImageDownloadError) as cm:
+            self._download(responses, retries=1)
+
+        self.assertEqual(str(cm.exception), "The image download has ended after 4 of 6 bytes.")
+
+
+class ImageExtractionTestCase(unittest.TestCase):
+    """Test the extraction of tar images from the HTTP stream."""
+
+    def _create_tarball(self, names, mode="w"):
+        data = io.BytesIO()
+
+        with tarfile.open(fileobj=data, mode=mode) as archive:
+            for name in names:
+                info = tarfile.TarInfo(name)
+                content = name.encode()
+                info.size = len(content)
+                archive.addfile(info, io.BytesIO(content))
+
+        return data.getvalue()
+
+    def _create_response(self, data, status_code=200, error=None):
+        response = Mock()
+        response.status_code = status_code
+        response.headers = {"content-length": str(len(data))}
+
+        def iter_content(chunk_size):
+            yield data
+
+            if error:
+                raise error
+
+        response.iter_content = iter_content
+        return response
+
+    @patch("pyanaconda.modules.payloads.payload.live_image.download.TAR_EXTRACTION_OPTIONS", [])
+    def _extract(self, url, responses, dest_path):
+        session = Mock()
+        session.get.side_effect = responses
+        downloader = ImageDownloader(session, url)
+        return downloader.extract(dest_path, os.path.join(dest_path, "disk.img"))
+
+    def extract_test(self):
+        """Test the extraction of a tar image."""
+        names = ["boot/vmlinuz-5.7.1", "boot/vmlinuz-5.6.0", "etc/hostname"]
+        data = self._create_tarball(names, mode="w:gz")
+
+        with tempfile.TemporaryDirectory() as d:
+            response = self._create_response(data)
+            checksum, kernels = self._extract("http://my/image.tar.gz", [response], d)
+
+            for name in names:
+                with open(os.path.join(d, name)) as f:
+                    self.assertEqual(f.read(), name)
+
+        self.assertEqual(checksum, hashlib.sha256(data).hexdigest())
+        self.assertEqual(kernels, ["5.6.0", "5.7.1"])
+
+    def resume_extract_test(self):
+        """Test the extraction of a resumed download."""
+        data = self._create_tarball(["etc/hostname"])
+
+        with tempfile.TemporaryDirectory() as d:
+            responses = [
+                self._create_response(data[:100], error=RequestsConnectionError()),
+                self._create_response(data[100:], status_code=206),
+            ]
+            checksum, kernels = self._extract("http://my/image.tar", responses, d)
+            self.assertTrue(os.path.exists(os.path.join(d, "etc/hostname")))
+
+        self.assertEqual(checksum, hashlib.sha256(data).hexdigest())
+        self.assertEqual(kernels, [])
+
+    def restart_extract_test(self):
+        """Test the extraction of a download that can't be resumed."""
+        data = self._create_tarball(["boot/vmlinuz-5.7.1", "etc/hostname"])
+
+        with tempfile.TemporaryDirectory() as d:
+            responses = [
+                self._create_response(data[:100], error=RequestsConnectionError()),
+                self._create_response(data, status_code=200),
+                self._create_response(data, status_code=200),
+            ]
+
+            with self.assertLogs(level="WARNING") as cm:
+                checksum, kernels = self._extract("http://my/image.tar", responses, d)
+
+            self.assertIn("Downloading the whole image", "\n".join(cm.output))
+            self.assertTrue(os.path.exists(os.path.join(d, "etc/hostname")))
+            self.assertFalse(os.path.exists(os.path.join(d, "disk.img")))
+
+        self.assertEqual(checksum, hashlib.sha256(data).hexdigest())
+        self.assertEqual(kernels, ["5.7.1"])
+
+    def invalid_extract_test(self):
+        """Test the extraction of an invalid image."""
+        with tempfile.TemporaryDirectory() as d:
+            response = self._create_response(b"invalid" * 1024)
+
+            with self.assertRaises(ImageExtractionError):
+                self._extract("http://my/image.tar.xz", [response], d)
+
+    @patch("pyanaconda.modules.payloads.payload.live_image.download.TAR_EXTRACTION_OPTIONS", [])
+    def extract_local_test(self):
+        """Test the extraction of a local tar image."""
+        names = ["boot/vmlinuz-5.7.1", "etc/hostname"]
+        data = self._create_tarball(names, mode="w:bz2")
+        callback = Mock()
+
+        with tempfile.TemporaryDirectory() as d:
+            image_path = os.path.join(d, "disk.img")
+            dest_path = os.path.join(d, "root")
+            os.mkdir(dest_path)
+
+            with open(image_path, "wb") as f:
+                f.write(data)
+
+            kernels = extract_tar_image(image_path, dest_path, chunk_size=100,
+                                        progress_callback=callback)
+
+            for name in names:
+                self.assertTrue(os.path.exists(os.path.join(dest_path, name)))
+
+        self.assertEqual(kernels, ["5.7.1"])
+        callback.assert_called_with(len(data), len(data))
+
+    def compression_options_test(self):
+        """Test the tar compression options."""
+        self.assertEqual(get_tar_compression_options("http://my/image.tar"), [])
+        self.assertEqual(get_tar_compression_options("http://my/image.tgz"), ["--gzip"])
+        self.assertEqual(get_tar_compression_options("http://my/image.tar.gz"), ["--gzip"])
+        self.assertEqual(get_tar_compression_options("http://my/image.tbz"), ["--bzip2"])
+        self.assertEqual(get_tar_compression_options("http://my/image.tar.bz2"), ["--bzip2"])
+        self.assertEqual(get_tar_compression_options("http://my/image.txz"), ["--xz"])
+        self.assertEqual(get_tar_compression_options("http://my/image.tar.xz"), ["--xz"])
@@ -17,11 +17,12 @@
 #
 # Red Hat Author(s): Jiri Konecny <jkonecny@redhat.com>
 #
+import io
 import os
 import stat
 import unittest
 
-from unittest.mock import patch, call, Mock
+from unittest.mock import patch, call, Mock, ANY
 from tempfile import TemporaryDirectory
 
 from pyanaconda.core.constants import INSTALL_TREE
@@ -29,6 +30,8 @@ from pyanaconda.core.configuration.anaconda import conf
 from pyanaconda.modules.common.errors.payload import InstallError
 from pyanaconda.modules.payloads.base.initialization import UpdateBLSConfigurationTask
 from pyanaconda.modules.payloads.base.installation import InstallFromImageTask
+from pyanaconda.modules.payloads.base.progress import CopyProgress, parse_rsync_progress, \
+    run_rsync
 from pyanaconda.modules.payloads.base.utils import create_rescue_image, get_kernel_version_list
 
 
@@ -181,13 +184,13 @@ class LiveTasksTestCase(unittest.TestCase):
             open(os.path.join(entries_path, entry), "wt").close()
 
     @patch("pyanaconda.modules.payloads.base.installation.create_rescue_image")
-    @patch("pyanaconda.modules.payloads.base.installation.execWithRedirect")
-    def install_image_task_test(self, exec_with_redirect, create_rescue_image_mock):
+    @patch("pyanaconda.modules.payloads.base.installation.run_rsync")
+    def install_image_task_test(self, run_rsync, create_rescue_image_mock):
         """Test installation from an image task."""
         dest_path = "/destination/path"
         kernel_version_list = ["kernel-v1.fc2000.x86_64", "kernel-sad-kernel"]
         source = Mock()
-        exec_with_redirect.return_value = 0
+        run_rsync.return_value = 0
 
         InstallFromImageTask(dest_path, kernel_version_list, source).run()
 
@@ -197,17 +200,17 @@ class LiveTasksTestCase(unittest.TestCase):
                                "--exclude", "/boot/efi/loader/",
                                "--exclude", "/etc/machine-id", INSTALL_TREE + "/", dest_path]
 
-        exec_with_redirect.assert_called_once_with("rsync", expected_rsync_args)
+        run_rsync.assert_called_once_with(expected_rsync_args, ANY)
         create_rescue_image_mock.assert_called_once_with(dest_path, kernel_version_list)
 
     @patch("pyanaconda.modules.payloads.base.installation.create_rescue_image")
-    @patch("pyanaconda.modules.payloads.base.installation.execWithRedirect")
-    def install_image_task_source_unready_test(self, exec_with_redirect, create_rescue_image_mock):
+    @patch("pyanaconda.modules.payloads.base.installation.run_rsync")
+    def install_image_task_source_unready_test(self, run_rsync, create_rescue_image_mock):
         """Test installation from an image task when source is not ready."""
         dest_path = "/destination/path"
         kernel_version_list = ["kernel-v1.fc2000.x86_64", "kernel-sad-kernel"]
         source = Mock()
-        exec_with_redirect.return_value = 0
+        run_rsync.return_value = 0
 
         InstallFromImageTask(dest_path, kernel_version_list, source).run()
 
@@ -217,18 +220,18 @@ class LiveTasksTestCase(unittest.TestCase):
                                "--exclude", "/boot/efi/loader/",
                                "--exclude", "/etc/machine-id", INSTALL_TREE + "/", dest_path]
 
-        exec_with_redirect.assert_called_once_with("rsync", expected_rsync_args)
+        run_rsync.assert_called_once_with(expected_rsync_args, ANY)
         create_rescue_image_mock.assert_called_once_with(dest_path, kernel_version_list)
 
     @patch("pyanaconda.modules.payloads.base.installation.create_rescue_image")
-    @patch("pyanaconda.modules.payloads.base.installation.execWithRedirect")
-    def install_image_task_failed_exception_test(self, exec_with_redirect,
+    @patch("pyanaconda.modules.payloads.base.installation.run_rsync")
+    def install_image_task_failed_exception_test(self, run_rsync,
                                                  create_rescue_image_mock):
         """Test installation from an image task with exception."""
         dest_path = "/destination/path"
         kernel_version_list = ["kernel-v1.fc2000.x86_64", "kernel-sad-kernel"]
         source = Mock()
-        exec_with_redirect.side_effect = OSError("mock exception")
+        run_rsync.side_effect = OSError("mock exception")
 
         with self.assertLogs(level="ERROR") as cm:
             with self.assertRaises(InstallError):
@@ -242,18 +245,18 @@ class LiveTasksTestCase(unittest.TestCase):
                                "--exclude", "/boot/efi/loader/",
                                "--exclude", "/etc/machine-id", INSTALL_TREE + "/", dest_path]
 
-        exec_with_redirect.assert_called_once_with("rsync", expected_rsync_args)
+        run_rsync.assert_called_once_with(expected_rsync_args, ANY)
         create_rescue_image_mock.assert_not_called()
 
     @patch("pyanaconda.modules.payloads.base.installation.create_rescue_image")
-    @patch("pyanaconda.modules.payloads.base.installation.execWithRedirect")
-    def install_image_task_failed_return_code_test(self, exec_with_redirect,
+    @patch("pyanaconda.modules.payloads.base.installation.run_rsync")
+    def install_image_task_failed_return_code_test(self, run_rsync,
                                                    create_rescue_image_mock):
         """Test installation from an image task with bad return code."""
         dest_path = "/destination/path"
         kernel_version_list = ["kernel-v1.fc2000.x86_64", "kernel-sad-kernel"]
         source = Mock()
-        exec_with_redirect.return_value = 11
+        run_rsync.return_value = 11
 
         with self.assertLogs(level="INFO") as cm:
             with self.assertRaises(InstallError):
@@ -267,7 +270,7 @@ class LiveTasksTestCase(unittest.TestCase):
                                "--exclude", "/boot/efi/loader/",
                                "--exclude", "/etc/machine-id", INSTALL_TREE + "/", dest_path]
 
-        exec_with_redirect.assert_called_once_with("rsync", expected_rsync_args)
+        run_rsync.assert_called_once_with(expected_rsync_args, ANY)
         create_rescue_image_mock.assert_not_called()
 
     @patch("pyanaconda.modules.payloads.base.initialization.execWithRedirect")
@@ -339,3 +342,90 @@ class LiveTasksTestCase(unittest.TestCase):
                 )
 
             exec_with_redirect.assert_has_calls(calls)
+
+
+class CopyProgressTestCase(unittest.TestCase):
+    """Test the progress reporting of payload copies."""
+
+    @patch("pyanaconda.modules.payloads.base.progress.time.monotonic")
+    def progress_test(self, monotonic):
+        """Test the copy progress."""
+        callback = Mock()
+        monotonic.return_value = 0
+        progress = CopyProgress(callback, total_size=100 * 1024 * 1024, message="Copying")
+
+        monotonic.return_value = 10
+        progress.update(25 * 1024 * 1024)
+        callback.assert_called_once_with("Copying 25% (2.5 MB/s, 0:30 remaining)")
+        callback.reset_mock()
+
+        # Don't report the same percentage.
+        monotonic.return_value = 11
+        progress.update(25 * 1024 * 1024)
+        callback.assert_not_called()
+
+        # Don't report too often.
+        monotonic.return_value = 10.1
+        progress.update(50 * 1024 * 1024)
+        callback.assert_not_called()
+
+        monotonic.return_value = 20
+        progress.update(50 * 1024 * 1024)
+        callback.assert_called_once_with("Copying 50% (2.5 MB/s, 0:20 remaining)")
+        callback.reset_mock()
+
+        # Always report the end.
+        monotonic.return_value = 20.1
+        progress.update(100 * 1024 * 1024)
+        callback.assert_called_once_with("Copying 100% (5.0 MB/s, 0:00 remaining)")
+        callback.reset_mock()
+
+        progress.end()
+        callback.assert_not_called()
+
+    def progress_unknown_size_test(self):
+        """Test the copy progress with an unknown size."""
+        callback = Mock()
+        progress = CopyProgress(callback, message="Copying")
+
+        progress.update_with_total(1024, None)
+        callback.assert_not_called()
+
+        progress.end()
+        callback.assert_called_once_with("Copying 100%")
+
+    def parse_rsync_progress_test(self):
+        """Test the parsing of the rsync progress."""
+        self.assertEqual(
+            parse_rsync_progress("  1,238,099,968  42%   98.85MB/s    0:00:11 (xfr#4005)"),
+            (1238099968, 42)
+        )
+        self.assertEqual(
+            parse_rsync_progress("              0   0%    0.00kB/s    0:00:00"),
+            (0, 0)
+        )
+        self.assertEqual(parse_rsync_progress("sending incremental file list"), None)
+        self.assertEqual(parse_rsync_progress("rsync: failed to set times"), None)
+
+    @patch("pyanaconda.modules.payloads.base.progress.util.startProgram")
+    def run_rsync_test(self, start_program):
+        """Test the rsync with progress reporting."""
+        proc = Mock()
+        proc.stdout = io.BufferedReader(io.BytesIO(
+            b"      1,024  10%    1.00kB/s    0:00:09\r"
+            b"     10,240 100%    1.00kB/s    0:00:00 (xfr#1, to-chk=0/1)\n"
+            b"rsync: some warning\n"
+        ))
+        proc.wait.return_value = 0
+        start_program.return_value = proc
+        progress = Mock()
+
+        self.assertEqual(run_rsync(["/src/", "/dst"], progress), 0)
+
+        start_program.assert_called_once_with(
+            ["rsync", "--info=progress2", "--no-inc-recursive", "/src/", "/dst"],
+            stdout=ANY,
+            stderr=ANY
+        )
+        progress.update.assert_has_calls([call(1024, 10), call(10240, 100)])
+        progress.end.assert_called_once_with()
@@ -18,6 +18,7 @@
 
 import unittest
 import os
+import threading
 from contextlib import contextmanager
 from unittest.mock import Mock
 
@@ -342,6 +343,54 @@ network --device=ens3
             "[Errno 2] No such file or directory: 'missing_include.cfg'"
         )
 
+    def concurrent_distribute_test(self):
+        """Test the concurrent distribution of the kickstart."""
+        manager = KickstartManager()
+        barrier = threading.Barrier(2, timeout=10)
+
+        module1 = BlockingTestModule(barrier, commands=["network", "firewall"])
+        module2 = BlockingTestModule(barrier, sections=["packages"])
+
+        manager.on_module_observers_changed([
+            self._get_module_observer("1", module1),
+            self._get_module_observer("2", module2),
+        ])
+
+        with self._create_ks_files(self._kickstart_include) as filename:
+            report = manager.read_kickstart_file(filename)
+
+        # The modules would block each other if called one by one.
+        self.assertEqual(module1.kickstart, self._m1_kickstart)
+        self.assertEqual(module2.kickstart, self._m3_kickstart)
+
+        messages = report.get_messages()
+        self.assertEqual([m.module_name for m in messages], ["1", "2"])
+
+        self.assertEqual(
+            manager.generate_kickstart(),
+            self._m1_kickstart + "\n" + self._m3_kickstart.strip()
+        )
+
+    def module_handlers_test(self):
+        """Test that the module handlers are read only once."""
+        manager = KickstartManager()
+        module = TestModule(commands=["network", "firewall"])
+        observer = self._get_module_observer("1", module)
+        manager.on_module_observers_changed([observer])
+
+        with self._create_ks_files(self._kickstart_include) as filename:
+            manager.read_kickstart_file(filename)
+            manager.read_kickstart_file(filename)
+
+        self.assertEqual(module.handlers_reads, 1)
+
+        manager.on_module_observers_changed([observer])
+
+        with self._create_ks_files(self._kickstart_include) as filename:
+            manager.read_kickstart_file(filename)
+
+        self.assertEqual(module.handlers_reads, 2)
+
 
 class TestModule(object):
 
@@ -350,6 +399,7 @@ class TestModule(object):
         self.kickstart_sections = sections or []
         self.kickstart_addons = addons or []
         self.kickstart = ""
+        self.handlers_reads = 0
 
     @property
     def KickstartSections(self):
@@ -361,6 +411,7 @@ class TestModule(object):
 
     @property
     def KickstartCommands(self):
+        self.handlers_reads += 1
         return self.kickstart_commands
 
     def ReadKickstart(self, kickstart):
@@ -383,3 +434,20 @@ class TestModule(object):
     def GenerateKickstart(self):
         """Mock generating a kickstart."""
         return self.kickstart
+
+
+class BlockingTestModule(TestModule):
+
+    def __init__(self, barrier, **kwargs):
+        super().__init__(**kwargs)
+        self._barrier = barrier
+
+    def ReadKickstart(self, kickstart):
+        """Wait for other modules before parsing."""
+        self._barrier.wait()
+        return super().ReadKickstart(kickstart)
+
+    def GenerateKickstart(self):
+        """Wait for other modules before generating."""
+        self._barrier.wait()
+        return super().GenerateKickstart()
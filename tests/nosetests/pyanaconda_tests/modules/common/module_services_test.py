@@ -435,6 +435,22 @@ class ServicesTasksTestCase(unittest.TestCase):
         self.assertEqual(obj.implementation._enabled_services, ["a", "b", "c"])
         self.assertEqual(obj.implementation._disabled_services, ["c", "e", "f"])
 
+    @patch('pyanaconda.modules.services.installation.util')
+    def run_configure_services_task_test(self, mock_util):
+        """Test the run of the services configuration task."""
+        ConfigureServicesTask(
+            sysroot="/mnt/sysroot",
+            disabled_services=["c", "e", "f"],
+            enabled_services=["a", "b", "c"]
+        ).run()
+
+        mock_util.disable_services.assert_called_once_with(
+            ["c", "e", "f"], root="/mnt/sysroot"
+        )
+        mock_util.enable_services.assert_called_once_with(
+            ["a", "b", "c"], root="/mnt/sysroot"
+        )
+
     @patch_dbus_publish_object
     def configure_systemd_target_task_text_test(self, publisher):
         """Test the systemd default traget configuration task - text."""
@@ -341,6 +341,34 @@ class TaskInterfaceTestCase(unittest.TestCase):
         with self.assertRaises(TaskFailedException):
             sync_run_task(self.task_interface)
 
+    def sync_run_with_callback_test(self):
+        """Run a task synchronously with a callback."""
+        self._set_up_task(self.CanceledTask())
+        callback = Mock()
+        self._sync_run_with_callback_test(callback)
+        callback.assert_called_with(self.task_interface)
+
+    @run_in_glib(TIMEOUT)
+    def _sync_run_with_callback_test(self, callback):
+        def _cancel(task_proxy):
+            callback(task_proxy)
+            task_proxy.Cancel()
+
+        sync_run_task(self.task_interface, callback=_cancel)
+
+    def sync_run_with_timeout_test(self):
+        """Run a task synchronously with a timeout."""
+        self._set_up_task(self.CanceledTask())
+        self._sync_run_with_timeout_test()
+
+    @run_in_glib(TIMEOUT)
+    def _sync_run_with_timeout_test(self):
+        with self.assertRaises(TimeoutError):
+            sync_run_task(self.task_interface, timeout=0.5)
+
+        # The task is canceled and finished on timeout.
+        self.assertFalse(self.task_interface.IsRunning)
+
     def async_run_test(self):
         """Run a task asynchronously."""
         self._set_up_task(self.FailingTask())
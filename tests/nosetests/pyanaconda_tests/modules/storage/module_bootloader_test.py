@@ -562,6 +562,66 @@ class BootloaderTasksTestCase(unittest.TestCase):
                 root=root
             )
 
+    @patch('pyanaconda.modules.storage.bootloader.utils.execWithRedirect')
+    @patch('pyanaconda.modules.storage.bootloader.utils.conf')
+    def recreate_initrds_parallel_test(self, conf_mock, exec_mock):
+        """Test the parallel recreation of initrds."""
+        versions = ["5.8.1-200.fc32.x86_64", "5.8.1-200.fc32.x86_64+debug", "5.7.0-rt"]
+        conf_mock.target.is_image = False
+
+        def _execute(command, argv, root):
+            # Fail for the second kernel.
+            if command == "dracut" and versions[1] in argv:
+                return 1
+
+            return 0
+
+        exec_mock.side_effect = _execute
+
+        with tempfile.TemporaryDirectory() as root:
+            with self.assertLogs(level="ERROR") as cm:
+                task = RecreateInitrdsTask(
+                    sysroot=root,
+                    payload_type=PAYLOAD_TYPE_LIVE_IMAGE,
+                    kernel_versions=versions
+                )
+                task.run()
+
+            self.assertEqual(len(cm.output), 1)
+            self.assertIn("dracut failed for {}".format(versions[1]), cm.output[0])
+
+            for version in versions:
+                exec_mock.assert_any_call(
+                    "depmod", ["-a", version], root=root
+                )
+                exec_mock.assert_any_call(
+                    "dracut", ["-f", "/boot/initramfs-{}.img".format(version), version],
+                    root=root
+                )
+
+        self.assertEqual(exec_mock.call_count, 6)
+
+    @patch('pyanaconda.modules.storage.bootloader.utils.execWithRedirect')
+    @patch('pyanaconda.modules.storage.bootloader.utils.conf')
+    def recreate_initrds_exception_test(self, conf_mock, exec_mock):
+        """Test the recreation of initrds with an exception."""
+        versions = ["5.8.1-200.fc32.x86_64", "5.7.0-rt"]
+        conf_mock.target.is_image = True
+        exec_mock.side_effect = [OSError("Fake error!"), 0]
+
+        with tempfile.TemporaryDirectory() as root:
+            task = RecreateInitrdsTask(
+                sysroot=root,
+                payload_type=PAYLOAD_TYPE_LIVE_IMAGE,
+                kernel_versions=versions
+            )
+
+            with self.assertRaises(OSError):
+                task.run()
+
+        # The failure doesn't stop the other kernel.
+        self.assertEqual(exec_mock.call_count, 2)
+
     @patch('pyanaconda.modules.storage.bootloader.installation.conf')
     @patch('pyanaconda.modules.storage.bootloader.installation.InstallBootloaderTask')
     @patch('pyanaconda.modules.storage.bootloader.installation.ConfigureBootloaderTask')
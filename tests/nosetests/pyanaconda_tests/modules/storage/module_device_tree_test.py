@@ -17,6 +17,8 @@
 #
 # Red Hat Author(s): Vendula Poncova <vponcova@redhat.com>
 #
+import os
+import shutil
 import tempfile
 import unittest
 from unittest.mock import patch, Mock, PropertyMock
@@ -34,11 +36,13 @@ from blivet.size import Size
 from dasbus.typing import *  # pylint: disable=wildcard-import
 from pyanaconda.modules.common.errors.storage import UnknownDeviceError, MountFilesystemError
 from pyanaconda.modules.storage.devicetree import DeviceTreeModule, create_storage
+from pyanaconda.modules.storage.devicetree.changes import DeviceTreeChangesTracker
 from pyanaconda.modules.storage.devicetree.devicetree_interface import DeviceTreeInterface
 from pyanaconda.modules.storage.devicetree.populate import FindDevicesTask
 from pyanaconda.modules.storage.devicetree.rescue import FindExistingSystemsTask, \
     MountExistingSystemTask
-from pyanaconda.modules.storage.devicetree.root import Root
+from pyanaconda.modules.storage.devicetree.root import Root, find_existing_installations, \
+    device_probe_cache
 
 
 class DeviceTreeInterfaceTestCase(unittest.TestCase):
@@ -305,6 +309,86 @@ class DeviceTreeInterfaceTestCase(unittest.TestCase):
             'description': get_variant(Str, 'LUKS'),
         })
 
+    def get_devices_data_test(self):
+        """Test GetDevicesData and GetAllDevicesData."""
+        self._add_device(DiskDevice("dev1", size=Size("10 GiB")))
+        self._add_device(DiskDevice("dev2", size=Size("5 GiB")))
+
+        data = self.interface.GetDevicesData(["dev2", "dev1"])
+        self.assertEqual([d['name'] for d in data], [
+            get_variant(Str, 'dev2'),
+            get_variant(Str, 'dev1'),
+        ])
+        self.assertEqual(data[1], self.interface.GetDeviceData("dev1"))
+        self.assertEqual(self.interface.GetDevicesData([]), [])
+
+        data = self.interface.GetAllDevicesData()
+        self.assertEqual(
+            sorted(d['name'].unpack() for d in data),
+            sorted(self.interface.GetDevices())
+        )
+
+        with self.assertRaises(UnknownDeviceError):
+            self.interface.GetDevicesData(["dev1", "dev3"])
+
+    def get_formats_data_test(self):
+        """Test GetFormatsData."""
+        self._add_device(StorageDevice("dev1", fmt=get_format("ext4"), size=Size("10 GiB")))
+        self._add_device(StorageDevice("dev2", fmt=get_format("swap"), size=Size("5 GiB")))
+
+        self.assertEqual(self.interface.GetFormatsData(["dev1", "dev2"]), [
+            self.interface.GetFormatData("dev1"),
+            self.interface.GetFormatData("dev2"),
+        ])
+        self.assertEqual(self.interface.GetFormatsData([]), [])
+
+        with self.assertRaises(UnknownDeviceError):
+            self.interface.GetFormatsData(["dev3"])
+
+    def get_changes_since_test(self):
+        """Test GetGeneration and GetChangesSince."""
+        self.assertEqual(self.interface.GetGeneration(), 0)
+
+        self._add_device(DiskDevice("dev1", size=Size("10 GiB")))
+        self._add_device(DiskDevice("dev2", size=Size("5 GiB")))
+        self.assertEqual(self.interface.GetGeneration(), 1)
+
+        self.assertEqual(self.interface.GetChangesSince(0), {
+            'generation': get_variant(UInt64, 1),
+            'reset': get_variant(Bool, False),
+            'added': get_variant(List[Str], ["dev1", "dev2"]),
+            'removed': get_variant(List[Str], []),
+            'changed': get_variant(List[Str], []),
+        })
+
+        self.storage.devicetree._remove_device(self.storage.devicetree.get_device_by_name("dev2"))
+        self.storage.devicetree.get_device_by_name("dev1").format = get_format("ext4")
+
+        self.assertEqual(self.interface.GetChangesSince(1), {
+            'generation': get_variant(UInt64, 2),
+            'reset': get_variant(Bool, False),
+            'added': get_variant(List[Str], []),
+            'removed': get_variant(List[Str], ["dev2"]),
+            'changed': get_variant(List[Str], ["dev1"]),
+        })
+
+        self.assertEqual(self.interface.GetChangesSince(2)['added'], get_variant(List[Str], []))
+        self.assertEqual(self.interface.GetChangesSince(3)['reset'], get_variant(Bool, True))
+
+    def devices_changed_test(self):
+        """Test the DevicesChanged signal."""
+        callback = Mock()
+        self.interface.DevicesChanged.connect(callback)
+
+        storage = create_storage()
+        storage.devicetree._add_device(DiskDevice("dev1", size=Size("10 GiB")))
+        self.module.on_storage_changed(storage)
+        callback.assert_called_once_with(1, ["dev1"], [], [])
+
+        callback.reset_mock()
+        self.module.on_storage_changed(storage)
+        callback.assert_not_called()
+
     def get_format_type_data_test(self):
         """Test GetFormatTypeData."""
         self.assertEqual(self.interface.GetFormatTypeData("swap"), {
@@ -812,6 +896,196 @@ class DeviceTreeInterfaceTestCase(unittest.TestCase):
         self.assertEqual(dev1.format.options, "defaults")
 
 
+class DeviceTreeChangesTrackerTestCase(unittest.TestCase):
+    """Test the tracker of changes in the device tree."""
+
+    def _get_device(self, name, size=1):
+        """Get a mock of a device."""
+        device = Mock(id=name, type="disk", size=size, exists=True, protected=False,
+                      parents=[], children=[])
+        device.name = name
+        device.format = Mock(type=None, exists=False, uuid=None, label=None, mountpoint=None)
+        return device
+
+    def update_test(self):
+        """Test the update of the tracker."""
+        tracker = DeviceTreeChangesTracker()
+        self.assertEqual(tracker.generation, 0)
+        self.assertEqual(tracker.update([]), None)
+        self.assertEqual(tracker.generation, 0)
+
+        dev1 = self._get_device("dev1")
+        dev2 = self._get_device("dev2")
+        self.assertEqual(tracker.update([dev2, dev1]), (["dev1", "dev2"], [], []))
+        self.assertEqual(tracker.update([dev1, dev2]), None)
+        self.assertEqual(tracker.generation, 1)
+
+        dev3 = self._get_device("dev3")
+        dev1.size = 2
+        self.assertEqual(tracker.update([dev1, dev3]), (["dev3"], ["dev2"], ["dev1"]))
+        self.assertEqual(tracker.generation, 2)
+
+    def get_changes_since_test(self):
+        """Test the changes since a generation."""
+        tracker = DeviceTreeChangesTracker()
+        dev1 = self._get_device("dev1")
+        dev2 = self._get_device("dev2")
+        tracker.update([dev1, dev2])
+
+        # Remove and add the device again.
+        tracker.update([dev1])
+        tracker.update([dev1, self._get_device("dev2", size=2)])
+
+        # Add and remove a device.
+        tracker.update([dev1, dev2, self._get_device("dev3")])
+        tracker.update([dev1, dev2])
+
+        changes = tracker.get_changes_since(1)
+        self.assertEqual(changes.generation, 5)
+        self.assertEqual(changes.reset, False)
+        self.assertEqual(changes.added, [])
+        self.assertEqual(changes.removed, [])
+        self.assertEqual(changes.changed, ["dev2"])
+
+        changes = tracker.get_changes_since(2)
+        self.assertEqual(changes.added, ["dev2"])
+        self.assertEqual(changes.removed, [])
+        self.assertEqual(changes.changed, [])
+
+        changes = tracker.get_changes_since(0)
+        self.assertEqual(changes.added, ["dev1", "dev2"])
+        self.assertEqual(changes.reset, False)
+
+        changes = tracker.get_changes_since(5)
+        self.assertEqual(changes.added, [])
+        self.assertEqual(changes.changed, [])
+
+    def get_changes_since_unavailable_test(self):
+        """Test the changes since an unavailable generation."""
+        tracker = DeviceTreeChangesTracker(max_history=2)
+
+        for size in range(1, 5):
+            tracker.update([self._get_device("dev1", size)])
+
+        self.assertEqual(tracker.get_changes_since(2).changed, ["dev1"])
+
+        for generation in (0, 1, 5):
+            changes = tracker.get_changes_since(generation)
+            self.assertEqual(changes.generation, 4)
+            self.assertEqual(changes.reset, True)
+            self.assertEqual(changes.added, ["dev1"])
+
+
+class InstallerStorageTestCase(unittest.TestCase):
+    """Test the storage model."""
+
+    def copy_without_devices_test(self):
+        """Test the copy of the storage model without devices."""
+        storage = create_storage()
+        storage.devicetree._add_device(DiskDevice("dev1", size=Size("10 GiB")))
+        storage.set_default_luks_version("luks1")
+        storage.protected_devices = ["dev1"]
+
+        new = storage.copy_without_devices()
+        self.assertEqual(new.devices, [])
+        self.assertEqual(new.roots, [])
+        self.assertIs(new.fsset.devicetree, new.devicetree)
+        self.assertEqual(new.default_luks_version, "luks1")
+        self.assertEqual(new.protected_devices, ["dev1"])
+        self.assertIsNot(new.protected_devices, storage.protected_devices)
+
+        self.assertEqual([d.name for d in storage.devices], ["dev1"])
+
+
+class FindExistingInstallationsTestCase(unittest.TestCase):
+    """Test the search for existing installations."""
+
+    def setUp(self):
+        device_probe_cache.clear()
+
+    def tearDown(self):
+        device_probe_cache.clear()
+
+    def _get_device(self, name, uuid, files):
+        """Get a mock of a device with the given files."""
+        device = Mock(direct=True, controllable=True, size=1024)
+        device.name = name
+        device.format = Mock(linux_native=True, mountable=True, exists=True, type="ext4",
+                             uuid=uuid, options="defaults")
+
+        def _mount(options, mountpoint):
+            for path, content in files.items():
+                path = os.path.join(mountpoint, path)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+
+                with open(path, "w") as f:
+                    f.write(content)
+
+        device.format.mount.side_effect = _mount
+        return device
+
+    @staticmethod
+    def _umount(mountpoint):
+        """Remove the files of the mount point."""
+        for name in os.listdir(mountpoint):
+            shutil.rmtree(os.path.join(mountpoint, name))
+
+    @patch("pyanaconda.modules.storage.devicetree.root.get_release_string")
+    @patch("pyanaconda.modules.storage.devicetree.root.blivet_util")
+    def find_existing_installations_test(self, blivet_util, get_release_string):
+        """Test find_existing_installations."""
+        blivet_util.umount.side_effect = self._umount
+        get_release_string.return_value = ("x86_64", "Fedora", "32")
+
+        dev1 = self._get_device("dev1", "1", {"etc/fstab": "UUID=1 / ext4 defaults 0 0\n"})
+        dev2 = self._get_device("dev2", "2", {"etc/hosts": ""})
+        dev3 = self._get_device("dev3", "3", {})
+        dev3.format.mountable = False
+
+        devicetree = Mock(devices=[dev1, dev2, dev3])
+        devicetree.resolve_device.side_effect = \
+            lambda spec, **kwargs: dev1 if spec == "UUID=1" else None
+
+        roots = find_existing_installations(devicetree)
+        self.assertEqual(len(roots), 1)
+        self.assertEqual(roots[0].name, "Fedora Linux 32 for x86_64")
+        self.assertEqual(roots[0].mounts, {"/": dev1})
+        self.assertEqual(roots[0].swaps, [])
+
+        dev1.setup.assert_called_once_with()
+        dev1.teardown.assert_not_called()
+        dev2.teardown.assert_called_once_with()
+        dev3.format.mount.assert_not_called()
+        devicetree.teardown_all.assert_called_once_with()
+
+        # The devices are not probed again.
+        roots = find_existing_installations(devicetree)
+        self.assertEqual(len(roots), 1)
+        self.assertEqual(roots[0].mounts, {"/": dev1})
+
+        dev1.setup.assert_called_once_with()
+        dev1.format.mount.assert_called_once()
+        dev2.format.mount.assert_called_once()
+
+        # The changed device is probed again.
+        dev1.format.uuid = "4"
+        find_existing_installations(devicetree)
+        self.assertEqual(dev1.format.mount.call_count, 2)
+
+    @patch("pyanaconda.modules.storage.devicetree.root.blivet_util")
+    def find_existing_installations_failed_mount_test(self, blivet_util):
+        """Test find_existing_installations with a failed mount."""
+        dev1 = self._get_device("dev1", "1", {})
+        dev1.format.mount.side_effect = OSError("Fake error!")
+
+        devicetree = Mock(devices=[dev1])
+        self.assertEqual(find_existing_installations(devicetree), [])
+        self.assertEqual(find_existing_installations(devicetree), [])
+
+        self.assertEqual(dev1.format.mount.call_count, 2)
+        blivet_util.umount.assert_called()
+
+
 class DeviceTreeTasksTestCase(unittest.TestCase):
     """Test the storage tasks."""
 
@@ -18,11 +18,13 @@
 #
 # Red Hat Author(s): Vendula Poncova <vponcova@redhat.com>
 #
+import threading
 import unittest
 import pyanaconda.modules.storage.checker.utils as checks
 
+from unittest.mock import Mock, PropertyMock
 from blivet.size import Size
-from pyanaconda.modules.storage.checker.utils import StorageChecker
+from pyanaconda.modules.storage.checker.utils import StorageChecker, StorageIndex
 
 
 class StorageCheckerTests(unittest.TestCase):
@@ -274,3 +276,62 @@ class StorageCheckerTests(unittest.TestCase):
             checks.verify_mounted_partitions,
             checks.verify_lvm_destruction,
         ])
+
+        self.assertEqual(
+            set(checker.checks) - checker.concurrent_checks,
+            {checks.verify_bootloader}
+        )
+
+    def concurrent_checks_test(self):
+        """Run concurrent checks."""
+        checker = StorageChecker()
+        barrier = threading.Barrier(2, timeout=5)
+
+        def check_x(storage, constraints, report_error, report_warning):
+            report_warning("x")
+
+        def check_y(storage, constraints, report_error, report_warning):
+            barrier.wait()
+            report_error("y")
+
+        def check_z(storage, constraints, report_error, report_warning):
+            barrier.wait()
+            report_error("z")
+
+        checker.add_check(check_x)
+        checker.add_check(check_y, concurrent=True)
+        checker.add_check(check_z, concurrent=True)
+
+        report = checker.check(None)
+        self.assertListEqual(report.errors, ["y", "z"])
+        self.assertListEqual(report.warnings, ["x"])
+        self.assertListEqual(report.info, [
+            "Storage check started with constraints {}.",
+            "Run sanity check check_x.",
+            "Found sanity warning: x",
+            "Run sanity check check_y.",
+            "Found sanity error: y",
+            "Run sanity check check_z.",
+            "Found sanity error: z",
+            "Storage check finished with failure(s)."
+        ])
+        self.assertEqual(set(report.durations), {"check_x", "check_y", "check_z"})
+
+        report = checker.check(None, skip=(check_y, check_z))
+        self.assertEqual(set(report.durations), {"check_x"})
+
+        checker.remove_check(check_y)
+        self.assertEqual(checker.concurrent_checks, {check_z})
+
+    def storage_index_test(self):
+        """Test the index of the storage."""
+        storage = Mock()
+        mountpoints = PropertyMock(return_value={"/": "dev1"})
+        type(storage).mountpoints = mountpoints
+
+        index = StorageIndex(storage)
+        self.assertEqual(index.mountpoints, {"/": "dev1"})
+        self.assertEqual(index.mountpoints, {"/": "dev1"})
+        mountpoints.assert_called_once_with()
+
+        self.assertIs(index.devicetree, storage.devicetree)
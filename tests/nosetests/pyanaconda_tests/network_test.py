@@ -17,7 +17,11 @@
 # Red Hat, Inc.
 
 from pyanaconda import network
+import threading
 import unittest
+from unittest.mock import patch, Mock
+
+from dasbus.signal import Signal
 
 
 class NetworkTests(unittest.TestCase):
@@ -256,3 +260,86 @@ class NetworkTests(unittest.TestCase):
         # automatic ip= whith MAC address set
         cmdline = {"ip": "ens3:dhcp::52:54:00:12:34:56"}
         self.assertEqual(network.hostname_from_cmdline(cmdline), "")
+
+
+class WaitForNetworkTestCase(unittest.TestCase):
+    """Test the waits for the Network module."""
+
+    def _create_proxy(self):
+        proxy = Mock()
+        proxy.PropertiesChanged = Signal()
+        proxy.ActivatedInterfacesChanged = Signal()
+        return proxy
+
+    def _emit_later(self, signal, callback):
+        def run():
+            callback()
+            signal.emit()
+
+        thread = threading.Timer(0.1, run)
+        thread.start()
+        self.addCleanup(thread.join)
+
+    @patch("pyanaconda.network.NETWORK")
+    def wait_for_connected_NM_test(self, network_service):
+        """Test the wait_for_connected_NM function."""
+        proxy = self._create_proxy()
+        network_service.get_proxy.return_value = proxy
+
+        proxy.Connected = True
+        self.assertTrue(network.wait_for_connected_NM(timeout=0))
+
+        proxy.Connected = False
+        proxy.IsConnecting.return_value = False
+        self.assertFalse(network.wait_for_connected_NM(timeout=0))
+        self.assertFalse(network.wait_for_connected_NM(timeout=10, only_connecting=True))
+
+    @patch("pyanaconda.network.constants.NETWORK_CONNECTED_CHECK_INTERVAL", 60)
+    @patch("pyanaconda.network.NETWORK")
+    def wait_for_connected_NM_signal_test(self, network_service):
+        """Test that the wait for connected NM is woken up by a signal."""
+        proxy = self._create_proxy()
+        proxy.Connected = False
+        network_service.get_proxy.return_value = proxy
+
+        def connect():
+            proxy.Connected = True
+
+        self._emit_later(proxy.PropertiesChanged, connect)
+        self.assertTrue(network.wait_for_connected_NM(timeout=30))
+
+        # The callback is disconnected.
+        self.assertEqual(proxy.PropertiesChanged._callbacks, [])
+
+    @patch("pyanaconda.network.constants.NETWORK_CONNECTED_CHECK_INTERVAL", 60)
+    @patch("pyanaconda.network.NETWORK")
+    def wait_for_connecting_NM_signal_test(self, network_service):
+        """Test that the wait for connecting NM is woken up by a signal."""
+        proxy = self._create_proxy()
+        proxy.Connected = False
+        proxy.IsConnecting.return_value = True
+        network_service.get_proxy.return_value = proxy
+
+        def disconnect():
+            proxy.IsConnecting.return_value = False
+
+        self._emit_later(proxy.PropertiesChanged, disconnect)
+        self.assertFalse(network.wait_for_connected_NM(timeout=30, only_connecting=True))
+
+    @patch("pyanaconda.network.constants.NETWORK_DEVICES_CHECK_INTERVAL", 60)
+    @patch("pyanaconda.network.NETWORK")
+    def wait_for_network_devices_test(self, network_service):
+        """Test the wait_for_network_devices function."""
+        proxy = self._create_proxy()
+        proxy.GetActivatedInterfaces.return_value = ["ens3"]
+        network_service.get_proxy.return_value = proxy
+
+        self.assertTrue(network.wait_for_network_devices(["ens3"], timeout=0))
+        self.assertFalse(network.wait_for_network_devices(["ens3", "ens4"], timeout=0))
+
+        def activate():
+            proxy.GetActivatedInterfaces.return_value = ["ens3", "ens4"]
+
+        self._emit_later(proxy.ActivatedInterfacesChanged, activate)
+        self.assertTrue(network.wait_for_network_devices(["ens3", "ens4"], timeout=30))
+        self.assertEqual(proxy.ActivatedInterfacesChanged._callbacks, [])
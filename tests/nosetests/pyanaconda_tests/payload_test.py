@@ -24,18 +24,26 @@ import os
 import hashlib
 import shutil
 import gi
+import dnf.exceptions
 
 import pyanaconda.core.payload as util
 
+from functools import partial
 from tempfile import TemporaryDirectory
+from threading import Barrier, current_thread
+from types import SimpleNamespace
 from unittest.mock import patch, Mock, call
 
 from blivet.size import Size
 
 from pyanaconda.core.configuration.anaconda import conf
+from pyanaconda.core.constants import THREAD_STORAGE, PAYLOAD_TYPE_DNF
 from pyanaconda.payload.dnf import utils
+from pyanaconda.payload.manager import PayloadManager, PayloadState
 from pyanaconda.payload.flatpak import FlatpakPayload
 from pyanaconda.payload.dnf.repomd import RepoMDMetaHash
+from pyanaconda.payload.dnf.cache import RepoMetadataCache, DepsolveCache, DepsolveResult
+from pyanaconda.payload.dnf.payload import DNFPayload
 
 gi.require_version("Flatpak", "1.0")
 from gi.repository.Flatpak import RefKind
@@ -95,6 +103,108 @@ class PickLocation(unittest.TestCase):
         self.assertEqual(mpoint, None)
 
 
+class LoadReposMetadataTest(unittest.TestCase):
+
+    def _create_repo(self, repo_id, error=None):
+        repo = Mock()
+        repo.id = repo_id
+        repo.load.side_effect = error
+        return repo
+
+    def load_no_repos_test(self):
+        """Load metadata of no repositories."""
+        self.assertEqual(utils.load_repos_metadata([], 4), {})
+
+    def load_repos_test(self):
+        """Load metadata of repositories."""
+        repos = [self._create_repo("repo-{}".format(i)) for i in range(10)]
+        errors = utils.load_repos_metadata(repos, 4)
+        self.assertEqual(errors, {})
+
+        for repo in repos:
+            repo.load.assert_called_once_with()
+
+    def load_failed_repos_test(self):
+        """Load metadata of failed repositories."""
+        error = dnf.exceptions.RepoError("Fake error.")
+        repos = [
+            self._create_repo("a"),
+            self._create_repo("b", error),
+            self._create_repo("c"),
+        ]
+        errors = utils.load_repos_metadata(repos, 1)
+        self.assertEqual(errors, {"b": error})
+
+        for repo in repos:
+            repo.load.assert_called_once_with()
+
+    def load_cached_repos_test(self):
+        """Load metadata of repositories with the persistent cache."""
+        barrier = Barrier(2, timeout=5)
+        thread = current_thread()
+
+        def get_repomd_hash(repo, proxy_url):
+            # fails if the repomd.xml files are not downloaded concurrently
+            barrier.wait()
+            return "hash-" + repo.id
+
+        def load():
+            # fails if the repositories are not loaded in the calling thread
+            self.assertIs(current_thread(), thread)
+
+        cache = Mock()
+        cache.get_repomd_hash.side_effect = get_repomd_hash
+        repos = [self._create_repo("a"), self._create_repo("b")]
+
+        for repo in repos:
+            repo.load.side_effect = load
+
+        errors = utils.load_repos_metadata(repos, 2, cache=cache, proxy_url="proxy")
+        self.assertEqual(errors, {})
+
+        cache.restore.assert_has_calls([call(repos[0], "hash-a"), call(repos[1], "hash-b")])
+        cache.store.assert_has_calls([call(repos[0], "hash-a"), call(repos[1], "hash-b")])
+
+
+class PayloadManagerTest(unittest.TestCase):
+
+    def _run_thread(self, needs_storage):
+        """Run the payload thread and return the calls."""
+        calls = Mock()
+        payload = calls.payload
+        payload.type = PAYLOAD_TYPE_DNF
+        payload.needs_storage.return_value = needs_storage
+
+        manager = PayloadManager()
+        manager.add_listener(PayloadState.FINISHED, calls.finished)
+
+        with patch("pyanaconda.payload.manager.threadMgr", calls.threadMgr):
+            manager._run_thread(payload, False, True, False)
+
+        payload.needs_storage.assert_called_once_with(checkmount=True)
+        return [c for c in calls.mock_calls if c[0] in (
+            "threadMgr.wait", "payload.update_base_repo", "finished"
+        )]
+
+    def wait_for_storage_test(self):
+        """Wait for storage before the setup of a local source."""
+        calls = self._run_thread(needs_storage=True)
+        self.assertEqual(calls[0], call.threadMgr.wait(THREAD_STORAGE))
+        self.assertEqual(calls[-1], call.finished())
+
+    def no_wait_for_storage_test(self):
+        """Don't wait for storage before the setup of a network source."""
+        calls = self._run_thread(needs_storage=False)
+        setup_index = calls.index(call.payload.update_base_repo(fallback=False, checkmount=True))
+        self.assertNotIn(call.threadMgr.wait(THREAD_STORAGE), calls[:setup_index])
+
+        # The storage has to be scanned before the payload is finished.
+        self.assertEqual(calls[-2:], [
+            call.threadMgr.wait(THREAD_STORAGE),
+            call.finished()
+        ])
+
+
 class DummyRepo(object):
     def __init__(self):
         self.id = "anaconda"
@@ -150,6 +260,180 @@ or it should be. Nah it's just a test!
         self.assertFalse(r.verify_repoMD())
 
 
+class RepoMetadataCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.mkdtemp(suffix="pyanaconda_tests")
+        self._cache_dir = os.path.join(self._temp_dir, "cache")
+        self._dnf_cache_dir = os.path.join(self._temp_dir, "dnf")
+
+    def tearDown(self):
+        shutil.rmtree(self._temp_dir)
+
+    def _create_repo(self, repo_id, content="repodata"):
+        repo = DummyRepo()
+        repo.id = repo_id
+        repo._cachedir = os.path.join(self._dnf_cache_dir, repo_id + "-1234")
+
+        os.makedirs(os.path.join(repo._cachedir, "repodata"))
+        with open(os.path.join(repo._cachedir, "repodata", "repomd.xml"), "w") as f:
+            f.write(content)
+
+        with open(os.path.join(self._dnf_cache_dir, repo_id + ".solv"), "w") as f:
+            f.write("solv")
+
+        repo.baseurl = ["file://" + repo._cachedir]
+        return repo
+
+    def get_repomd_hash_test(self):
+        """Test the get_repomd_hash method."""
+        cache = RepoMetadataCache(self._cache_dir, self._dnf_cache_dir, 1024)
+        repo = self._create_repo("a")
+        self.assertEqual(
+            cache.get_repomd_hash(repo, None),
+            hashlib.sha256(b"repodata").hexdigest()
+        )
+
+        repo.baseurl = []
+        self.assertEqual(cache.get_repomd_hash(repo, None), None)
+
+        repo.baseurl = ["file:///nonexistent"]
+        self.assertEqual(cache.get_repomd_hash(repo, None), None)
+
+    def store_and_restore_test(self):
+        """Test the store and restore methods."""
+        cache = RepoMetadataCache(self._cache_dir, self._dnf_cache_dir, 1024)
+        repo = self._create_repo("a")
+
+        self.assertFalse(cache.restore(repo, "hash"))
+        cache.store(repo, "hash")
+
+        shutil.rmtree(self._dnf_cache_dir)
+        self.assertTrue(cache.restore(repo, "hash"))
+
+        with open(os.path.join(repo._cachedir, "repodata", "repomd.xml")) as f:
+            self.assertEqual(f.read(), "repodata")
+
+        with open(os.path.join(self._dnf_cache_dir, "a.solv")) as f:
+            self.assertEqual(f.read(), "solv")
+
+        self.assertFalse(cache.restore(repo, "another-hash"))
+
+    def evict_test(self):
+        """Test the eviction of the least recently used entries."""
+        cache = RepoMetadataCache(self._cache_dir, self._dnf_cache_dir, 20)
+
+        repo_a = self._create_repo("a", content="a" * 10)
+        cache.store(repo_a, "hash")
+        os.utime(os.path.join(self._cache_dir, "a-hash"), (0, 0))
+
+        repo_b = self._create_repo("b", content="b" * 10)
+        cache.store(repo_b, "hash")
+
+        self.assertFalse(os.path.exists(os.path.join(self._cache_dir, "a-hash")))
+        self.assertTrue(os.path.exists(os.path.join(self._cache_dir, "b-hash")))
+
+
+class DepsolveCacheTest(unittest.TestCase):
+
+    def _get_key(self, repos=None, modules=None, include=None, exclude=None):
+        return DepsolveCache.get_key(
+            repos=repos or [("anaconda", "hash")],
+            module_specs=modules or ([], []),
+            include_list=include or ["@core", "kernel"],
+            exclude_list=exclude or [],
+            ignore_missing=False
+        )
+
+    def get_key_test(self):
+        """Test the get_key method."""
+        self.assertEqual(self._get_key(), self._get_key())
+        self.assertEqual(
+            self._get_key(repos=[("a", "1"), ("b", "2")]),
+            self._get_key(repos=[("b", "2"), ("a", "1")])
+        )
+        self.assertNotEqual(self._get_key(), self._get_key(repos=[("anaconda", "new")]))
+        self.assertNotEqual(self._get_key(), self._get_key(modules=(["nodejs:10"], [])))
+        self.assertNotEqual(self._get_key(), self._get_key(include=["@core", "vim"]))
+        self.assertNotEqual(self._get_key(), self._get_key(exclude=["kernel"]))
+
+    def get_and_store_test(self):
+        """Test the get and store methods."""
+        cache = DepsolveCache(max_entries=2)
+        results = [DepsolveResult(([], []), transaction=Mock()) for _ in range(3)]
+
+        self.assertIsNone(cache.get("a"))
+        cache.store("a", results[0])
+        cache.store("b", results[1])
+        self.assertEqual(cache.get("a"), results[0])
+
+        # The least recently used result is removed.
+        cache.store("c", results[2])
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), results[0])
+        self.assertEqual(cache.get("c"), results[2])
+
+        cache.clear()
+        self.assertIsNone(cache.get("a"))
+
+    def get_install_size_test(self):
+        """Test the get_install_size method."""
+        cache = DepsolveCache()
+        transaction = Mock()
+        size = Size("1 GiB")
+        calculate_size = Mock(return_value=size)
+        cache.store("a", DepsolveResult(([], []), transaction=transaction))
+
+        self.assertIs(cache.get_install_size(transaction, calculate_size), size)
+        self.assertIs(cache.get_install_size(transaction, calculate_size), size)
+        calculate_size.assert_called_once_with(transaction)
+
+        # The size of unknown transactions is always calculated.
+        other = Mock()
+        cache.get_install_size(other, calculate_size)
+        cache.get_install_size(other, calculate_size)
+        self.assertEqual(calculate_size.call_count, 3)
+
+
+class DNFPayloadDepsolveTest(unittest.TestCase):
+
+    def _check_software_selection(self, base, result):
+        payload = Mock()
+        payload._base = base
+        payload._module_specs = ([], [])
+        payload._get_module_specs.return_value = ([], [])
+        payload._get_selections.return_value = (["@core"], [])
+        payload._depsolve_cache.get.return_value = result
+        payload._resolve_software_selection.return_value = DepsolveResult(([], []))
+        payload._restore_software_selection = partial(
+            DNFPayload._restore_software_selection, payload
+        )
+
+        DNFPayload.check_software_selection(payload)
+        return payload
+
+    def restore_software_selection_test(self):
+        """Test the restoration of a cached transaction."""
+        base = SimpleNamespace(_goal=None, _transaction=None, _comps_trans=None, transaction=[])
+        result = DepsolveResult(([], []), goal="goal", transaction=[], comps_transaction="comps")
+        payload = self._check_software_selection(base, result)
+
+        payload._resolve_software_selection.assert_not_called()
+        self.assertEqual(base._goal, "goal")
+        self.assertEqual(base._transaction, [])
+        self.assertEqual(base._comps_trans, "comps")
+
+    def restore_software_selection_fallback_test(self):
+        """Test the resolution if the cached transaction can't be restored."""
+        base = SimpleNamespace(transaction=[])
+        result = DepsolveResult(([], []), goal="goal", transaction=[], comps_transaction="comps")
+        payload = self._check_software_selection(base, result)
+
+        payload._resolve_software_selection.assert_called_once_with(([], []), ["@core"], [])
+        payload._depsolve_cache.store.assert_called_once()
+        self.assertFalse(hasattr(base, "_goal"))
+
+
 class FlatpakTest(unittest.TestCase):
 
     def setUp(self):